@@ -4,11 +4,18 @@ from fastapi import APIRouter, HTTPException
 
 from ...core.config import CoreSettings
 from ...core.runner import run_paper_session
-from ...core.storage import RunStore
+from ...core.storage import open_run_store
 from ...core.data import load_bars
-from ...core.strategy import registry
-from ...core.backtest import run_backtest, run_grid_search, save_backtest_artifacts
-from ...core.walk_forward import walk_forward, save_walk_forward_artifacts
+from ...core.strategy import registry, StrategyFactory
+from ...core.cache import open_result_cache
+from ...core.backtest import (
+    load_backtest_artifacts,
+    load_grid_artifacts,
+    run_backtest,
+    run_grid_search,
+    save_backtest_artifacts,
+)
+from ...core.walk_forward import load_walk_forward_artifacts, save_walk_forward_artifacts, walk_forward
 from ...core.options import (
     resolve_options_provider,
     bs_price,
@@ -29,7 +36,6 @@ from ...core.options import (
 )
 from datetime import date
 from pathlib import Path
-import csv
 import json
 import uuid
 
@@ -105,17 +111,6 @@ def _read_json(path: Path) -> dict | list | None:
         return None
 
 
-def _read_csv(path: Path) -> list[dict]:
-    if not path.exists():
-        return []
-    try:
-        with path.open("r", encoding="utf-8", newline="") as handle:
-            reader = csv.DictReader(handle)
-            return [row for row in reader]
-    except Exception:
-        return []
-
-
 def _write_json(path: Path, payload: dict) -> None:
     path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
@@ -157,23 +152,95 @@ def run_core(payload: dict):
 @router.get("/dashboard")
 def dashboard():
     settings = CoreSettings()
-    store = RunStore(f"{settings.run.artifacts_dir}/runs.sqlite")
+    store = open_run_store(settings)
     latest = store.latest_run()
     return {"latest": latest}
 
 
 @router.get("/trades")
-def trades(limit: int = 50):
+def trades(
+    limit: int = 50,
+    cursor: str | None = None,
+    run_id: str | None = None,
+    symbol: str | None = None,
+    side: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+):
+    settings = CoreSettings()
+    store = open_run_store(settings)
+    try:
+        page = store.query_fills(run_id, symbol, side, since, until, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"fills": page.items, "next_cursor": page.next_cursor}
+
+
+@router.get("/orders")
+def orders(
+    limit: int = 50,
+    cursor: str | None = None,
+    run_id: str | None = None,
+    symbol: str | None = None,
+    side: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+):
+    settings = CoreSettings()
+    store = open_run_store(settings)
+    try:
+        page = store.query_orders(run_id, symbol, side, since, until, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"orders": page.items, "next_cursor": page.next_cursor}
+
+
+@router.get("/signals")
+def signals(
+    limit: int = 50,
+    cursor: str | None = None,
+    run_id: str | None = None,
+    symbol: str | None = None,
+    side: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+):
     settings = CoreSettings()
-    store = RunStore(f"{settings.run.artifacts_dir}/runs.sqlite")
-    return {"fills": store.list_fills(limit=limit)}
+    store = open_run_store(settings)
+    try:
+        page = store.query_signals(run_id, symbol, side, since, until, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"signals": page.items, "next_cursor": page.next_cursor}
 
 
 @router.get("/runs")
-def runs(limit: int = 20):
+def runs(
+    limit: int = 20,
+    cursor: str | None = None,
+    strategy: str | None = None,
+    mode: str | None = None,
+    status: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+):
+    settings = CoreSettings()
+    store = open_run_store(settings)
+    try:
+        page = store.query_runs(strategy, mode, status, since, until, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"runs": page.items, "next_cursor": page.next_cursor}
+
+
+@router.get("/runs/{run_id}")
+def run_detail(run_id: str):
     settings = CoreSettings()
-    store = RunStore(f"{settings.run.artifacts_dir}/runs.sqlite")
-    return {"runs": store.list_runs(limit=limit)}
+    store = open_run_store(settings)
+    run = store.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="run_not_found")
+    return {"run": run}
 
 
 @router.post("/backtest")
@@ -185,6 +252,11 @@ def backtest(payload: dict):
     lookback = int(payload.get("lookback") or settings.run.lookback)
     grid = payload.get("grid") or {}
     objective = payload.get("objective") or "sharpe"
+    executor = payload.get("executor") or "serial"
+    max_workers = int(payload["max_workers"]) if payload.get("max_workers") else None
+    search = payload.get("search") or "grid"
+    n_trials = int(payload["n_trials"]) if payload.get("n_trials") else None
+    engine = payload.get("engine") or "event"
     wf = payload.get("walk_forward") or {}
     limit = int(wf.get("limit") or payload.get("limit") or 300)
     train = int(wf.get("train") or 120)
@@ -201,8 +273,15 @@ def backtest(payload: dict):
 
     strategy = registry.create(strategy_name, lookback=lookback)
     run_id = payload.get("run_id") or settings.run.run_id
+    use_cache = payload.get("use_cache", settings.run.result_cache)
+    cache = open_result_cache(settings) if use_cache else None
 
-    result = run_backtest(strategy, bars, initial_cash=settings.broker.paper_initial_cash)
+    result = run_backtest(
+        strategy,
+        bars,
+        initial_cash=settings.broker.paper_initial_cash,
+        cache=cache,
+    )
     if not run_id:
         import uuid
         run_id = str(uuid.uuid4())
@@ -213,21 +292,40 @@ def backtest(payload: dict):
         "lookback": lookback,
     })
 
-    grid_result = run_grid_search(
-        lambda **params: registry.create(strategy_name, **params),
-        bars,
-        grid if grid else {"lookback": [max(5, lookback // 2), lookback, lookback * 2]},
-        base_dir=settings.run.artifacts_dir,
-        objective=objective,
-    )
+    try:
+        grid_result = run_grid_search(
+            StrategyFactory(strategy_name),
+            bars,
+            grid if grid else {"lookback": [max(5, lookback // 2), lookback, lookback * 2]},
+            base_dir=settings.run.artifacts_dir,
+            objective=objective,
+            executor=executor,
+            max_workers=max_workers,
+            search=search,
+            n_trials=n_trials,
+            seed=settings.run.seed,
+            cache=cache,
+            engine=engine,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
-    wf_results = walk_forward(
-        bars,
-        lambda: registry.create(strategy_name, lookback=lookback),
-        train_window=train,
-        test_window=test,
-        step=step,
-    )
+    wf_grid = wf.get("grid") or {}
+    try:
+        wf_results = walk_forward(
+            bars,
+            StrategyFactory(strategy_name, {"lookback": lookback}),
+            train_window=train,
+            test_window=test,
+            step=step,
+            param_grid=wf_grid,
+            objective=objective,
+            executor=wf.get("executor") or executor,
+            max_workers=max_workers,
+            cache=cache,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     save_walk_forward_artifacts(settings.run.artifacts_dir, run_id, wf_results, {
         "symbol": symbol,
         "timeframe": timeframe,
@@ -237,6 +335,9 @@ def backtest(payload: dict):
         "test": test,
         "step": step,
         "limit": limit,
+        "grid": wf_grid,
+        "objective": objective,
+        "initial_cash": settings.broker.paper_initial_cash,
     })
     run_dir = Path(settings.run.artifacts_dir) / run_id
     _write_json(run_dir / "manifest.json", {
@@ -258,9 +359,32 @@ def backtest(payload: dict):
             "grid_run": grid_result.get("run_id"),
             "walk_forward_run": run_id,
         },
+        "cache": cache.stats() if cache else None,
     }
 
 
+@router.get("/backtest/cache")
+def backtest_cache_stats():
+    settings = CoreSettings()
+    return open_result_cache(settings).stats()
+
+
+@router.post("/backtest/cache/invalidate")
+def backtest_cache_invalidate(payload: dict):
+    settings = CoreSettings()
+    cache = open_result_cache(settings)
+    strategy_name = payload.get("strategy")
+    if strategy_name and payload.get("stale_only", True):
+        try:
+            current = registry.create(strategy_name).version
+        except KeyError as exc:
+            raise HTTPException(status_code=404, detail=str(exc))
+        removed = cache.invalidate(strategy_name, keep_version=current)
+    else:
+        removed = cache.invalidate(strategy_name)
+    return {"removed": removed, "cache": cache.stats()}
+
+
 @router.get("/backtest/artifacts/{run_id}")
 def backtest_artifacts(run_id: str, grid_run_id: str | None = None):
     settings = CoreSettings()
@@ -270,16 +394,20 @@ def backtest_artifacts(run_id: str, grid_run_id: str | None = None):
         raise HTTPException(status_code=404, detail="run_not_found")
     manifest = _read_json(run_dir / "manifest.json") or {}
     grid_id = grid_run_id or manifest.get("grid_run")
-    grid_results = _read_json(base_dir / grid_id / "grid_results.json") if grid_id else None
-    grid_best = _read_json(base_dir / grid_id / "best.json") if grid_id else None
+    grid_results = load_grid_artifacts(str(base_dir), grid_id) if grid_id else None
+    grid_best = grid_results.get("best") if grid_results else None
+    wf_payload = load_walk_forward_artifacts(str(base_dir), run_id) or {}
+    backtest_payload = load_backtest_artifacts(str(base_dir), run_id)
     return {
         "run_id": run_id,
         "base_dir": str(run_dir),
         "config": _read_json(run_dir / "config.json"),
         "metrics": _read_json(run_dir / "metrics.json"),
-        "equity_curve": _read_json(run_dir / "equity_curve.json"),
-        "trades": _read_csv(run_dir / "trades.csv"),
-        "walk_forward": _read_json(run_dir / "walk_forward.json"),
+        "equity_curve": backtest_payload["equity_curve"],
+        "trades": backtest_payload["trades"],
+        "walk_forward": wf_payload.get("windows"),
+        "walk_forward_best_params": wf_payload.get("best_params"),
+        "walk_forward_oos_equity": wf_payload.get("oos_equity_curve"),
         "grid": grid_results,
         "grid_best": grid_best,
         "manifest": manifest,
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+MAGIC = b"AIKACOL1"
+_PREFIX = struct.Struct("<8sI")  # magic, header length
+# Text columns with at most this share of distinct values are dictionary-encoded.
+_DICT_SHARE = 0.5
+_INT64 = (-(2**63), 2**63 - 1)
+
+
+def _pack(array: np.ndarray) -> bytes:
+    """Byte-shuffle, then zlib: grouping byte 0 of every value, then byte 1, ... makes curves compress."""
+    raw = np.ascontiguousarray(array)
+    if raw.dtype.itemsize > 1 and raw.size:
+        raw = raw.view(np.uint8).reshape(-1, raw.dtype.itemsize).T
+    return zlib.compress(np.ascontiguousarray(raw).tobytes(), 6)
+
+
+def _unpack(payload: bytes, dtype: str, rows: int) -> np.ndarray:
+    kind = np.dtype(dtype)
+    raw = np.frombuffer(payload, dtype=np.uint8)
+    if kind.itemsize > 1 and rows:
+        raw = np.ascontiguousarray(raw.reshape(kind.itemsize, rows).T)
+    return raw.view(kind).reshape(rows)
+
+
+def _code_dtype(size: int) -> str:
+    return "<u1" if size <= 0xFF else "<u2" if size <= 0xFFFF else "<u4"
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and _INT64[0] <= value <= _INT64[1]
+
+
+def _encode_column(values: Any) -> tuple[dict[str, Any], list[bytes]]:
+    """Column spec plus its compressed blocks, picking the narrowest typed layout that round-trips."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+        array = values.astype("<f8" if values.dtype.kind == "f" else values.dtype.newbyteorder("<"))
+        kind = {"b": "bool", "f": "f8"}.get(values.dtype.kind, "i8")
+        return {"kind": kind, "layout": "plain", "dtype": array.dtype.str}, [_pack(array)]
+    values = list(values)
+    if all(isinstance(value, bool) for value in values):
+        return {"kind": "bool", "layout": "plain", "dtype": "|b1"}, [_pack(np.array(values, dtype="?"))]
+    if all(_is_int(value) for value in values):
+        return {"kind": "i8", "layout": "plain", "dtype": "<i8"}, [_pack(np.array(values, dtype="<i8"))]
+    if all(value is None or _is_int(value) or isinstance(value, float) for value in values):
+        nullable = any(value is None for value in values)
+        array = np.array([np.nan if value is None else value for value in values], dtype="<f8")
+        spec = {"kind": "f8", "layout": "plain", "dtype": "<f8", "nullable": nullable}
+        return spec, [_pack(array)]
+    kind = "str" if all(isinstance(value, str) for value in values) else "json"
+    texts = values if kind == "str" else [json.dumps(value) for value in values]
+    vocab = list(dict.fromkeys(texts))
+    if len(vocab) <= max(1, len(texts) * _DICT_SHARE):
+        lookup = {text: code for code, text in enumerate(vocab)}
+        dtype = _code_dtype(len(vocab))
+        codes = np.fromiter((lookup[text] for text in texts), dtype=dtype, count=len(texts))
+        return {"kind": kind, "layout": "dict", "dtype": dtype, "vocab": vocab}, [_pack(codes)]
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    return {"kind": kind, "layout": "utf8", "dtype": "<i8"}, [_pack(offsets), zlib.compress(b"".join(encoded), 6)]
+
+
+def write_artifact(
+    path: str | Path,
+    tables: Mapping[str, Mapping[str, Any] | Sequence[Mapping[str, Any]]],
+    meta: dict[str, Any] | None = None,
+) -> int:
+    """Write ``tables`` to one compressed, columnar file and return its size in bytes.
+
+    A table is either a mapping of equal-length columns (arrays or lists) or a
+    list of records, which is split into one typed column per key. Numbers and
+    bools become fixed-width arrays; text and anything else (dicts, lists) is
+    stored as UTF-8, dictionary-encoded when values repeat. Every block is
+    compressed on its own so readers only inflate the columns they use.
+    ``meta`` is small JSON kept in the header.
+    """
+    header_tables: dict[str, Any] = {}
+    blocks: list[bytes] = []
+    offset = 0
+    for table_name, table in tables.items():
+        if isinstance(table, Mapping):
+            orient = "columns"
+            columns = dict(table)
+            lengths = {len(values) for values in columns.values()}
+            if len(lengths) > 1:
+                raise ValueError(f"ragged_table:{table_name}")
+            rows = lengths.pop() if lengths else 0
+            sparse: set[str] = set()
+        else:
+            orient = "records"
+            records = list(table)
+            names = list(dict.fromkeys(key for record in records for key in record))
+            columns = {name: [record.get(name) for record in records] for name in names}
+            sparse = {name for name in names if any(name not in record for record in records)}
+            rows = len(records)
+        specs = []
+        for name, values in columns.items():
+            spec, payloads = _encode_column(values)
+            spec["name"] = name
+            if name in sparse:
+                spec["sparse"] = True
+            spec["blocks"] = []
+            for payload in payloads:
+                spec["blocks"].append([offset, len(payload)])
+                blocks.append(payload)
+                offset += len(payload)
+            specs.append(spec)
+        header_tables[table_name] = {"orient": orient, "rows": rows, "columns": specs}
+
+    header = json.dumps({"version": 1, "meta": meta or {}, "tables": header_tables}).encode("utf-8")
+    target = Path(path)
+    tmp = target.with_name(f"{target.name}.tmp")
+    with tmp.open("wb") as handle:
+        handle.write(_PREFIX.pack(MAGIC, len(header)))
+        handle.write(header)
+        for payload in blocks:
+            handle.write(payload)
+    os.replace(tmp, target)
+    return _PREFIX.size + len(header) + offset
+
+
+class ColumnarArtifact:
+    """Memory-mapped reader for ``write_artifact`` files.
+
+    Opening parses only the header; ``column`` inflates one column straight
+    from the mapping, and ``records``/``to_dict`` build the JSON view on demand.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"not_a_columnar_artifact:{self.path}")
+        header = json.loads(self._mmap[_PREFIX.size : _PREFIX.size + size])
+        self._body = _PREFIX.size + size
+        self.meta: dict[str, Any] = header["meta"]
+        self._tables: dict[str, Any] = header["tables"]
+
+    def __enter__(self) -> "ColumnarArtifact":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    @property
+    def tables(self) -> list[str]:
+        return list(self._tables)
+
+    def rows(self, table: str) -> int:
+        return self._table(table)["rows"]
+
+    def columns(self, table: str) -> list[str]:
+        return [spec["name"] for spec in self._table(table)["columns"]]
+
+    def _table(self, table: str) -> dict[str, Any]:
+        try:
+            return self._tables[table]
+        except KeyError:
+            raise KeyError(f"table_not_found:{table}") from None
+
+    def _block(self, block: Sequence[int]) -> bytes:
+        start = self._body + block[0]
+        with memoryview(self._mmap) as view:
+            return zlib.decompress(view[start : start + block[1]])
+
+    def column(self, table: str, name: str) -> np.ndarray | list[Any]:
+        """Numbers/bools as a numpy array (nulls are NaN); text and JSON values as a list."""
+        info = self._table(table)
+        spec = next((spec for spec in info["columns"] if spec["name"] == name), None)
+        if spec is None:
+            raise KeyError(f"column_not_found:{table}.{name}")
+        rows = info["rows"]
+        layout = spec["layout"]
+        if layout == "plain":
+            return _unpack(self._block(spec["blocks"][0]), spec["dtype"], rows)
+        if layout == "dict":
+            vocab = spec["vocab"]
+            if spec["kind"] == "json":
+                vocab = [json.loads(text) for text in vocab]
+            codes = _unpack(self._block(spec["blocks"][0]), spec["dtype"], rows)
+            return [vocab[code] for code in codes.tolist()]
+        offsets = _unpack(self._block(spec["blocks"][0]), "<i8", rows + 1).tolist()
+        data = self._block(spec["blocks"][1])
+        texts = [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+        return texts if spec["kind"] == "str" else [json.loads(text) for text in texts]
+
+    def column_list(self, table: str, name: str) -> list[Any]:
+        """``column`` as plain Python values, with nulls restored as ``None``."""
+        values = self.column(table, name)
+        if not isinstance(values, np.ndarray):
+            return values
+        spec = next(spec for spec in self._table(table)["columns"] if spec["name"] == name)
+        items = values.tolist()
+        if spec.get("nullable"):
+            items = [None if value != value else value for value in items]
+        return items
+
+    def records(self, table: str) -> list[dict[str, Any]]:
+        specs = self._table(table)["columns"]
+        columns = [(spec["name"], spec.get("sparse", False), self.column_list(table, spec["name"])) for spec in specs]
+        out = []
+        for row in range(self.rows(table)):
+            record = {}
+            for name, sparse, values in columns:
+                value = values[row]
+                if not (sparse and value is None):
+                    record[name] = value
+            out.append(record)
+        return out
+
+    def to_dict(self) -> dict[str, Any]:
+        """Full JSON view: ``meta`` plus each table as records or as a dict of column lists."""
+        out: dict[str, Any] = {"meta": self.meta}
+        for table, info in self._tables.items():
+            if info["orient"] == "records":
+                out[table] = self.records(table)
+            else:
+                out[table] = {name: self.column_list(table, name) for name in self.columns(table)}
+        return out
+
+
+def read_artifact(path: str | Path) -> ColumnarArtifact:
+    return ColumnarArtifact(path)
@@ -1,28 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Iterable, Callable
 import csv
 import itertools
 import json
+import math
 import uuid
 
+import numpy as np
+
+from .artifacts import read_artifact, write_artifact
+from .cache import BacktestCache
 from .config import ExecutionConfig, RiskConfig
 from .execution import ExecutionSimulator
-from .metrics import (
-    cagr,
-    sharpe,
-    sortino,
-    calmar,
-    max_drawdown,
-    time_under_water,
-    win_rate,
-    profit_factor,
-    expectancy,
-)
-from .models import Bar, OrderRequest
+from .metrics import EquityCurveWriter, MetricsAccumulator
+from .models import Bar, Fill, OrderRequest, RiskDecision, Signal
 from .risk import RiskEngine
+from .search import grid_size, halving_rungs, hyperband_brackets, sample_latin_hypercube, sample_random
+from .series import BarSeries, SharedBarSeries, as_series, attach_shared_series, closes_of
 from .strategy.base import Strategy
 from .brokers.paper import PaperBroker
 from .validation import ensure_time_ordered, ensure_timezone_consistent
@@ -35,6 +33,8 @@ _PERIODS_PER_YEAR = {
     "4h": 252 * 2,
     "1d": 252,
 }
+# Part of every result-cache key; bump when broker or risk semantics change backtest results.
+_ENGINE_VERSION = 3
 
 
 @dataclass
@@ -42,101 +42,477 @@ class BacktestResult:
     metrics: dict[str, Any]
     equity_curve: list[float]
     trades: list[dict[str, Any]]
+    equity_path: str | None = None
 
 
 def run_backtest(
     strategy: Strategy,
-    bars: list[Bar],
+    bars: list[Bar] | BarSeries,
     initial_cash: float = 100_000.0,
     execution: ExecutionConfig | None = None,
     risk: RiskConfig | None = None,
+    cache: BacktestCache | None = None,
+    warmup: int = 0,
+    equity_path: str | None = None,
 ) -> BacktestResult:
+    """Event-loop backtest. The first ``warmup`` bars only seed the strategy's
+    history/indicator state: nothing is traded or recorded before them.
+
+    Metrics are accumulated in one pass. With ``equity_path`` the equity curve
+    is streamed to that file (see ``read_equity_curve``) instead of being kept
+    in memory, and ``equity_curve`` on the result is empty.
+
+    Signals carrying ``stop``/``target`` in their meta arm protective orders
+    for the resulting position; each bar's high/low is checked against them
+    before the bar's own signal, and they fill through the execution models.
+    """
     ensure_time_ordered(bars)
     ensure_timezone_consistent(bars)
-    if not bars:
+    if not len(bars):
         return BacktestResult(metrics={}, equity_curve=[], trades=[])
 
     execution = execution or ExecutionConfig()
     risk = risk or RiskConfig()
+    # A streamed curve is a side effect on disk, so those runs bypass the result cache.
+    cache = None if equity_path else cache
+    cache_key = _cache_key(cache, "event", strategy, bars, initial_cash, execution, risk, warmup)
+    cached = _cache_get(cache, cache_key) if cache and cache_key else None
+    if cached is not None:
+        return cached
     simulator = ExecutionSimulator(execution)
     broker = PaperBroker(simulator, initial_cash=initial_cash)
     risk_engine = RiskEngine(risk)
+    protection = _ProtectiveOrders(broker)
+    # One symbol cannot be correlated with other holdings, so only VaR needs the returns here.
+    var_closes = np.asarray(closes_of(bars), dtype=np.float64) if risk_engine.var_enabled else None
+    observed = 1
 
     equity_curve: list[float] = []
     trades: list[dict[str, Any]] = []
+    writer = EquityCurveWriter(equity_path) if equity_path else None
+    accumulator = MetricsAccumulator(_PERIODS_PER_YEAR.get(bars[0].timeframe, 252), writer)
 
-    min_history = max(strategy.min_history, 2)
-    for idx in range(min_history, len(bars)):
-        history = bars[: idx + 1]
-        latest = history[-1]
-        signals = strategy.generate_signals(history)
+    min_history = max(strategy.min_history, 2, warmup)
+    incremental = strategy.supports_incremental
+    if incremental:
+        strategy.reset()
+    start = 0 if incremental else min_history
+    # generate_signals takes a list of Bars, so a BarSeries is materialized once, not per bar.
+    bar_list = bars.to_bars() if not incremental and isinstance(bars, BarSeries) else bars
+    for idx, latest in enumerate(itertools.islice(bar_list, start, None), start=start):
+        if incremental:
+            # Rolling state has to see every bar, but trading starts at min_history as before.
+            signals = strategy.on_bar(latest)
+            if idx < min_history:
+                continue
+        else:
+            signals = strategy.generate_signals(bar_list[: idx + 1])
+        if var_closes is not None:
+            _observe_returns(risk_engine, latest.symbol, var_closes, observed, idx + 1)
+            observed = idx + 1
+        # Stops and targets trade intrabar, before the signal computed on the bar's close.
+        trades.extend(fill.to_dict() for fill in protection.on_bar(latest))
         for signal in signals:
             if signal.side == "flat":
                 continue
-            portfolio = broker.snapshot()
-            notional = strategy.position_sizing(signal, portfolio.equity)
-            if notional <= 0:
-                continue
-            qty = notional / max(latest.close, 1e-6)
+            fill, _decision = _execute_signal(strategy, signal, latest.close, broker, risk_engine)
+            if fill is not None:
+                trades.append(fill.to_dict())
+                protection.on_fill(signal)
+        equity = float(broker.get_account().get("equity", 0.0))
+        accumulator.update(equity)
+        if writer is None:
+            equity_curve.append(equity)
+
+    if writer is not None:
+        writer.close()
+    result = BacktestResult(
+        metrics=accumulator.result(),
+        equity_curve=equity_curve,
+        trades=trades,
+        equity_path=equity_path,
+    )
+    if cache and cache_key:
+        cache.put(cache_key, "backtest", strategy, asdict(result))
+    return result
+
+
+def _cache_key(
+    cache: BacktestCache | None,
+    engine: str,
+    strategy: Strategy,
+    bars: list[Bar] | BarSeries,
+    initial_cash: float,
+    execution: ExecutionConfig,
+    risk: RiskConfig,
+    warmup: int = 0,
+) -> str | None:
+    if cache is None:
+        return None
+    return cache.make_key(
+        "backtest",
+        strategy,
+        bars,
+        engine=engine,
+        initial_cash=initial_cash,
+        execution=execution.model_dump(),
+        risk=risk.model_dump(),
+        warmup=warmup,
+        engine_version=_ENGINE_VERSION,
+    )
+
+
+def _cache_get(cache: BacktestCache, key: str) -> BacktestResult | None:
+    payload = cache.get(key)
+    return BacktestResult(**payload) if payload is not None else None
+
+
+def _execute_signal(
+    strategy: Strategy,
+    signal: Signal,
+    price: float,
+    broker: PaperBroker,
+    risk_engine: RiskEngine,
+) -> tuple[Fill | None, RiskDecision | None]:
+    portfolio = broker.snapshot()
+    notional = strategy.position_sizing(signal, portfolio.equity)
+    if notional <= 0:
+        return None, None
+    qty = notional / max(price, 1e-6)
+    order = OrderRequest(
+        symbol=signal.symbol,
+        side="buy" if signal.side == "long" else "sell",
+        quantity=qty,
+        order_type="market",
+        market_price=price,
+        strategy_name=strategy.name,
+        meta=signal.meta,
+    )
+    decision = risk_engine.evaluate_order(order, portfolio, price)
+    if decision.decision == "deny":
+        return None, decision
+    if decision.decision == "reduce" and decision.adjusted_quantity is not None:
+        order = OrderRequest(
+            symbol=order.symbol,
+            side=order.side,
+            quantity=decision.adjusted_quantity,
+            order_type=order.order_type,
+            market_price=order.market_price,
+            strategy_name=order.strategy_name,
+        )
+    return broker.place_order(order), decision
+
+
+class _ProtectiveOrders:
+    """Stop-loss/take-profit orders for open positions, resting in the broker's order book.
+
+    A fill from a signal whose meta carries ``stop``/``target`` arms them for
+    the whole position (as a stop and a limit in one OCO group); later fills
+    resize or re-level them, and they are dropped when the position is flat or
+    flips without new levels. The book only touches orders a bar reaches, so
+    checking a bar costs nothing when no level is hit.
+    """
+
+    def __init__(self, broker: PaperBroker) -> None:
+        self.broker = broker
+        # symbol -> (protects a long, {"stop": price, "target": price})
+        self.levels: dict[str, tuple[bool, dict[str, float]]] = {}
+
+    def on_fill(self, signal: Signal) -> None:
+        symbol = signal.symbol
+        for leg in _PROTECTIVE_LEGS:
+            self.broker.cancel_order(_protective_id(symbol, leg))
+        position = self.broker.position(symbol)
+        if position is None:
+            self.levels.pop(symbol, None)
+            return
+        is_long = position.quantity > 0
+        if (signal.side == "long") == is_long:
+            new_levels = {leg: float(signal.meta[leg]) for leg in _PROTECTIVE_LEGS if _is_level(signal.meta.get(leg))}
+            if new_levels:
+                self.levels[symbol] = (is_long, new_levels)
+        armed = self.levels.get(symbol)
+        if armed is None or armed[0] != is_long:
+            self.levels.pop(symbol, None)
+            return
+        for leg, price in armed[1].items():
+            order_type, price_field = _PROTECTIVE_LEGS[leg]
             order = OrderRequest(
-                symbol=signal.symbol,
-                side="buy" if signal.side == "long" else "sell",
-                quantity=qty,
-                order_type="market",
-                market_price=latest.close,
-                strategy_name=strategy.name,
-                meta=signal.meta,
+                symbol=symbol,
+                side="sell" if is_long else "buy",
+                quantity=abs(position.quantity),
+                order_type=order_type,
+                strategy_name="protective",
+                client_order_id=_protective_id(symbol, leg),
+                **{price_field: price},
             )
-            decision = risk_engine.evaluate_order(order, portfolio, latest.close)
-            if decision.decision == "deny":
-                continue
-            if decision.decision == "reduce" and decision.adjusted_quantity is not None:
-                order = OrderRequest(
-                    symbol=order.symbol,
-                    side=order.side,
-                    quantity=decision.adjusted_quantity,
-                    order_type=order.order_type,
-                    market_price=order.market_price,
-                    strategy_name=order.strategy_name,
-                )
-            fill = broker.place_order(order)
+            self.broker.submit_order(order, oco_group=symbol)
+
+    def on_bar(self, bar: Bar) -> list[Fill]:
+        if bar.symbol not in self.levels:
+            return []
+        fills = self.broker.process_bar(bar)
+        if fills and self.broker.position(bar.symbol) is None:
+            self.levels.pop(bar.symbol, None)
+        return fills
+
+    def next_trigger(self, series: BarSeries, start: int, end: int) -> int | None:
+        """First index in [start, end) whose high/low reaches an armed level of ``series.symbol``."""
+        armed = self.levels.get(series.symbol)
+        if armed is None or start >= end:
+            return None
+        is_long, levels = armed
+        highs, lows = series.high[start:end], series.low[start:end]
+        hit = np.zeros(end - start, dtype=bool)
+        # The same comparisons OrderBook uses: sells are stops below/targets above a long.
+        if "stop" in levels:
+            hit |= lows <= levels["stop"] if is_long else highs >= levels["stop"]
+        if "target" in levels:
+            hit |= highs >= levels["target"] if is_long else lows <= levels["target"]
+        found = np.flatnonzero(hit)
+        return int(found[0]) + start if found.size else None
+
+
+_PROTECTIVE_LEGS = {"stop": ("stop", "stop_price"), "target": ("limit", "limit_price")}
+
+
+def _protective_id(symbol: str, leg: str) -> str:
+    return f"protect:{symbol}:{leg}"
+
+
+def _is_level(value: Any) -> bool:
+    return value is not None and math.isfinite(float(value)) and float(value) > 0
+
+
+def _observe_returns(risk_engine: RiskEngine, symbol: str, closes: np.ndarray, start: int, end: int) -> None:
+    """Feed the close-to-close returns of bars [start, end) to the risk engine's VaR window."""
+    start = max(start, 1)
+    if risk_engine.returns is None or not risk_engine.var_enabled or start >= end:
+        return
+    prev = closes[start - 1 : end - 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(prev != 0, closes[start:end] / prev - 1.0, 0.0)
+    risk_engine.returns.update_many([symbol], returns[:, None])
+
+
+# Denials that only a fill can clear (backtests do not mark positions between fills).
+# Once one hits with no stop/target armed, nothing can fill again.
+_STICKY_DENIALS = {"no_equity", "max_leverage", "max_drawdown", "loss_streak"}
+
+
+def run_backtest_vectorized(
+    strategy: Strategy,
+    bars: list[Bar] | BarSeries,
+    initial_cash: float = 100_000.0,
+    execution: ExecutionConfig | None = None,
+    risk: RiskConfig | None = None,
+    cache: BacktestCache | None = None,
+    warmup: int = 0,
+) -> BacktestResult:
+    """Array-based equivalent of run_backtest for strategies implementing signal_arrays.
+
+    Signals for the whole series are computed at once; only bars carrying a
+    non-flat signal go through the risk engine and paper broker, and the equity
+    curve is forward-filled between fills.
+    """
+    ensure_time_ordered(bars)
+    ensure_timezone_consistent(bars)
+    if not len(bars):
+        return BacktestResult(metrics={}, equity_curve=[], trades=[])
+    if not strategy.supports_vectorized:
+        raise ValueError(f"vectorized_not_supported:{strategy.name}")
+
+    execution = execution or ExecutionConfig()
+    risk = risk or RiskConfig()
+    cache_key = _cache_key(cache, "vectorized", strategy, bars, initial_cash, execution, risk, warmup)
+    cached = _cache_get(cache, cache_key) if cache and cache_key else None
+    if cached is not None:
+        return cached
+    series = as_series(bars)
+    simulator = ExecutionSimulator(execution)
+    broker = PaperBroker(simulator, initial_cash=initial_cash)
+    risk_engine = RiskEngine(risk)
+
+    arrays = strategy.signal_arrays(series)
+    min_history = max(strategy.min_history, 2, warmup)
+    closes = series.close
+    marks = np.full(len(series), np.nan)
+    trades: list[dict[str, Any]] = []
+    candidates = np.flatnonzero(arrays.side[min_history:]) + min_history
+    protection = _ProtectiveOrders(broker)
+
+    def run_protection(start: int, end: int) -> None:
+        # Jump straight to the bars that reach an armed stop/target instead of visiting each bar.
+        while (hit := protection.next_trigger(series, start, end)) is not None:
+            fills = protection.on_bar(series[hit])
+            trades.extend(fill.to_dict() for fill in fills)
+            if fills:
+                marks[hit] = float(broker.get_account().get("equity", 0.0))
+            start = hit + 1
+
+    checked = min_history
+    observed = 1
+    for idx in candidates.tolist():
+        run_protection(checked, idx + 1)
+        checked = idx + 1
+        _observe_returns(risk_engine, series.symbol, closes, observed, checked)
+        observed = checked
+        signal = arrays.signal_at(idx)
+        fill, decision = _execute_signal(strategy, signal, float(closes[idx]), broker, risk_engine)
+        if fill is not None:
             trades.append(fill.to_dict())
-        account = broker.get_account()
-        equity_curve.append(float(account.get("equity", 0.0)))
-
-    returns = [
-        (equity_curve[i] / equity_curve[i - 1] - 1.0)
-        for i in range(1, len(equity_curve))
-        if equity_curve[i - 1] != 0
-    ]
-    periods = _PERIODS_PER_YEAR.get(bars[0].timeframe, 252)
-    metrics = {
-        "cagr": cagr(equity_curve, periods),
-        "sharpe": sharpe(returns, periods),
-        "sortino": sortino(returns, periods),
-        "calmar": calmar(equity_curve, periods),
-        "max_drawdown": max_drawdown(equity_curve),
-        "time_under_water": time_under_water(equity_curve),
-        "win_rate": win_rate(returns),
-        "profit_factor": profit_factor(returns),
-        "expectancy": expectancy(returns),
+            protection.on_fill(signal)
+            marks[idx] = float(broker.get_account().get("equity", 0.0))
+        elif decision is not None and decision.reason in _STICKY_DENIALS and not protection.levels:
+            break
+    run_protection(checked, len(series))
+
+    filled = np.flatnonzero(~np.isnan(marks))
+    equity = np.full(len(series), float(initial_cash))
+    if filled.size:
+        last_fill = np.maximum.accumulate(np.where(~np.isnan(marks), np.arange(len(series)), -1))
+        has_fill = last_fill >= 0
+        equity[has_fill] = marks[last_fill[has_fill]]
+    equity = equity[min_history:]
+    periods = _PERIODS_PER_YEAR.get(series.timeframe, 252)
+    result = BacktestResult(
+        metrics=_metrics_from_array(equity, periods),
+        equity_curve=equity.tolist(),
+        trades=trades,
+    )
+    if cache and cache_key:
+        cache.put(cache_key, "backtest", strategy, asdict(result))
+    return result
+
+
+def _metrics_from_array(equity: np.ndarray, periods: int) -> dict[str, Any]:
+    """NumPy versions of the metrics.py formulas used by run_backtest."""
+    if equity.size == 0:
+        return {
+            "cagr": 0.0,
+            "sharpe": 0.0,
+            "sortino": 0.0,
+            "calmar": 0.0,
+            "max_drawdown": 0.0,
+            "time_under_water": 0,
+            "win_rate": 0.0,
+            "profit_factor": 0.0,
+            "expectancy": 0.0,
+        }
+    prev = equity[:-1]
+    returns = equity[1:][prev != 0] / prev[prev != 0] - 1.0
+
+    cagr_value = 0.0
+    if equity.size >= 2:
+        years = equity.size / max(periods, 1)
+        cagr_value = float((equity[-1] / equity[0]) ** (1 / years) - 1.0)
+
+    peak = np.maximum.accumulate(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = np.where(peak != 0, (peak - equity) / peak, 0.0)
+    max_dd = float(max(0.0, drawdowns.max()))
+
+    underwater = equity < peak
+    longest = 0
+    if underwater.any():
+        edges = np.diff(np.concatenate(([0], underwater.astype(np.int8), [0])))
+        longest = int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
+
+    def _ratio(avg: float, values: np.ndarray) -> float:
+        if values.size == 0:
+            return 0.0
+        std = float(values.std())
+        return 0.0 if std == 0 else (avg / std) * math.sqrt(periods)
+
+    sharpe_value = sortino_value = 0.0
+    if returns.size >= 2:
+        avg = float(returns.mean())
+        sharpe_value = _ratio(avg, returns)
+        sortino_value = _ratio(avg, returns[returns < 0])
+    gains = float(returns[returns > 0].sum())
+    losses = -float(returns[returns < 0].sum())
+    return {
+        "cagr": cagr_value,
+        "sharpe": sharpe_value,
+        "sortino": sortino_value,
+        "calmar": cagr_value / max_dd if max_dd else 0.0,
+        "max_drawdown": max_dd,
+        "time_under_water": longest,
+        "win_rate": float((returns > 0).sum() / returns.size) if returns.size else 0.0,
+        "profit_factor": gains / losses if losses else 0.0,
+        "expectancy": float(returns.mean()) if returns.size else 0.0,
     }
-    return BacktestResult(metrics=metrics, equity_curve=equity_curve, trades=trades)
+
+
+BACKTEST_ARTIFACT = "backtest.cols"
+GRID_ARTIFACT = "grid_results.cols"
 
 
 def save_backtest_artifacts(base_dir: str, run_id: str, result: BacktestResult, config: dict[str, Any]) -> None:
+    """Write config/metrics as JSON and the equity curve and trades to one columnar ``backtest.cols``."""
     run_dir = Path(base_dir) / run_id
     run_dir.mkdir(parents=True, exist_ok=True)
     (run_dir / "config.json").write_text(json.dumps(config, indent=2), encoding="utf-8")
     (run_dir / "metrics.json").write_text(json.dumps(result.metrics, indent=2), encoding="utf-8")
-    (run_dir / "equity_curve.json").write_text(json.dumps(result.equity_curve, indent=2), encoding="utf-8")
-    trades_path = run_dir / "trades.csv"
-    if result.trades:
-        fieldnames = sorted({key for trade in result.trades for key in trade.keys()})
-        with trades_path.open("w", newline="", encoding="utf-8") as handle:
-            writer = csv.DictWriter(handle, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(result.trades)
+    write_artifact(
+        run_dir / BACKTEST_ARTIFACT,
+        {"equity": {"equity_curve": np.asarray(result.equity_curve, dtype=np.float64)}, "trades": result.trades},
+    )
+
+
+def load_backtest_artifacts(base_dir: str, run_id: str) -> dict[str, Any]:
+    """Equity curve and trades of a saved backtest as JSON-ready lists.
+
+    Runs saved before the columnar format fall back to ``equity_curve.json`` and
+    ``trades.csv`` (whose values are strings).
+    """
+    run_dir = Path(base_dir) / run_id
+    path = run_dir / BACKTEST_ARTIFACT
+    if path.exists():
+        with read_artifact(path) as artifact:
+            return {
+                "equity_curve": artifact.column_list("equity", "equity_curve"),
+                "trades": artifact.records("trades"),
+            }
+    equity_curve = None
+    trades: list[dict[str, Any]] = []
+    try:
+        equity_curve = json.loads((run_dir / "equity_curve.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    try:
+        with (run_dir / "trades.csv").open("r", encoding="utf-8", newline="") as handle:
+            trades = list(csv.DictReader(handle))
+    except (OSError, csv.Error):
+        pass
+    return {"equity_curve": equity_curve, "trades": trades}
+
+
+def save_grid_artifacts(base_dir: str, run_id: str, payload: dict[str, Any]) -> None:
+    """Grid results (and pruning history) as columnar tables; the rest of ``payload`` goes in the header."""
+    run_dir = Path(base_dir) / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    tables = {"results": payload["results"]}
+    if payload.get("pruning") is not None:
+        tables["pruning"] = payload["pruning"]
+    meta = {key: value for key, value in payload.items() if key not in tables}
+    write_artifact(run_dir / GRID_ARTIFACT, tables, meta=meta)
+
+
+def load_grid_artifacts(base_dir: str, run_id: str) -> dict[str, Any] | None:
+    """The ``run_grid_search`` payload saved under ``run_id`` (older runs: ``grid_results.json``)."""
+    run_dir = Path(base_dir) / run_id
+    path = run_dir / GRID_ARTIFACT
+    if path.exists():
+        with read_artifact(path) as artifact:
+            payload = dict(artifact.meta)
+            for table in artifact.tables:
+                payload[table] = artifact.records(table)
+            return payload
+    try:
+        return json.loads((run_dir / "grid_results.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
 
 
 def _expand_grid(param_grid: dict[str, Iterable[Any]]) -> list[dict[str, Any]]:
@@ -150,25 +526,208 @@ def _expand_grid(param_grid: dict[str, Iterable[Any]]) -> list[dict[str, Any]]:
     return combos
 
 
+_GRID_WORKER: dict[str, Any] = {}
+
+
+def _init_grid_worker(
+    spec: dict[str, Any],
+    strategy_factory: Callable[..., Strategy],
+    cache_spec: tuple[str, int] | None,
+) -> None:
+    shm, series = attach_shared_series(spec)
+    cache = BacktestCache(*cache_spec) if cache_spec else None
+    _GRID_WORKER.update(shm=shm, series=series, factory=strategy_factory, cache=cache)
+
+
+def _backtest_for(strategy: Strategy, engine: str) -> Callable[..., BacktestResult]:
+    # "vectorized" falls back to the event loop for strategies without signal_arrays.
+    if engine == "vectorized" and strategy.supports_vectorized:
+        return run_backtest_vectorized
+    return run_backtest
+
+
+def _grid_task(
+    index: int,
+    params: dict[str, Any],
+    limit: int | None,
+    engine: str = "event",
+) -> tuple[int, dict[str, Any]]:
+    strategy = _GRID_WORKER["factory"](**params)
+    series = _GRID_WORKER["series"]
+    window = series[:limit] if limit else series
+    return index, _backtest_for(strategy, engine)(strategy, window, cache=_GRID_WORKER["cache"]).metrics
+
+
+def _run_grid_parallel(
+    strategy_factory: Callable[..., Strategy],
+    bars: list[Bar] | BarSeries,
+    combos: list[dict[str, Any]],
+    max_workers: int | None,
+    progress: Callable[[int, int], None] | None,
+    limit: int | None = None,
+    cache: BacktestCache | None = None,
+    engine: str = "event",
+) -> list[dict[str, Any]]:
+    metrics: list[dict[str, Any] | None] = [None] * len(combos)
+    cache_spec = (cache.path, cache.max_bytes) if cache else None
+    with SharedBarSeries(as_series(bars)) as shared:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_grid_worker,
+            initargs=(shared.spec, strategy_factory, cache_spec),
+        ) as pool:
+            futures = [
+                pool.submit(_grid_task, idx, params, limit, engine) for idx, params in enumerate(combos)
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                idx, result = future.result()
+                metrics[idx] = result
+                if progress:
+                    progress(done, len(combos))
+    return [{"params": params, "metrics": metrics[idx]} for idx, params in enumerate(combos)]
+
+
+def _evaluate_combos(
+    strategy_factory: Callable[..., Strategy],
+    bars: list[Bar] | BarSeries,
+    combos: list[dict[str, Any]],
+    executor: str,
+    max_workers: int | None,
+    progress: Callable[[int, int], None] | None,
+    limit: int | None = None,
+    cache: BacktestCache | None = None,
+    engine: str = "event",
+) -> list[dict[str, Any]]:
+    if executor not in ("serial", "process"):
+        raise ValueError(f"unknown_executor:{executor}")
+    if executor == "process" and len(combos) > 1:
+        return _run_grid_parallel(strategy_factory, bars, combos, max_workers, progress, limit, cache, engine)
+    window = bars[:limit] if limit else bars
+    results = []
+    for done, params in enumerate(combos, start=1):
+        strategy = strategy_factory(**params)
+        result = _backtest_for(strategy, engine)(strategy, window, cache=cache)
+        results.append({"params": params, "metrics": result.metrics})
+        if progress:
+            progress(done, len(combos))
+    return results
+
+
+def _successive_halving(
+    evaluate: Callable[[list[dict[str, Any]], int], list[dict[str, Any]]],
+    combos: list[dict[str, Any]],
+    rungs: list[int],
+    eta: int,
+    objective: str,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Evaluate on growing bar prefixes, keeping the top 1/eta after every rung but the last."""
+    candidates = list(enumerate(combos))
+    latest: dict[int, dict[str, Any]] = {}
+    history: list[dict[str, Any]] = []
+    for rung, size in enumerate(rungs):
+        evaluated = evaluate([params for _, params in candidates], size)
+        for (idx, _params), result in zip(candidates, evaluated):
+            latest[idx] = {**result, "bars": size, "rung": rung}
+        ranked = sorted(candidates, key=lambda c: (-latest[c[0]]["metrics"].get(objective, 0.0), c[0]))
+        keep = len(ranked) if rung == len(rungs) - 1 else max(1, len(ranked) // eta)
+        history.append(
+            {
+                "rung": rung,
+                "bars": size,
+                "evaluated": len(ranked),
+                "kept": keep,
+                "scores": [
+                    {"params": params, objective: latest[idx]["metrics"].get(objective, 0.0)}
+                    for idx, params in ranked
+                ],
+                "pruned": [params for _idx, params in ranked[keep:]],
+            }
+        )
+        candidates = sorted(ranked[:keep])
+    return [latest[idx] for idx in sorted(latest)], history
+
+
 def run_grid_search(
     strategy_factory: Callable[..., Strategy],
-    bars: list[Bar],
+    bars: list[Bar] | BarSeries,
     param_grid: dict[str, Iterable[Any]],
     base_dir: str | None = None,
     objective: str = "sharpe",
+    executor: str = "serial",
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    search: str = "grid",
+    n_trials: int | None = None,
+    eta: int = 3,
+    min_bars: int = 100,
+    seed: int | None = None,
+    cache: BacktestCache | None = None,
+    engine: str = "event",
 ) -> dict[str, Any]:
-    results: list[dict[str, Any]] = []
+    """Backtest parameter combinations from ``param_grid``.
+
+    ``search`` picks the candidates: ``grid`` (full product), ``random`` or
+    ``lhs`` (``n_trials`` samples), ``halving`` (successive halving over
+    growing bar prefixes, optionally on ``n_trials`` random samples) or
+    ``hyperband``. Pruning modes keep the top ``1/eta`` per rung (``eta`` must
+    be at least 2), add a ``pruning`` history to the payload and only rank
+    full-length evaluations for ``best``.
+
+    ``executor="process"`` fans the combinations out over a process pool; bars
+    are published once through shared memory and ``strategy_factory`` must be
+    picklable (e.g. ``StrategyFactory``). Results keep candidate order either
+    way, and ``progress(done, total)`` is called as combinations finish.
+    With ``cache`` set, each combination's backtest is looked up/stored there.
+
+    ``engine="vectorized"`` runs combinations through run_backtest_vectorized
+    where the strategy supports it; indicators then come from the shared
+    feature store, so combos with the same lookback compute them once.
+    """
+    if engine not in ("event", "vectorized"):
+        raise ValueError(f"unknown_engine:{engine}")
+    eta = int(eta)
+    if search in ("halving", "hyperband") and eta < 2:
+        raise ValueError("eta_too_small")
     run_id = str(uuid.uuid4())
-    for params in _expand_grid(param_grid):
-        strategy = strategy_factory(**params)
-        result = run_backtest(strategy, bars)
-        results.append({"params": params, "metrics": result.metrics})
-    best = max(results, key=lambda item: item["metrics"].get(objective, 0.0)) if results else None
-    payload = {"run_id": run_id, "objective": objective, "results": results, "best": best}
+    n_bars = len(bars)
+    if engine == "vectorized":
+        # One BarSeries (and prefix views of it) keeps feature-store fingerprints stable across combos.
+        bars = as_series(bars)
+
+    def evaluate(combos: list[dict[str, Any]], limit: int | None = None) -> list[dict[str, Any]]:
+        return _evaluate_combos(
+            strategy_factory, bars, combos, executor, max_workers, progress, limit, cache, engine
+        )
+
+    pruning: list[dict[str, Any]] | None = None
+    if search == "grid":
+        results = evaluate(_expand_grid(param_grid))
+    elif search in ("random", "lhs"):
+        trials = n_trials or grid_size(param_grid)
+        sampler = sample_random if search == "random" else sample_latin_hypercube
+        results = evaluate(sampler(param_grid, trials, seed))
+    elif search == "halving":
+        combos = sample_random(param_grid, n_trials, seed) if n_trials else _expand_grid(param_grid)
+        rungs = halving_rungs(len(combos), n_bars, eta, min_bars)
+        results, pruning = _successive_halving(evaluate, combos, rungs, eta, objective)
+    elif search == "hyperband":
+        results, pruning = [], []
+        for bracket, (n_configs, rungs) in enumerate(hyperband_brackets(n_bars, eta, min_bars)):
+            bracket_seed = None if seed is None else seed + bracket
+            combos = sample_random(param_grid, n_configs, bracket_seed)
+            bracket_results, history = _successive_halving(evaluate, combos, rungs, eta, objective)
+            results.extend({**item, "bracket": bracket} for item in bracket_results)
+            pruning.extend({**item, "bracket": bracket} for item in history)
+    else:
+        raise ValueError(f"unknown_search:{search}")
+
+    finalists = [item for item in results if item.get("bars", n_bars) == n_bars]
+    best = max(finalists, key=lambda item: item["metrics"].get(objective, 0.0)) if finalists else None
+    payload: dict[str, Any] = {"run_id": run_id, "objective": objective, "results": results, "best": best}
+    if search != "grid":
+        payload["search"] = search
+    if pruning is not None:
+        payload["pruning"] = pruning
     if base_dir:
-        run_dir = Path(base_dir) / run_id
-        run_dir.mkdir(parents=True, exist_ok=True)
-        (run_dir / "grid_results.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        if best:
-            (run_dir / "best.json").write_text(json.dumps(best, indent=2), encoding="utf-8")
+        save_grid_artifacts(base_dir, run_id, payload)
     return payload
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable
+import gc
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from .backtest import run_backtest, run_backtest_vectorized, run_grid_search
+from .brokers.paper import PaperBroker
+from .config import ExecutionConfig
+from .execution import ExecutionSimulator
+from .features import feature_store
+from .models import OrderRequest
+from .metrics import (
+    MetricsAccumulator,
+    cagr,
+    sharpe,
+    sortino,
+    calmar,
+    max_drawdown,
+    time_under_water,
+    win_rate,
+    profit_factor,
+    expectancy,
+)
+from .regime import compute_regime_labels
+from .series import BarSeries
+from .strategy import StrategyFactory
+from .walk_forward import walk_forward
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+BENCH_STRATEGY = "mean_reversion"
+
+
+def synthetic_series(n_bars: int, seed: int = 7, symbol: str = "BENCH", timeframe: str = "1h") -> BarSeries:
+    """Geometric random-walk OHLCV bars, built directly as arrays so 1e6 bars is cheap."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, n_bars)))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    wicks = np.abs(rng.normal(0.0, 0.003, (2, n_bars)))
+    start = int(datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp()) * 1_000_000_000
+    return BarSeries.from_arrays(
+        ts=start + np.arange(n_bars, dtype=np.int64) * 3_600_000_000_000,
+        open=open_,
+        high=np.maximum(open_, close) * (1 + wicks[0]),
+        low=np.minimum(open_, close) * (1 - wicks[1]),
+        close=close,
+        volume=1_000 + rng.random(n_bars) * 100,
+        symbol=symbol,
+        timeframe=timeframe,
+        source="synthetic",
+    )
+
+
+def _bench_backtest(series: BarSeries) -> Any:
+    return run_backtest(StrategyFactory(BENCH_STRATEGY)(lookback=20), series)
+
+
+def _bench_backtest_vectorized(series: BarSeries) -> Any:
+    return run_backtest_vectorized(StrategyFactory(BENCH_STRATEGY)(lookback=20), series)
+
+
+def _bench_grid_search(series: BarSeries) -> Any:
+    return run_grid_search(StrategyFactory(BENCH_STRATEGY), series, {"lookback": [10, 20, 40]})
+
+
+def _bench_walk_forward(series: BarSeries) -> Any:
+    train = max(len(series) // 4, 60)
+    test = max(len(series) // 8, 30)
+    return walk_forward(
+        series,
+        StrategyFactory(BENCH_STRATEGY),
+        train_window=train,
+        test_window=test,
+        param_grid={"lookback": [10, 20]},
+    )
+
+
+def _bench_regime_labels(series: BarSeries) -> Any:
+    return compute_regime_labels(series)
+
+
+def _bench_metrics(series: BarSeries) -> Any:
+    equity = series.close.tolist()
+    returns = [equity[i] / equity[i - 1] - 1.0 for i in range(1, len(equity))]
+    return {
+        "cagr": cagr(equity, 252),
+        "sharpe": sharpe(returns, 252),
+        "sortino": sortino(returns, 252),
+        "calmar": calmar(equity, 252),
+        "max_drawdown": max_drawdown(equity),
+        "time_under_water": time_under_water(equity),
+        "win_rate": win_rate(returns),
+        "profit_factor": profit_factor(returns),
+        "expectancy": expectancy(returns),
+    }
+
+
+def _bench_metrics_accumulator(series: BarSeries) -> Any:
+    accumulator = MetricsAccumulator(252)
+    for value in series.close.tolist():
+        accumulator.update(value)
+    return accumulator.result()
+
+
+def _bench_order_book(series: BarSeries) -> Any:
+    # Rests a far limit and a far stop every bar, so the book grows to ~2 orders per bar.
+    broker = PaperBroker(ExecutionSimulator(ExecutionConfig()), initial_cash=1e12)
+    fills = 0
+    for idx, bar in enumerate(series.to_bars()):
+        broker.submit_order(
+            OrderRequest(bar.symbol, "buy", 1.0, "limit", limit_price=bar.close * 0.97, client_order_id=f"l{idx}")
+        )
+        broker.submit_order(
+            OrderRequest(bar.symbol, "sell", 1.0, "stop", stop_price=bar.close * 0.95, client_order_id=f"s{idx}")
+        )
+        fills += len(broker.process_bar(bar))
+    return fills
+
+
+PHASES: dict[str, Callable[[BarSeries], Any]] = {
+    "run_backtest": _bench_backtest,
+    "run_backtest_vectorized": _bench_backtest_vectorized,
+    "run_grid_search": _bench_grid_search,
+    "walk_forward": _bench_walk_forward,
+    "compute_regime_labels": _bench_regime_labels,
+    "metrics": _bench_metrics,
+    "metrics_accumulator": _bench_metrics_accumulator,
+    "order_book": _bench_order_book,
+}
+
+
+def _measure(fn: Callable[[BarSeries], Any], series: BarSeries, repeat: int, track_memory: bool) -> dict[str, Any]:
+    timings: list[float] = []
+    for _ in range(max(1, repeat)):
+        feature_store.clear()
+        gc.collect()
+        started = time.perf_counter()
+        fn(series)
+        timings.append(time.perf_counter() - started)
+    peak: int | None = None
+    if track_memory:
+        # Traced separately: tracemalloc slows allocation-heavy code and would skew the timings.
+        feature_store.clear()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn(series)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    seconds = min(timings)
+    return {
+        "seconds": seconds,
+        "timings": timings,
+        "bars_per_sec": len(series) / seconds if seconds > 0 else None,
+        "peak_bytes": peak,
+    }
+
+
+def run_benchmarks(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    phases: Iterable[str] | None = None,
+    repeat: int = 1,
+    track_memory: bool = True,
+    seed: int = 7,
+    progress: Callable[[str, int, dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Time each phase on synthetic series of every size.
+
+    ``seconds`` is the best of ``repeat`` runs; ``peak_bytes`` comes from one
+    extra tracemalloc-traced run.
+    """
+    names = list(phases) if phases else list(PHASES)
+    unknown = [name for name in names if name not in PHASES]
+    if unknown:
+        raise ValueError(f"unknown_phase:{unknown[0]}")
+    results: list[dict[str, Any]] = []
+    for size in sizes:
+        series = synthetic_series(int(size), seed=seed)
+        for name in names:
+            measured = _measure(PHASES[name], series, repeat, track_memory)
+            entry = {"phase": name, "bars": int(size), **measured}
+            results.append(entry)
+            if progress:
+                progress(name, int(size), entry)
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_benchmarks(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    max_regression_pct: float = 20.0,
+    max_memory_regression_pct: float | None = None,
+) -> list[dict[str, Any]]:
+    """Regressions of ``current`` vs ``baseline`` for each (phase, bars) present in both.
+
+    A phase regresses when its time (or, if a memory budget is given, its peak
+    memory) grows by more than the allowed percentage.
+    """
+    base = {(item["phase"], item["bars"]): item for item in baseline.get("results", [])}
+    regressions: list[dict[str, Any]] = []
+    for item in current.get("results", []):
+        previous = base.get((item["phase"], item["bars"]))
+        if previous is None:
+            continue
+        checks = [("seconds", max_regression_pct)]
+        if max_memory_regression_pct is not None:
+            checks.append(("peak_bytes", max_memory_regression_pct))
+        for field, budget in checks:
+            before, after = previous.get(field), item.get(field)
+            if not before or after is None:
+                continue
+            change_pct = (after / before - 1.0) * 100
+            if change_pct > budget:
+                regressions.append(
+                    {
+                        "phase": item["phase"],
+                        "bars": item["bars"],
+                        "field": field,
+                        "baseline": before,
+                        "current": after,
+                        "change_pct": change_pct,
+                        "budget_pct": budget,
+                    }
+                )
+    return regressions
+
+
+def save_benchmarks(path: str, payload: dict[str, Any]) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def load_benchmarks(path: str) -> dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
@@ -3,22 +3,72 @@ from __future__ import annotations
 from typing import Any
 
 from ..execution import ExecutionSimulator
-from ..models import Fill, OrderRequest, PortfolioState, Position
+from ..models import Bar, Fill, OrderRequest, PortfolioState, Position
+from ..orderbook import RESTING_ORDER_TYPES, OrderBook
 from .base import Broker
 
 
 class PaperBroker(Broker):
+    """Simulated broker keeping portfolio aggregates as running totals.
+
+    Net/gross exposure, equity, peak equity, drawdown and the losing-trade
+    streak are updated in O(1) per fill and per marked price, so ``snapshot``
+    and ``get_account`` never re-sum positions. The loss streak counts
+    consecutive position-reducing fills with negative realized PnL (net of fees).
+
+    ``place_order`` fills market orders immediately. Limit, stop and stop-limit
+    orders go through ``submit_order`` into an ``OrderBook`` and are filled by
+    ``process_bar`` when a bar's range reaches them.
+    """
+
     name = "paper"
 
     def __init__(self, simulator: ExecutionSimulator, initial_cash: float = 100_000.0) -> None:
         self._simulator = simulator
         self._cash = initial_cash
         self._positions: dict[str, Position] = {}
-        self._open_orders: list[dict[str, Any]] = []
+        self._book = OrderBook()
+        self._net = 0.0
+        self._gross = 0.0
+        self._equity = initial_cash
+        self._peak = initial_cash
+        self._drawdown = 0.0
+        self._loss_streak = 0
+
+    def _revalue(self, position: Position, market_price: float) -> None:
+        old = position.market_value()
+        position.market_price = market_price
+        new = position.market_value()
+        self._net += new - old
+        self._gross += abs(new) - abs(old)
+
+    def _update_equity(self) -> None:
+        if not self._positions:
+            # Re-anchor the running sums so rounding cannot accumulate across round trips.
+            self._net = self._gross = 0.0
+        self._equity = self._cash + self._net
+        self._peak = max(self._peak, self._equity)
+        self._drawdown = (self._peak - self._equity) / self._peak if self._peak > 0 else 0.0
+
+    def mark_price(self, symbol: str, market_price: float) -> None:
+        position = self._positions.get(symbol)
+        if position is not None:
+            self._revalue(position, market_price)
+            self._update_equity()
+
+    def mark_prices(self, prices: dict[str, float]) -> None:
+        """Mark-to-market held positions; symbols without a position are ignored."""
+        for symbol, market_price in prices.items():
+            position = self._positions.get(symbol)
+            if position is not None:
+                self._revalue(position, market_price)
+        self._update_equity()
 
     def get_account(self) -> dict[str, Any]:
-        equity = self._cash + sum(pos.market_value() for pos in self._positions.values())
-        return {"cash": self._cash, "equity": equity}
+        return {"cash": self._cash, "equity": self._equity}
+
+    def position(self, symbol: str) -> Position | None:
+        return self._positions.get(symbol)
 
     def get_positions(self) -> list[dict[str, Any]]:
         return [
@@ -33,10 +83,38 @@ class PaperBroker(Broker):
         ]
 
     def place_order(self, order: OrderRequest) -> Fill:
-        price = order.market_price or order.limit_price or order.stop_price
-        if price is None:
+        if order.order_type in RESTING_ORDER_TYPES:
+            raise RuntimeError(f"resting_order_requires_submit:{order.order_type}")
+        if order.market_price is None:
             raise RuntimeError("market_price_required_for_paper")
-        fill, _log = self._simulator.simulate_fill(order, price)
+        fill, _log = self._simulator.simulate_fill(order, order.market_price)
+        return self._apply_fill(fill)
+
+    def submit_order(self, order: OrderRequest, oco_group: str | None = None) -> str:
+        """Rest a limit/stop/stop-limit order in the book; returns its order id."""
+        return self._book.add(order, oco_group=oco_group)
+
+    def replace_order(
+        self,
+        order_id: str,
+        quantity: float | None = None,
+        limit_price: float | None = None,
+        stop_price: float | None = None,
+    ) -> dict[str, Any]:
+        self._book.replace(order_id, quantity=quantity, limit_price=limit_price, stop_price=stop_price)
+        return {"status": "replaced", "order_id": order_id}
+
+    def process_bar(self, bar: Bar) -> list[Fill]:
+        """Fill the resting orders for ``bar.symbol`` that the bar's range reaches."""
+        fills: list[Fill] = []
+        for match in self._book.match(bar):
+            fill, _log = self._simulator.simulate_fill(
+                match.resting.order, match.price, timestamp=bar.ts, maker=match.maker
+            )
+            fills.append(self._apply_fill(fill))
+        return fills
+
+    def _apply_fill(self, fill: Fill) -> Fill:
         signed_qty = fill.quantity if fill.side == "buy" else -fill.quantity
         cost = fill.price * fill.quantity + fill.fee
         if fill.side == "sell":
@@ -45,8 +123,14 @@ class PaperBroker(Broker):
             self._cash -= cost
         position = self._positions.get(fill.symbol)
         if position:
+            if position.quantity * signed_qty < 0:
+                closed = min(abs(signed_qty), abs(position.quantity))
+                direction = 1.0 if position.quantity > 0 else -1.0
+                realized = closed * (fill.price - position.avg_price) * direction - fill.fee
+                self._loss_streak = self._loss_streak + 1 if realized < 0 else 0
             new_qty = position.quantity + signed_qty
             if new_qty == 0:
+                self._revalue(position, 0.0)
                 self._positions.pop(fill.symbol)
             else:
                 if (position.quantity > 0 and signed_qty > 0) or (position.quantity < 0 and signed_qty < 0):
@@ -55,36 +139,31 @@ class PaperBroker(Broker):
                     position.avg_price = position.avg_price
                 else:
                     position.avg_price = fill.price
+                self._revalue(position, 0.0)
                 position.quantity = new_qty
-                position.market_price = fill.price
+                self._revalue(position, fill.price)
         else:
-            self._positions[fill.symbol] = Position(
-                symbol=fill.symbol,
-                quantity=signed_qty,
-                avg_price=fill.price,
-                market_price=fill.price,
-            )
+            position = Position(symbol=fill.symbol, quantity=signed_qty, avg_price=fill.price, market_price=0.0)
+            self._positions[fill.symbol] = position
+            self._revalue(position, fill.price)
+        self._update_equity()
         return fill
 
     def cancel_order(self, order_id: str) -> dict[str, Any]:
-        self._open_orders = [o for o in self._open_orders if o.get("id") != order_id]
-        return {"status": "cancelled", "order_id": order_id}
+        status = "cancelled" if self._book.cancel(order_id) is not None else "not_found"
+        return {"status": status, "order_id": order_id}
 
     def get_open_orders(self) -> list[dict[str, Any]]:
-        return list(self._open_orders)
+        return self._book.open_orders()
 
     def snapshot(self) -> PortfolioState:
-        account = self.get_account()
-        equity = float(account.get("equity", 0.0))
-        gross = sum(abs(pos.market_value()) for pos in self._positions.values())
-        net = sum(pos.market_value() for pos in self._positions.values())
         return PortfolioState(
-            cash=float(account.get("cash", 0.0)),
-            equity=equity,
+            cash=self._cash,
+            equity=self._equity,
             positions=self._positions,
-            gross_exposure=gross,
-            net_exposure=net,
-            peak_equity=max(equity, equity),
-            drawdown=0.0,
-            loss_streak=0,
+            gross_exposure=self._gross,
+            net_exposure=self._net,
+            peak_equity=self._peak,
+            drawdown=self._drawdown,
+            loss_streak=self._loss_streak,
         )
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+import weakref
+import zlib
+from pathlib import Path
+from typing import Any, Sequence
+
+from .config import CoreSettings
+from .models import Bar
+from .series import BarSeries, as_series
+
+
+def fingerprint_series(bars: Sequence[Bar] | BarSeries) -> str:
+    series = as_series(bars)
+    digest = hashlib.sha256()
+    digest.update(json.dumps([series.symbol, series.timeframe, series.source, len(series)]).encode("utf-8"))
+    for column in (series.ts, series.open, series.high, series.low, series.close, series.volume):
+        digest.update(column.tobytes())
+    return digest.hexdigest()
+
+
+class BacktestCache:
+    """Content-addressed store for backtest results, bounded by size with LRU eviction.
+
+    Keys hash the bar data, strategy name/version/params and the execution and
+    risk configs, so any change to those is a miss. Entries for an older
+    ``Strategy.version`` never match again and can be dropped with
+    ``invalidate``.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._fingerprints: weakref.WeakKeyDictionary[BarSeries, str] = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+        self._init_db()
+
+    @property
+    def path(self) -> str:
+        return str(self._path)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self._path), timeout=30)
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT,
+                    strategy TEXT,
+                    version TEXT,
+                    size INTEGER,
+                    created_at REAL,
+                    last_access REAL,
+                    payload BLOB
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_access ON results(last_access)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_strategy ON results(strategy, version)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)")
+
+    def fingerprint(self, bars: Sequence[Bar] | BarSeries) -> str:
+        # Only a BarSeries is memoized: a list can be appended to or edited in place between runs.
+        if not isinstance(bars, BarSeries):
+            return fingerprint_series(bars)
+        value = self._fingerprints.get(bars)
+        if value is None:
+            value = fingerprint_series(bars)
+            self._fingerprints[bars] = value
+        return value
+
+    def make_key(self, kind: str, strategy: Any, bars: Sequence[Bar] | BarSeries, **context: Any) -> str:
+        payload = {
+            "kind": kind,
+            "bars": self.fingerprint(bars),
+            "strategy": strategy.name,
+            "version": strategy.version,
+            "params": strategy.params,
+            "context": context,
+        }
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+            counter = "misses" if row is None else "hits"
+            conn.execute(
+                """
+                INSERT INTO counters (name, value) VALUES (?, 1)
+                ON CONFLICT(name) DO UPDATE SET value = value + 1
+                """,
+                (counter,),
+            )
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, kind: str, strategy: Any, value: Any) -> None:
+        blob = zlib.compress(json.dumps(value).encode("utf-8"))
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO results
+                (key, kind, strategy, version, size, created_at, last_access, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, kind, strategy.name, strategy.version, len(blob), now, now, sqlite3.Binary(blob)),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM results ORDER BY last_access ASC").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self._max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def invalidate(self, strategy: str | None = None, keep_version: str | None = None) -> int:
+        """Drop entries for ``strategy`` (all strategies if None), optionally keeping ``keep_version``."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if strategy is not None:
+            clauses.append("strategy = ?")
+            params.append(strategy)
+        if keep_version is not None:
+            clauses.append("version != ?")
+            params.append(keep_version)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            cursor = conn.execute(f"DELETE FROM results{where}", params)
+            return cursor.rowcount
+
+    def stats(self) -> dict[str, Any]:
+        with self._connect() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            totals = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "total_hits": int(totals.get("hits", 0)),
+            "total_misses": int(totals.get("misses", 0)),
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self._max_bytes,
+        }
+
+
+def open_result_cache(settings: CoreSettings) -> BacktestCache:
+    path = Path(settings.run.artifacts_dir) / "cache" / "results.sqlite"
+    return BacktestCache(str(path), max_bytes=settings.run.result_cache_mb * 1024 * 1024)
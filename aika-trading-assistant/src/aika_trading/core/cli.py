@@ -2,15 +2,17 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 import uuid
 
 from .config import CoreSettings
 from .runner import run_paper_session
 from .data import SyntheticDataProvider
-from .strategy import registry
+from .strategy import registry, StrategyFactory
 from .backtest import run_backtest, run_grid_search, save_backtest_artifacts
-from .storage import RunStore
+from .storage import open_run_store
 from .walk_forward import walk_forward, save_walk_forward_artifacts
+from .bench import DEFAULT_SIZES, compare_benchmarks, load_benchmarks, run_benchmarks, save_benchmarks
 
 
 def _parse_symbols(raw: str) -> list[str]:
@@ -26,6 +28,10 @@ def run_trade(args: argparse.Namespace) -> None:
         settings.run.strategy = args.strategy
     if args.timeframe:
         settings.data.timeframe = args.timeframe
+    if args.ensemble:
+        settings.run.ensemble = _parse_symbols(args.ensemble)
+        settings.run.ensemble_method = args.ensemble_method
+        settings.run.ensemble_risk_pct = args.ensemble_risk_pct
     if args.confirm_live:
         settings.confirm_live = True
         settings.confirm_live_token = settings.confirm_live_phrase
@@ -55,11 +61,17 @@ def run_grid_cli(args: argparse.Namespace) -> None:
     bars = provider.get_bars(args.symbol, args.timeframe, limit=200)
     grid = json.loads(args.grid) if args.grid else {"lookback": [20, 50, 80]}
     result = run_grid_search(
-        lambda **params: registry.create(args.strategy, **params),
+        StrategyFactory(args.strategy),
         bars,
         grid,
         base_dir=settings.run.artifacts_dir,
         objective=args.objective,
+        executor=args.executor,
+        max_workers=args.max_workers,
+        search=args.search,
+        n_trials=args.trials,
+        seed=settings.run.seed,
+        engine=args.engine,
     )
     print(json.dumps(result, indent=2))
 
@@ -69,12 +81,17 @@ def run_walk_forward_cli(args: argparse.Namespace) -> None:
     provider = SyntheticDataProvider(seed=settings.run.seed)
     bars = provider.get_bars(args.symbol, args.timeframe, limit=args.limit)
     run_id = args.run_id or str(uuid.uuid4())
+    grid = json.loads(args.grid) if args.grid else None
     results = walk_forward(
         bars,
-        lambda: registry.create(args.strategy, lookback=args.lookback),
+        StrategyFactory(args.strategy, {"lookback": args.lookback}),
         train_window=args.train,
         test_window=args.test,
         step=args.step,
+        param_grid=grid,
+        objective=args.objective,
+        executor=args.executor,
+        max_workers=args.max_workers,
     )
     save_walk_forward_artifacts(settings.run.artifacts_dir, run_id, results, {
         "strategy": args.strategy,
@@ -84,13 +101,53 @@ def run_walk_forward_cli(args: argparse.Namespace) -> None:
         "test_window": args.test,
         "step": args.step,
         "lookback": args.lookback,
+        "grid": grid,
+        "objective": args.objective,
     })
-    print(json.dumps({"run_id": run_id, "windows": len(results)}, indent=2))
+    print(json.dumps({
+        "run_id": run_id,
+        "windows": len(results),
+        "best_params": [item["best_params"] for item in results],
+    }, indent=2))
+
+
+def _report_regressions(current: dict, baseline_path: str, args: argparse.Namespace) -> None:
+    regressions = compare_benchmarks(
+        current,
+        load_benchmarks(baseline_path),
+        max_regression_pct=args.max_regression,
+        max_memory_regression_pct=args.max_memory_regression,
+    )
+    print(json.dumps({"baseline": baseline_path, "regressions": regressions}, indent=2))
+    if regressions:
+        sys.exit(1)
+
+
+def run_bench_cli(args: argparse.Namespace) -> None:
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+    phases = [value.strip() for value in args.phases.split(",") if value.strip()] or None
+    payload = run_benchmarks(
+        sizes,
+        phases,
+        repeat=args.repeat,
+        track_memory=not args.no_memory,
+        progress=lambda phase, bars, entry: print(
+            f"{phase:<24} {bars:>9} bars  {entry['seconds']:.4f}s", file=sys.stderr
+        ),
+    )
+    save_benchmarks(args.output, payload)
+    print(json.dumps({"output": args.output, "results": len(payload["results"])}, indent=2))
+    if args.baseline:
+        _report_regressions(payload, args.baseline, args)
+
+
+def compare_bench_cli(args: argparse.Namespace) -> None:
+    _report_regressions(load_benchmarks(args.current), args.baseline, args)
 
 
 def report_latest(args: argparse.Namespace) -> None:
     settings = CoreSettings()
-    store = RunStore(f"{settings.run.artifacts_dir}/runs.sqlite")
+    store = open_run_store(settings)
     latest = store.latest_run()
     print(json.dumps(latest or {}, indent=2))
 
@@ -106,6 +163,9 @@ def build_parser() -> argparse.ArgumentParser:
     trade_run.add_argument("--symbols", default="")
     trade_run.add_argument("--strategy", default="volatility_momentum")
     trade_run.add_argument("--timeframe", default="1h")
+    trade_run.add_argument("--ensemble", default="")
+    trade_run.add_argument("--ensemble-method", default="exp_decay", choices=["exp_decay", "multiplicative"])
+    trade_run.add_argument("--ensemble-risk-pct", type=float, default=0.02)
     trade_run.add_argument("--confirm-live", action="store_true")
     trade_run.set_defaults(func=run_trade)
 
@@ -125,6 +185,13 @@ def build_parser() -> argparse.ArgumentParser:
     backtest_grid.add_argument("--timeframe", default="1h")
     backtest_grid.add_argument("--grid", default="")
     backtest_grid.add_argument("--objective", default="sharpe")
+    backtest_grid.add_argument("--executor", choices=["serial", "process"], default="serial")
+    backtest_grid.add_argument("--max-workers", type=int, default=None)
+    backtest_grid.add_argument(
+        "--search", choices=["grid", "random", "lhs", "halving", "hyperband"], default="grid"
+    )
+    backtest_grid.add_argument("--trials", type=int, default=None)
+    backtest_grid.add_argument("--engine", choices=["event", "vectorized"], default="event")
     backtest_grid.set_defaults(func=run_grid_cli)
 
     backtest_walk = backtest_sub.add_parser("walk-forward")
@@ -136,9 +203,32 @@ def build_parser() -> argparse.ArgumentParser:
     backtest_walk.add_argument("--step", type=int, default=40)
     backtest_walk.add_argument("--lookback", type=int, default=50)
     backtest_walk.add_argument("--limit", type=int, default=300)
+    backtest_walk.add_argument("--grid", default="")
+    backtest_walk.add_argument("--objective", default="sharpe")
+    backtest_walk.add_argument("--executor", choices=["serial", "process"], default="serial")
+    backtest_walk.add_argument("--max-workers", type=int, default=None)
     backtest_walk.add_argument("--run-id", default="")
     backtest_walk.set_defaults(func=run_walk_forward_cli)
 
+    bench = sub.add_parser("bench")
+    bench_sub = bench.add_subparsers(dest="bench_cmd")
+    bench_run = bench_sub.add_parser("run")
+    bench_run.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES))
+    bench_run.add_argument("--phases", default="")
+    bench_run.add_argument("--repeat", type=int, default=1)
+    bench_run.add_argument("--no-memory", action="store_true")
+    bench_run.add_argument("--output", default="bench/results.json")
+    bench_run.add_argument("--baseline", default="")
+    bench_run.add_argument("--max-regression", type=float, default=20.0)
+    bench_run.add_argument("--max-memory-regression", type=float, default=None)
+    bench_run.set_defaults(func=run_bench_cli)
+    bench_compare = bench_sub.add_parser("compare")
+    bench_compare.add_argument("current")
+    bench_compare.add_argument("baseline")
+    bench_compare.add_argument("--max-regression", type=float, default=20.0)
+    bench_compare.add_argument("--max-memory-regression", type=float, default=None)
+    bench_compare.set_defaults(func=compare_bench_cli)
+
     report = sub.add_parser("report")
     report_sub = report.add_subparsers(dest="report_cmd")
     report_latest_cmd = report_sub.add_parser("open")
@@ -50,6 +50,14 @@ class RiskConfig(BaseModel):
     max_loss_streak: int = 5
     correlation_cap: float = 0.75
     vol_target: float = 0.15
+    # Pre-trade VaR/CVaR limits as a fraction of equity; 0 disables the check.
+    max_var_pct: float = 0.0
+    max_cvar_pct: float = 0.0
+    var_confidence: float = 0.99
+    var_method: str = "historical"
+    # Rolling returns window behind both the VaR limits and the correlation cap.
+    var_window: int = 250
+    var_min_periods: int = 30
 
 
 class BrokerConfig(BaseModel):
@@ -63,6 +71,12 @@ class RunConfig(BaseModel):
     seed: int = 7
     run_id: str | None = None
     artifacts_dir: str = Field(default_factory=lambda: str(_default_core_dir() / "runs"))
+    result_cache: bool = True
+    result_cache_mb: int = 512
+    ensemble: list[str] = Field(default_factory=list)
+    ensemble_method: str = "exp_decay"
+    # Fraction of equity behind each ensemble order; the voting strategies' own sizing is not used.
+    ensemble_risk_pct: float = 0.02
 
 
 class CoreSettings(BaseSettings):
@@ -74,6 +88,8 @@ class CoreSettings(BaseSettings):
     confirm_live_phrase: str = Field(default="I_UNDERSTAND_LIVE_TRADING", alias="CORE_CONFIRM_PHRASE")
     confirm_live: bool = Field(default=False, alias="CORE_CONFIRM_LIVE")
     confirm_live_token: str = Field(default="", alias="CORE_CONFIRM_TOKEN")
+    # SQLAlchemy URL (e.g. postgresql+psycopg://...) for run history; empty keeps runs.sqlite.
+    run_store_url: str = Field(default="", alias="CORE_RUN_STORE_URL")
 
     data: DataConfig = Field(default_factory=DataConfig)
     execution: ExecutionConfig = Field(default_factory=ExecutionConfig)
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+import json
+
+import numpy as np
 
 from .models import Signal, utc_now
 
@@ -35,3 +40,153 @@ class EnsembleEngine:
         if total <= 0:
             return {name: 1.0 / len(performance) for name in performance}
         return {name: max(0.0, perf) / total * decay for name, perf in performance.items()}
+
+    def combine_matrix(
+        self,
+        directions: np.ndarray,
+        weights: np.ndarray,
+        symbols: list[str],
+        threshold: float = 0.1,
+        strengths: np.ndarray | None = None,
+    ) -> "EnsembleSignals":
+        return combine_matrix(directions, weights, symbols, threshold, strengths, self.min_weight, self.max_weight)
+
+
+@dataclass
+class EnsembleSignals:
+    """Combined scores for a whole universe; ``side`` is -1/0/1 per symbol."""
+
+    symbols: list[str]
+    score: np.ndarray
+    side: np.ndarray
+
+    def signal_for(self, idx: int) -> Signal:
+        side = int(self.side[idx])
+        score = float(self.score[idx])
+        return Signal(
+            symbol=self.symbols[idx],
+            side="long" if side > 0 else "short" if side < 0 else "flat",
+            strength=abs(score),
+            generated_at=utc_now(),
+            meta={"score": score},
+        )
+
+    def to_signals(self) -> list[Signal]:
+        return [self.signal_for(idx) for idx in range(len(self.symbols))]
+
+
+def combine_matrix(
+    directions: np.ndarray,
+    weights: np.ndarray,
+    symbols: list[str],
+    threshold: float = 0.1,
+    strengths: np.ndarray | None = None,
+    min_weight: float = 0.0,
+    max_weight: float = 1.0,
+) -> EnsembleSignals:
+    """Vectorized ``EnsembleEngine.combine`` over a (strategies x symbols) direction matrix.
+
+    ``directions`` holds -1/0/1 per strategy and symbol; with ``strengths`` each
+    vote is scaled by its strength. One matrix-vector product scores the whole
+    universe.
+    """
+    votes = np.asarray(directions, dtype=np.float64)
+    if votes.ndim != 2 or votes.shape[1] != len(symbols):
+        raise ValueError("ensemble_shape_mismatch")
+    if strengths is not None:
+        votes = votes * np.asarray(strengths, dtype=np.float64)
+    clipped = np.clip(np.asarray(weights, dtype=np.float64), min_weight, max_weight)
+    if clipped.shape != (votes.shape[0],):
+        raise ValueError("ensemble_shape_mismatch")
+    score = clipped @ votes
+    side = np.where(np.abs(score) < threshold, 0, np.sign(score)).astype(np.int8)
+    return EnsembleSignals(symbols=list(symbols), score=score, side=side)
+
+
+@dataclass
+class OnlineWeights:
+    """Strategy weights updated online from per-period rewards and persisted as JSON.
+
+    ``exp_decay`` keeps an exponentially decayed average reward per strategy and
+    weights positive averages proportionally (uniform when none are positive).
+    ``multiplicative`` is the Hedge update ``w *= exp(learning_rate * reward)``.
+    ``last_stamp`` names the bar the latest reward came from, so replaying a
+    session on the same data does not apply the same reward twice.
+    """
+
+    names: list[str]
+    method: str = "exp_decay"
+    decay: float = 0.9
+    learning_rate: float = 0.5
+    performance: np.ndarray = field(default_factory=lambda: np.empty(0))
+    weights: np.ndarray = field(default_factory=lambda: np.empty(0))
+    updates: int = 0
+    last_stamp: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.method not in ("exp_decay", "multiplicative"):
+            raise ValueError(f"unknown_weighting:{self.method}")
+        count = len(self.names)
+        if self.performance.shape != (count,):
+            self.performance = np.zeros(count)
+        if self.weights.shape != (count,):
+            self.weights = np.full(count, 1.0 / count) if count else np.empty(0)
+
+    def update(self, rewards: np.ndarray, stamp: str | None = None) -> np.ndarray:
+        """Apply one period's ``rewards``; a no-op without strategies or when ``stamp`` repeats."""
+        if not self.names or (stamp is not None and stamp == self.last_stamp):
+            return self.weights
+        rewards = np.nan_to_num(np.asarray(rewards, dtype=np.float64))
+        self.performance = self.decay * self.performance + (1.0 - self.decay) * rewards
+        if self.method == "exp_decay":
+            positive = np.maximum(self.performance, 0.0)
+            total = positive.sum()
+            self.weights = positive / total if total > 0 else np.full(len(self.names), 1.0 / len(self.names))
+        else:
+            # Shift by the max before exponentiating so large rewards cannot overflow.
+            scaled = self.learning_rate * rewards
+            grown = self.weights * np.exp(scaled - scaled.max())
+            self.weights = grown / grown.sum()
+        self.updates += 1
+        if stamp is not None:
+            self.last_stamp = stamp
+        return self.weights
+
+    def as_dict(self) -> dict[str, float]:
+        return {name: float(weight) for name, weight in zip(self.names, self.weights)}
+
+    def save(self, path: str) -> None:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "names": self.names,
+            "method": self.method,
+            "decay": self.decay,
+            "learning_rate": self.learning_rate,
+            "performance": self.performance.tolist(),
+            "weights": self.weights.tolist(),
+            "updates": self.updates,
+            "last_stamp": self.last_stamp,
+        }
+        target.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    @staticmethod
+    def load(path: str, names: list[str], method: str = "exp_decay", **params: Any) -> "OnlineWeights":
+        """Restore saved state for ``names``; strategies not seen before start at the mean weight."""
+        fresh = OnlineWeights(list(names), method=method, **params)
+        target = Path(path)
+        if not target.exists():
+            return fresh
+        payload = json.loads(target.read_text(encoding="utf-8"))
+        if payload.get("method") != method:
+            return fresh
+        saved = dict(zip(payload.get("names", []), zip(payload.get("performance", []), payload.get("weights", []))))
+        if saved:
+            default_weight = float(np.mean([weight for _perf, weight in saved.values()]))
+            fresh.performance = np.array([saved.get(name, (0.0, 0.0))[0] for name in names], dtype=np.float64)
+            weights = np.array([saved.get(name, (0.0, default_weight))[1] for name in names], dtype=np.float64)
+            total = weights.sum()
+            fresh.weights = weights / total if total > 0 else fresh.weights
+        fresh.updates = int(payload.get("updates", 0))
+        fresh.last_stamp = payload.get("last_stamp")
+        return fresh
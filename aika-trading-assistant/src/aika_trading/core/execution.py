@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, Iterator, Sequence
+
+import numpy as np
 
 from .config import ExecutionConfig
 from .models import Fill, OrderRequest, utc_now
@@ -27,6 +30,9 @@ class FeeModel:
         fee = price * quantity * (self._fee_bps / 10_000)
         return max(self._min_fee, fee)
 
+    def compute_array(self, prices: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        return np.maximum(self._min_fee, prices * quantities * (self._fee_bps / 10_000))
+
 
 class SlippageModel:
     def __init__(self, slippage_bps: float) -> None:
@@ -39,6 +45,9 @@ class SlippageModel:
             return price * (1 - self._slippage_bps / 10_000)
         return price
 
+    def apply_array(self, prices: np.ndarray, sides: np.ndarray) -> np.ndarray:
+        return _apply_side_factor(prices, sides, self._slippage_bps / 10_000)
+
 
 class SpreadModel:
     def __init__(self, spread_bps: float) -> None:
@@ -52,6 +61,9 @@ class SpreadModel:
             return price * (1 - half)
         return price
 
+    def apply_array(self, prices: np.ndarray, sides: np.ndarray) -> np.ndarray:
+        return _apply_side_factor(prices, sides, self._spread_bps / 20_000)
+
 
 class LiquidityGuard:
     def __init__(self, min_volume: float, max_adv_pct: float) -> None:
@@ -65,6 +77,102 @@ class LiquidityGuard:
             return False
         return quantity <= daily_volume * self._max_adv_pct
 
+    def allow_array(self, quantities: np.ndarray, daily_volumes: np.ndarray | None) -> np.ndarray:
+        """Vectorized ``allow``; a NaN volume means unknown, like ``None``."""
+        if daily_volumes is None:
+            return np.ones(len(quantities), dtype=bool)
+        unknown = np.isnan(daily_volumes)
+        with np.errstate(invalid="ignore"):
+            ok = (daily_volumes >= self._min_volume) & (quantities <= daily_volumes * self._max_adv_pct)
+        return unknown | ok
+
+
+def _apply_side_factor(prices: np.ndarray, sides: np.ndarray, rate: float) -> np.ndarray:
+    # Same arithmetic as the scalar models: buys pay price * (1 + rate), sells get price * (1 - rate).
+    return np.where(sides > 0, prices * (1 + rate), np.where(sides < 0, prices * (1 - rate), prices))
+
+
+_SIDE_CODES = {"buy": 1, "sell": -1}
+_SIDE_NAMES = {1: "buy", -1: "sell"}
+
+
+@dataclass
+class OrderArrays:
+    """Columnar batch of orders: ``side`` is 1 for buy and -1 for sell."""
+
+    symbols: Sequence[str]
+    side: np.ndarray
+    quantity: np.ndarray
+    order_ids: Sequence[str | None] | None = None
+
+    @classmethod
+    def from_orders(cls, orders: Sequence[OrderRequest]) -> "OrderArrays":
+        return cls(
+            symbols=[order.symbol for order in orders],
+            side=np.array([_SIDE_CODES.get(order.side, 0) for order in orders], dtype=np.int8),
+            quantity=np.array([order.quantity for order in orders], dtype=np.float64),
+            order_ids=[order.client_order_id for order in orders],
+        )
+
+    def __len__(self) -> int:
+        return len(self.quantity)
+
+
+@dataclass
+class FillArrays:
+    """Columnar result of ``ExecutionSimulator.simulate_fills``.
+
+    ``filled`` is False where the liquidity guard blocked the order (its price
+    and fee are still computed). ``Fill`` objects, and ids for orders that had
+    none, are only built on access.
+    """
+
+    symbols: Sequence[str]
+    side: np.ndarray
+    quantity: np.ndarray
+    price: np.ndarray
+    fee: np.ndarray
+    filled: np.ndarray
+    filled_at: datetime
+    assumptions: dict[str, Any]
+    order_ids: Sequence[str | None] | None = None
+    _fills: dict[int, Fill] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.quantity)
+
+    @property
+    def notional(self) -> np.ndarray:
+        return self.price * self.quantity
+
+    def fill_at(self, idx: int) -> Fill:
+        fill = self._fills.get(idx)
+        if fill is None:
+            order_id = self.order_ids[idx] if self.order_ids is not None else None
+            assumptions = self.assumptions
+            fill = Fill(
+                order_id=order_id or str(uuid.uuid4()),
+                symbol=self.symbols[idx],
+                side=_SIDE_NAMES.get(int(self.side[idx]), "flat"),
+                quantity=float(self.quantity[idx]),
+                price=float(self.price[idx]),
+                fee=float(self.fee[idx]),
+                slippage_bps=assumptions["slippage_bps"],
+                spread_bps=assumptions["spread_bps"],
+                latency_ms=assumptions["latency_ms"],
+                filled_at=self.filled_at,
+                assumptions=dict(assumptions),
+            )
+            self._fills[idx] = fill
+        return fill
+
+    def __iter__(self) -> Iterator[Fill]:
+        for idx in np.flatnonzero(self.filled).tolist():
+            yield self.fill_at(idx)
+
+    def to_fills(self) -> list[Fill]:
+        return list(self)
+
 
 class ExecutionSimulator:
     def __init__(self, config: ExecutionConfig) -> None:
@@ -74,17 +182,31 @@ class ExecutionSimulator:
         self._latency_ms = config.latency_ms
         self._liquidity_guard = LiquidityGuard(config.min_volume, config.max_adv_pct)
 
+    def _assumptions(self) -> dict[str, Any]:
+        return {
+            "fee_bps": self._fee_model._fee_bps,
+            "slippage_bps": self._slippage_model._slippage_bps,
+            "spread_bps": self._spread_model._spread_bps,
+            "latency_ms": self._latency_ms,
+        }
+
     def simulate_fill(
         self,
         order: OrderRequest,
         market_price: float,
         market_volume: float | None = None,
         timestamp: datetime | None = None,
+        maker: bool = False,
     ) -> tuple[Fill, ExecutionLog]:
+        """Fill ``order`` at ``market_price`` plus costs; ``maker`` fills (resting limits) pay fees only."""
         if not self._liquidity_guard.allow(order.quantity, market_volume):
             raise RuntimeError("liquidity_guard_blocked")
-        price = self._spread_model.apply(market_price, order.side)
-        price = self._slippage_model.apply(price, order.side)
+        slippage_bps = 0.0 if maker else self._slippage_model._slippage_bps
+        spread_bps = 0.0 if maker else self._spread_model._spread_bps
+        price = market_price
+        if not maker:
+            price = self._spread_model.apply(price, order.side)
+            price = self._slippage_model.apply(price, order.side)
         fee = self._fee_model.compute(price, order.quantity)
         filled_at = timestamp or utc_now()
         fill = Fill(
@@ -94,22 +216,49 @@ class ExecutionSimulator:
             quantity=order.quantity,
             price=price,
             fee=fee,
-            slippage_bps=self._slippage_model._slippage_bps,
-            spread_bps=self._spread_model._spread_bps,
+            slippage_bps=slippage_bps,
+            spread_bps=spread_bps,
             latency_ms=self._latency_ms,
             filled_at=filled_at,
-            assumptions={
-                "fee_bps": self._fee_model._fee_bps,
-                "slippage_bps": self._slippage_model._slippage_bps,
-                "spread_bps": self._spread_model._spread_bps,
-                "latency_ms": self._latency_ms,
-            },
+            assumptions=self._assumptions(),
         )
         log = ExecutionLog(
             fee=fee,
-            slippage_bps=self._slippage_model._slippage_bps,
-            spread_bps=self._spread_model._spread_bps,
+            slippage_bps=slippage_bps,
+            spread_bps=spread_bps,
             latency_ms=self._latency_ms,
             liquidity_ok=True,
         )
         return fill, log
+
+    def simulate_fills(
+        self,
+        orders: OrderArrays | Sequence[OrderRequest],
+        market_prices: np.ndarray | Sequence[float],
+        market_volumes: np.ndarray | Sequence[float] | None = None,
+        timestamp: datetime | None = None,
+    ) -> FillArrays:
+        """Batch ``simulate_fill``: spread, slippage, fees and the liquidity guard over arrays.
+
+        Prices and fees match ``simulate_fill`` order by order. Instead of
+        raising, blocked orders are reported through ``FillArrays.filled``;
+        NaN volumes count as unknown.
+        """
+        if not isinstance(orders, OrderArrays):
+            orders = OrderArrays.from_orders(orders)
+        prices = np.asarray(market_prices, dtype=np.float64)
+        volumes = None if market_volumes is None else np.asarray(market_volumes, dtype=np.float64)
+        if prices.shape != orders.quantity.shape or (volumes is not None and volumes.shape != prices.shape):
+            raise ValueError("fill_shape_mismatch")
+        price = self._slippage_model.apply_array(self._spread_model.apply_array(prices, orders.side), orders.side)
+        return FillArrays(
+            symbols=orders.symbols,
+            side=orders.side,
+            quantity=orders.quantity,
+            price=price,
+            fee=self._fee_model.compute_array(price, orders.quantity),
+            filled=self._liquidity_guard.allow_array(orders.quantity, volumes),
+            filled_at=timestamp or utc_now(),
+            assumptions=self._assumptions(),
+            order_ids=orders.order_ids,
+        )
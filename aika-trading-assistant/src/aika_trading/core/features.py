@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+from .cache import fingerprint_series
+from .models import Bar
+from .series import BarSeries, as_series
+from .strategy.rolling import rolling_max, rolling_mean, rolling_min, rolling_pstdev
+
+IndicatorFn = Callable[[BarSeries, int], np.ndarray]
+
+_INDICATORS: dict[str, IndicatorFn] = {}
+
+
+def indicator(name: str) -> Callable[[IndicatorFn], IndicatorFn]:
+    def register(fn: IndicatorFn) -> IndicatorFn:
+        _INDICATORS[name] = fn
+        return fn
+
+    return register
+
+
+@indicator("returns")
+def _returns(series: BarSeries, window: int) -> np.ndarray:
+    closes = series.close
+    out = np.full(len(closes), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = closes[1:] / closes[:-1] - 1.0
+    return out
+
+
+@indicator("momentum")
+def _momentum(series: BarSeries, window: int) -> np.ndarray:
+    closes = series.close
+    out = np.full(len(closes), np.nan)
+    if 0 < window < len(closes):
+        out[window:] = closes[window:] / closes[: len(closes) - window] - 1.0
+    return out
+
+
+@indicator("close_mean")
+def _close_mean(series: BarSeries, window: int) -> np.ndarray:
+    return rolling_mean(series.close, window)
+
+
+@indicator("close_std")
+def _close_std(series: BarSeries, window: int) -> np.ndarray:
+    return rolling_pstdev(series.close, window)
+
+
+@indicator("return_std")
+def _return_std(series: BarSeries, window: int) -> np.ndarray:
+    return rolling_pstdev(_returns(series, 1), window)
+
+
+@indicator("true_range")
+def _true_range(series: BarSeries, window: int) -> np.ndarray:
+    closes, highs, lows = series.close, series.high, series.low
+    out = np.full(len(closes), np.nan)
+    if len(closes) > 1:
+        prev = closes[:-1]
+        out[1:] = np.maximum(
+            highs[1:] - lows[1:],
+            np.maximum(np.abs(highs[1:] - prev), np.abs(lows[1:] - prev)),
+        )
+    return out
+
+
+@indicator("atr")
+def _atr(series: BarSeries, window: int) -> np.ndarray:
+    return rolling_mean(_true_range(series, 1), window)
+
+
+@indicator("rolling_high")
+def _rolling_high(series: BarSeries, window: int) -> np.ndarray:
+    return rolling_max(series.high, window)
+
+
+@indicator("rolling_low")
+def _rolling_low(series: BarSeries, window: int) -> np.ndarray:
+    return rolling_min(series.low, window)
+
+
+class FeatureStore:
+    """Process-wide LRU of indicator arrays, bounded by ``max_bytes``.
+
+    Entries are keyed by (symbol, timeframe, indicator, window, data
+    fingerprint), so strategies, grid combinations and analytics asking for the
+    same indicator over the same bars share one vectorized computation. Returned
+    arrays are read-only. Fingerprints are memoized per series through weak
+    references, so the store never keeps a caller's bars alive.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[Any, ...], np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._fingerprints: weakref.WeakKeyDictionary[BarSeries, str] = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, series: BarSeries) -> str:
+        value = self._fingerprints.get(series)
+        if value is None:
+            value = fingerprint_series(series)
+            self._fingerprints[series] = value
+        return value
+
+    def get(self, bars: Sequence[Bar] | BarSeries, name: str, window: int = 1) -> np.ndarray:
+        compute = _INDICATORS.get(name)
+        if compute is None:
+            raise KeyError(f"indicator_not_found:{name}")
+        series = as_series(bars)
+        key = (series.symbol, series.timeframe, name, int(window), self.fingerprint(series))
+        values = self._entries.get(key)
+        if values is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return values
+        self.misses += 1
+        values = np.asarray(compute(series, int(window)), dtype=np.float64)
+        values.setflags(write=False)
+        if values.nbytes <= self._max_bytes:
+            self._entries[key] = values
+            self._bytes += values.nbytes
+            self._evict()
+        return values
+
+    def _evict(self) -> None:
+        while self._bytes > self._max_bytes and self._entries:
+            _key, values = self._entries.popitem(last=False)
+            self._bytes -= values.nbytes
+
+    def resize(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._fingerprints.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+        }
+
+
+feature_store = FeatureStore()
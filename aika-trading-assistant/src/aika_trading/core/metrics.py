@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 import math
+from array import array
+from pathlib import Path
 from statistics import mean, pstdev
+from typing import Any
+
+from .montecarlo import monte_carlo
 
 
 def max_drawdown(equity_curve: list[float]) -> float:
@@ -93,14 +98,154 @@ def expectancy(trade_returns: list[float]) -> float:
     return mean(trade_returns)
 
 
-def monte_carlo_resample(returns: list[float], trials: int = 200) -> list[float]:
+class _Welford:
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def pstdev(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / self.count)
+
+
+class EquityCurveWriter:
+    """Appends equity points to a raw float64 file in fixed-size chunks.
+
+    Read back with ``read_equity_curve`` (or ``numpy.fromfile``).
+    """
+
+    def __init__(self, path: str, buffer_size: int = 4096) -> None:
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.path, "wb")
+        self._buffer = array("d")
+        self._buffer_size = max(1, buffer_size)
+        self.count = 0
+
+    def write(self, value: float) -> None:
+        self._buffer.append(value)
+        self.count += 1
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._buffer.tofile(self._handle)
+            self._buffer = array("d")
+        self._handle.flush()
+
+    def close(self) -> None:
+        if not self._handle.closed:
+            self.flush()
+            self._handle.close()
+
+    def __enter__(self) -> "EquityCurveWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def read_equity_curve(path: str) -> list[float]:
+    values = array("d")
+    values.frombytes(Path(path).read_bytes())
+    return values.tolist()
+
+
+class MetricsAccumulator:
+    """Single-pass version of the metrics above: ``update`` is O(1) per equity point.
+
+    Keeps Welford mean/variance of all and of negative returns, the running
+    peak and max drawdown, the underwater streak and win/loss sums, so the
+    equity curve itself does not have to be held. ``result`` returns the same
+    keys as run_backtest's metrics.
+    """
+
+    def __init__(self, periods_per_year: int, writer: EquityCurveWriter | None = None) -> None:
+        self.periods_per_year = periods_per_year
+        self.writer = writer
+        self.count = 0
+        self.first = 0.0
+        self.last = 0.0
+        self._peak = -math.inf
+        self._max_dd = 0.0
+        self._underwater = 0
+        self._longest_underwater = 0
+        self._returns = _Welford()
+        self._downside = _Welford()
+        self._wins = 0
+        self._gains = 0.0
+        self._losses = 0.0
+
+    def update(self, equity: float) -> None:
+        if self.writer is not None:
+            self.writer.write(equity)
+        if self.count == 0:
+            self.first = equity
+        elif self.last != 0:
+            ret = equity / self.last - 1.0
+            self._returns.push(ret)
+            if ret > 0:
+                self._wins += 1
+                self._gains += ret
+            elif ret < 0:
+                self._losses -= ret
+                self._downside.push(ret)
+        if equity >= self._peak:
+            self._peak = equity
+            self._underwater = 0
+        else:
+            self._underwater += 1
+            self._longest_underwater = max(self._longest_underwater, self._underwater)
+        if self._peak != 0:
+            self._max_dd = max(self._max_dd, (self._peak - equity) / self._peak)
+        self.last = equity
+        self.count += 1
+
+    def cagr(self) -> float:
+        if self.count < 2:
+            return 0.0
+        total_return = self.last / self.first - 1.0
+        years = self.count / max(self.periods_per_year, 1)
+        return (1 + total_return) ** (1 / years) - 1.0
+
+    def _ratio(self, std: float) -> float:
+        if std == 0:
+            return 0.0
+        return (self._returns.mean / std) * math.sqrt(self.periods_per_year)
+
+    def result(self) -> dict[str, Any]:
+        returns = self._returns
+        cagr_value = self.cagr()
+        sharpe_value = self._ratio(returns.pstdev()) if returns.count >= 2 else 0.0
+        sortino_value = 0.0
+        if returns.count >= 2 and self._downside.count:
+            sortino_value = self._ratio(self._downside.pstdev())
+        return {
+            "cagr": cagr_value,
+            "sharpe": sharpe_value,
+            "sortino": sortino_value,
+            "calmar": cagr_value / self._max_dd if self._max_dd else 0.0,
+            "max_drawdown": self._max_dd,
+            "time_under_water": self._longest_underwater,
+            "win_rate": self._wins / returns.count if returns.count else 0.0,
+            "profit_factor": self._gains / self._losses if self._losses else 0.0,
+            "expectancy": returns.mean if returns.count else 0.0,
+        }
+
+
+def monte_carlo_resample(returns: list[float], trials: int = 200, seed: int | None = None) -> list[float]:
+    """Terminal returns of ``trials`` i.i.d. bootstrap paths; see ``montecarlo.monte_carlo``."""
     if not returns:
         return []
-    rng = [returns[i % len(returns)] for i in range(len(returns))]
-    results = []
-    for t in range(trials):
-        total = 1.0
-        for r in rng:
-            total *= (1 + r)
-        results.append(total - 1.0)
-    return results
+    return monte_carlo(returns, trials=trials, seed=seed).terminal_return.tolist()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+# Peak per-chunk working set, in (rows, horizon) 8-byte arrays (block sampling temporaries).
+_ARRAYS_PER_CHUNK = 6
+# Trials drawn from one child seed. Fixed, so paths do not depend on how trials are chunked.
+_SEED_BLOCK = 64
+
+
+@dataclass
+class MonteCarloResult:
+    method: str
+    trials: int
+    horizon: int
+    terminal_return: np.ndarray
+    max_drawdown: np.ndarray
+    sharpe: np.ndarray
+
+    def summary(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> dict[str, Any]:
+        levels = [float(p) for p in percentiles]
+        payload: dict[str, Any] = {"method": self.method, "trials": self.trials, "horizon": self.horizon}
+        for name in ("terminal_return", "max_drawdown", "sharpe"):
+            values = getattr(self, name)
+            if values.size == 0:
+                payload[name] = {"mean": 0.0, "std": 0.0, "percentiles": {}}
+                continue
+            payload[name] = {
+                "mean": float(values.mean()),
+                "std": float(values.std()),
+                "percentiles": {
+                    f"p{level:g}": float(value) for level, value in zip(levels, np.percentile(values, levels))
+                },
+            }
+        return payload
+
+
+def _sample_indices(
+    rng: np.random.Generator,
+    n_returns: int,
+    rows: int,
+    horizon: int,
+    method: str,
+    block_size: float,
+) -> np.ndarray:
+    if method == "iid":
+        return rng.integers(0, n_returns, size=(rows, horizon))
+    # Stationary bootstrap (Politis & Romano): blocks start at random points and have
+    # geometric lengths with mean block_size, wrapping around the end of the sample.
+    new_block = rng.random((rows, horizon)) < 1.0 / max(block_size, 1.0)
+    new_block[:, 0] = True
+    starts = rng.integers(0, n_returns, size=(rows, horizon))
+    positions = np.arange(horizon)
+    block_start = np.maximum.accumulate(np.where(new_block, positions, 0), axis=1)
+    origin = np.take_along_axis(starts, block_start, axis=1)
+    return (origin + positions - block_start) % n_returns
+
+
+def _simulate_chunk(
+    returns: np.ndarray,
+    block_rows: Sequence[int],
+    horizon: int,
+    method: str,
+    block_size: float,
+    periods_per_year: int,
+    seeds: Sequence[np.random.SeedSequence],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    indices = np.empty((sum(block_rows), horizon), dtype=np.intp)
+    start = 0
+    for rows, seed in zip(block_rows, seeds):
+        rng = np.random.default_rng(seed)
+        indices[start : start + rows] = _sample_indices(rng, returns.shape[0], rows, horizon, method, block_size)
+        start += rows
+    sampled = returns[indices]
+    del indices
+
+    mean = sampled.mean(axis=1)
+    std = sampled.std(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(periods_per_year), 0.0)
+
+    equity = np.cumprod(np.add(sampled, 1.0, out=sampled), axis=1, out=sampled)
+    terminal = equity[:, -1] - 1.0
+    # Paths start at 1.0, so the running peak is floored there (and is never zero).
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, 1.0, out=peak)
+    drawdown = 1.0 - np.divide(equity, peak, out=peak).min(axis=1)
+    return terminal, drawdown, sharpe
+
+
+def _simulate_task(args: tuple[Any, ...]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return _simulate_chunk(*args)
+
+
+def monte_carlo(
+    returns: Sequence[float] | np.ndarray,
+    trials: int = 10_000,
+    horizon: int | None = None,
+    method: str = "iid",
+    block_size: float = 20.0,
+    seed: int | None = None,
+    periods_per_year: int = 252,
+    max_memory_mb: int = 256,
+    executor: str = "serial",
+    max_workers: int | None = None,
+) -> MonteCarloResult:
+    """Bootstrap ``trials`` return paths of length ``horizon`` (default: len(returns)).
+
+    ``method`` is ``iid`` (independent draws) or ``block`` (stationary block
+    bootstrap with mean block length ``block_size``, which keeps volatility
+    clustering). Every block of 64 trials draws from its own child of
+    ``seed``, and blocks are grouped into chunks sized so the working set
+    stays under ``max_memory_mb`` (but never below one block). Results for a
+    given ``seed`` are therefore identical for any ``max_memory_mb`` and for
+    ``executor="serial"`` and ``executor="process"``.
+    """
+    if method not in ("iid", "block"):
+        raise ValueError(f"unknown_method:{method}")
+    if executor not in ("serial", "process"):
+        raise ValueError(f"unknown_executor:{executor}")
+    sample = np.asarray(returns, dtype=np.float64)
+    horizon = int(horizon or sample.shape[0])
+    if sample.size == 0 or trials <= 0 or horizon <= 0:
+        empty = np.empty(0)
+        return MonteCarloResult(method, 0, horizon, empty, empty, empty)
+
+    row_bytes = horizon * 8 * _ARRAYS_PER_CHUNK
+    chunk_rows = (max_memory_mb * 1024 * 1024) // row_bytes
+    blocks_per_chunk = max(1, chunk_rows // _SEED_BLOCK)
+    block_rows = [min(_SEED_BLOCK, trials - start) for start in range(0, trials, _SEED_BLOCK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(block_rows))
+    tasks = [
+        (
+            sample,
+            block_rows[first : first + blocks_per_chunk],
+            horizon,
+            method,
+            block_size,
+            periods_per_year,
+            seeds[first : first + blocks_per_chunk],
+        )
+        for first in range(0, len(block_rows), blocks_per_chunk)
+    ]
+    if executor == "process" and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            chunks = list(pool.map(_simulate_task, tasks))
+    else:
+        chunks = [_simulate_task(task) for task in tasks]
+    terminal, drawdown, sharpe = (np.concatenate(parts) for parts in zip(*chunks))
+    return MonteCarloResult(method, trials, horizon, terminal, drawdown, sharpe)
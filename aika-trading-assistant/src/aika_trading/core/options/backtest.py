@@ -3,8 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
+
+from ..features import feature_store
 from ..metrics import cagr, sharpe, max_drawdown
 from ..models import Bar
+from ..series import BarSeries, as_series, closes_of
 from .analytics import bs_price
 
 
@@ -15,13 +19,12 @@ class OptionsBacktestResult:
     trades: list[dict[str, Any]]
 
 
-def _realized_vol(bars: list[Bar], lookback: int = 20) -> float:
+def _realized_vol(bars: list[Bar] | BarSeries, lookback: int = 20) -> float:
     if len(bars) < lookback + 1:
         return 0.3
+    closes = closes_of(bars[-(lookback + 1) :])
     returns = []
-    for idx in range(-lookback, 0):
-        prev = bars[idx - 1].close
-        curr = bars[idx].close
+    for prev, curr in zip(closes, closes[1:]):
         if prev == 0:
             continue
         returns.append(curr / prev - 1)
@@ -33,6 +36,22 @@ def _realized_vol(bars: list[Bar], lookback: int = 20) -> float:
     return max(0.05, daily_vol * (252 ** 0.5))
 
 
+def _realized_vols(bars: list[Bar] | BarSeries, lookback: int = 20) -> np.ndarray:
+    """``_realized_vol(bars[:idx], lookback)`` for every ``idx``, from the shared feature store."""
+    count = len(bars)
+    vols = np.full(count + 1, 0.3)
+    if count < lookback + 1 or lookback < 1:
+        return vols
+    series = as_series(bars)
+    if not np.all(series.close):
+        # Zero closes are skipped by _realized_vol, which a fixed window cannot express.
+        return np.array([_realized_vol(bars[:idx], lookback) for idx in range(count + 1)])
+    std = np.asarray(feature_store.get(series, "return_std", lookback))
+    # bars[:idx] ends at idx - 1, so its window is the rolling std at idx - 1.
+    vols[lookback + 1 :] = np.maximum(0.05, std[lookback:] * (252 ** 0.5))
+    return vols
+
+
 def _metrics(equity_curve: list[float], periods_per_year: int = 12) -> dict[str, Any]:
     if len(equity_curve) < 2:
         return {"cagr": 0.0, "sharpe": 0.0, "max_drawdown": 0.0}
@@ -49,7 +68,7 @@ def _metrics(equity_curve: list[float], periods_per_year: int = 12) -> dict[str,
 
 
 def backtest_wheel(
-    bars: list[Bar],
+    bars: list[Bar] | BarSeries,
     initial_cash: float = 10_000.0,
     hold_days: int = 30,
     put_otm_pct: float = 0.05,
@@ -61,12 +80,13 @@ def backtest_wheel(
     shares = 0
     equity_curve: list[float] = []
     trades: list[dict[str, Any]] = []
+    vols = _realized_vols(bars, lookback)
     for idx in range(max(lookback, 1), len(bars) - hold_days, hold_days):
         entry = bars[idx]
         expiry = bars[idx + hold_days]
         spot = entry.close
         exp_price = expiry.close
-        vol = _realized_vol(bars[:idx], lookback)
+        vol = float(vols[idx])
         t = hold_days / 365
         if shares == 0:
             strike = spot * (1 - put_otm_pct)
@@ -107,14 +127,14 @@ def backtest_wheel(
 
 
 def backtest_covered_call(
-    bars: list[Bar],
+    bars: list[Bar] | BarSeries,
     initial_cash: float = 10_000.0,
     hold_days: int = 30,
     call_otm_pct: float = 0.05,
     lookback: int = 20,
     rate: float = 0.02,
 ) -> OptionsBacktestResult:
-    if not bars:
+    if not len(bars):
         return OptionsBacktestResult(metrics={}, equity_curve=[], trades=[])
     spot0 = bars[0].close
     if initial_cash < spot0 * 100:
@@ -123,12 +143,13 @@ def backtest_covered_call(
     shares = 100
     equity_curve: list[float] = []
     trades: list[dict[str, Any]] = []
+    vols = _realized_vols(bars, lookback)
     for idx in range(max(lookback, 1), len(bars) - hold_days, hold_days):
         entry = bars[idx]
         expiry = bars[idx + hold_days]
         spot = entry.close
         exp_price = expiry.close
-        vol = _realized_vol(bars[:idx], lookback)
+        vol = float(vols[idx])
         t = hold_days / 365
         strike = spot * (1 + call_otm_pct)
         premium = bs_price(spot, strike, t, rate, vol, "call")
@@ -151,7 +172,7 @@ def backtest_covered_call(
 
 
 def backtest_vertical(
-    bars: list[Bar],
+    bars: list[Bar] | BarSeries,
     initial_cash: float = 10_000.0,
     hold_days: int = 30,
     long_pct: float = 0.0,
@@ -163,12 +184,13 @@ def backtest_vertical(
     cash = initial_cash
     equity_curve: list[float] = []
     trades: list[dict[str, Any]] = []
+    vols = _realized_vols(bars, lookback)
     for idx in range(max(lookback, 1), len(bars) - hold_days, hold_days):
         entry = bars[idx]
         expiry = bars[idx + hold_days]
         spot = entry.close
         exp_price = expiry.close
-        vol = _realized_vol(bars[:idx], lookback)
+        vol = float(vols[idx])
         t = hold_days / 365
         long_strike = spot * (1 + long_pct)
         short_strike = spot * (1 + short_pct)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import uuid
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .models import Bar, OrderRequest
+
+RESTING_ORDER_TYPES = ("limit", "stop", "stop_limit")
+# Rebuild a symbol's heaps once there are this many cancelled entries and they outnumber live ones.
+_COMPACT_MIN_STALE = 1024
+
+
+@dataclass
+class RestingOrder:
+    order_id: str
+    order: OrderRequest
+    seq: int
+    group: str | None = None
+    triggered: bool = False
+    active: bool = True
+    # False between being popped from a heap and being re-pushed, so a cancel there leaves no stale entry.
+    queued: bool = False
+
+    @property
+    def working_type(self) -> str:
+        """``stop`` or ``limit``: a triggered stop-limit works as a limit order."""
+        if self.order.order_type == "stop" or (self.order.order_type == "stop_limit" and not self.triggered):
+            return "stop"
+        return "limit"
+
+    def to_dict(self) -> dict[str, Any]:
+        order = self.order
+        return {
+            "id": self.order_id,
+            "symbol": order.symbol,
+            "side": order.side,
+            "quantity": order.quantity,
+            "order_type": order.order_type,
+            "limit_price": order.limit_price,
+            "stop_price": order.stop_price,
+            "time_in_force": order.time_in_force,
+            "triggered": self.triggered,
+            "oco_group": self.group,
+        }
+
+
+@dataclass(frozen=True)
+class BookMatch:
+    resting: RestingOrder
+    price: float
+    # Limit fills add liquidity and skip spread/slippage; triggered stops trade as market orders.
+    maker: bool
+
+
+class _SymbolBook:
+    """Four heaps whose top is the next order to trigger.
+
+    Buy stops and sell limits trigger when the bar's high reaches them (min-heaps
+    on price); sell stops and buy limits when its low does (max-heaps, stored
+    negated). Entries are (key, seq, order), so equal prices fill in time order.
+    """
+
+    def __init__(self) -> None:
+        self.heaps: dict[tuple[str, str], list[tuple[float, int, RestingOrder]]] = {
+            ("stop", "buy"): [],
+            ("stop", "sell"): [],
+            ("limit", "buy"): [],
+            ("limit", "sell"): [],
+        }
+        self.live = 0
+        self.stale = 0
+
+    @staticmethod
+    def _triggers_on_high(kind: str, side: str) -> bool:
+        return (kind, side) in (("stop", "buy"), ("limit", "sell"))
+
+    def _key(self, kind: str, side: str, price: float) -> float:
+        return price if self._triggers_on_high(kind, side) else -price
+
+    def push(self, resting: RestingOrder) -> None:
+        kind = resting.working_type
+        order = resting.order
+        price = order.stop_price if kind == "stop" else order.limit_price
+        resting.queued = True
+        heapq.heappush(
+            self.heaps[(kind, order.side)],
+            (self._key(kind, order.side, float(price)), resting.seq, resting),
+        )
+
+    def pop_triggered(self, kind: str, side: str, bar: Bar) -> list[RestingOrder]:
+        heap = self.heaps[(kind, side)]
+        threshold = self._key(kind, side, bar.high if self._triggers_on_high(kind, side) else bar.low)
+        triggered: list[RestingOrder] = []
+        while heap and heap[0][0] <= threshold:
+            _key, _seq, resting = heapq.heappop(heap)
+            resting.queued = False
+            if resting.active:
+                triggered.append(resting)
+            else:
+                self.stale -= 1
+        return triggered
+
+    def compact(self) -> None:
+        for key, heap in self.heaps.items():
+            kept = [entry for entry in heap if entry[2].active]
+            heapq.heapify(kept)
+            self.heaps[key] = kept
+        self.stale = 0
+
+
+class OrderBook:
+    """Resting limit, stop and stop-limit orders per symbol, matched against bars.
+
+    Adding an order is O(log n); cancelling is O(1) (entries are dropped lazily
+    when they reach the top of their heap or on compaction); matching a bar
+    costs O(log n) per triggered order and O(1) when nothing triggers.
+
+    On a bar, stops are checked before limits, so a stop-limit can trigger and
+    fill on the same bar. Orders sharing an ``oco_group`` are one-cancels-other:
+    the first to fill cancels the rest, even later in the same bar. Fills
+    honour gaps: a stop that the open jumps through fills at the open, and a
+    limit the open is already through fills at the open (price improvement);
+    otherwise orders fill at their stop/limit price.
+    """
+
+    def __init__(self) -> None:
+        self._books: dict[str, _SymbolBook] = {}
+        self._orders: dict[str, RestingOrder] = {}
+        self._groups: dict[str, set[str]] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._orders
+
+    def add(self, order: OrderRequest, oco_group: str | None = None) -> str:
+        _validate(order)
+        order_id = order.client_order_id or str(uuid.uuid4())
+        if order_id in self._orders:
+            raise ValueError(f"duplicate_order_id:{order_id}")
+        resting = RestingOrder(order_id=order_id, order=order, seq=next(self._seq), group=oco_group)
+        self._orders[order_id] = resting
+        if oco_group is not None:
+            self._groups.setdefault(oco_group, set()).add(order_id)
+        book = self._books.setdefault(order.symbol, _SymbolBook())
+        book.push(resting)
+        book.live += 1
+        return order_id
+
+    def get(self, order_id: str) -> RestingOrder | None:
+        return self._orders.get(order_id)
+
+    def cancel(self, order_id: str) -> RestingOrder | None:
+        resting = self._orders.pop(order_id, None)
+        if resting is None:
+            return None
+        self._leave_group(resting)
+        resting.active = False
+        book = self._books[resting.order.symbol]
+        book.live -= 1
+        if not resting.queued:
+            return resting
+        book.stale += 1
+        if book.stale > _COMPACT_MIN_STALE and book.stale > book.live:
+            book.compact()
+        return resting
+
+    def replace(
+        self,
+        order_id: str,
+        quantity: float | None = None,
+        limit_price: float | None = None,
+        stop_price: float | None = None,
+    ) -> str:
+        """Cancel/replace keeping the order id; the replacement loses time priority."""
+        resting = self._orders.get(order_id)
+        if resting is None:
+            raise KeyError(f"order_not_found:{order_id}")
+        changes: dict[str, Any] = {"client_order_id": order_id}
+        if quantity is not None:
+            changes["quantity"] = quantity
+        if limit_price is not None:
+            changes["limit_price"] = limit_price
+        if stop_price is not None:
+            changes["stop_price"] = stop_price
+        updated = replace(resting.order, **changes)
+        _validate(updated)
+        self.cancel(order_id)
+        return self.add(updated, oco_group=resting.group)
+
+    def match(self, bar: Bar) -> list[BookMatch]:
+        """Remove and return the orders ``bar`` fills, with their fill prices."""
+        book = self._books.get(bar.symbol)
+        if book is None or not book.live:
+            return []
+        matches: list[BookMatch] = []
+        # Stop-limits triggered on this bar can only fill from their trigger price on.
+        trigger_prices: dict[str, float] = {}
+        for side in ("buy", "sell"):
+            for resting in book.pop_triggered("stop", side, bar):
+                if not resting.active:
+                    continue
+                stop = float(resting.order.stop_price)
+                price = max(stop, bar.open) if side == "buy" else min(stop, bar.open)
+                if resting.order.order_type == "stop_limit":
+                    resting.triggered = True
+                    trigger_prices[resting.order_id] = price
+                    book.push(resting)
+                    continue
+                matches.append(self._filled(book, resting, price, maker=False))
+        for side in ("buy", "sell"):
+            for resting in book.pop_triggered("limit", side, bar):
+                if not resting.active:
+                    continue
+                limit = float(resting.order.limit_price)
+                reference = trigger_prices.get(resting.order_id, bar.open)
+                price = min(limit, reference) if side == "buy" else max(limit, reference)
+                matches.append(self._filled(book, resting, price, maker=True))
+        return matches
+
+    def _filled(self, book: _SymbolBook, resting: RestingOrder, price: float, maker: bool) -> BookMatch:
+        resting.active = False
+        self._orders.pop(resting.order_id, None)
+        book.live -= 1
+        for sibling in self._leave_group(resting):
+            self.cancel(sibling)
+        return BookMatch(resting=resting, price=price, maker=maker)
+
+    def _leave_group(self, resting: RestingOrder) -> list[str]:
+        """Drop ``resting`` from its OCO group and return the remaining members."""
+        if resting.group is None:
+            return []
+        members = self._groups.get(resting.group, set())
+        members.discard(resting.order_id)
+        if not members:
+            self._groups.pop(resting.group, None)
+        return sorted(members)
+
+    def open_orders(self, symbol: str | None = None) -> list[dict[str, Any]]:
+        return [
+            resting.to_dict()
+            for resting in self._orders.values()
+            if symbol is None or resting.order.symbol == symbol
+        ]
+
+
+def _validate(order: OrderRequest) -> None:
+    if order.order_type not in RESTING_ORDER_TYPES:
+        raise ValueError(f"unsupported_order_type:{order.order_type}")
+    if order.side not in ("buy", "sell"):
+        raise ValueError(f"unsupported_side:{order.side}")
+    if order.order_type in ("limit", "stop_limit") and order.limit_price is None:
+        raise ValueError("limit_price_required")
+    if order.order_type in ("stop", "stop_limit") and order.stop_price is None:
+        raise ValueError("stop_price_required")
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, Mapping
+import heapq
+
+import numpy as np
+
+from .backtest import _PERIODS_PER_YEAR, _ProtectiveOrders, _execute_signal, _metrics_from_array
+from .config import ExecutionConfig, RiskConfig
+from .execution import ExecutionSimulator
+from .models import Bar
+from .risk import RiskEngine
+from .strategy.base import Strategy
+from .brokers.paper import PaperBroker
+
+
+@dataclass
+class PortfolioBacktestResult:
+    metrics: dict[str, Any]
+    equity_curve: list[float]
+    trades: list[dict[str, Any]]
+    symbols: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+def _checked_stream(bars: Iterable[Bar]) -> Iterator[Bar]:
+    last_ts: datetime | None = None
+    for bar in bars:
+        if last_ts is not None:
+            if bar.ts.tzinfo != last_ts.tzinfo:
+                raise ValueError("timezone_inconsistent")
+            if bar.ts < last_ts:
+                raise ValueError("bars_not_time_ordered")
+        last_ts = bar.ts
+        yield bar
+
+
+def merge_bar_streams(streams: Mapping[str, Iterable[Bar]]) -> Iterator[Bar]:
+    """Lazily merge per-symbol bar streams into one time-ordered stream.
+
+    Each stream is consumed one bar at a time through a heap, so memory stays
+    at one pending bar per symbol. Ties on ``ts`` are broken by symbol.
+    """
+    iterators = [_checked_stream(streams[symbol]) for symbol in sorted(streams)]
+    return heapq.merge(*iterators, key=lambda bar: (bar.ts, bar.symbol))
+
+
+@dataclass
+class _SymbolBook:
+    strategy: Strategy
+    history: deque[Bar] | None
+    seen: int = 0
+    trades: int = 0
+    last_close: float | None = None
+
+
+def run_portfolio_backtest(
+    strategy_factory: Callable[[], Strategy],
+    streams: Mapping[str, Iterable[Bar]],
+    initial_cash: float = 100_000.0,
+    execution: ExecutionConfig | None = None,
+    risk: RiskConfig | None = None,
+    history_limit: int = 512,
+) -> PortfolioBacktestResult:
+    """Event-driven backtest of one strategy across many symbols sharing a book.
+
+    ``streams`` maps symbol to a time-ordered iterable of bars (lists, a
+    ``BarSeries`` or lazy generators). Bars are merged by timestamp and every
+    signal goes through a single ``PaperBroker``/``RiskEngine``, so exposure
+    and leverage limits apply across the whole book. Each symbol gets its own
+    strategy instance; strategies without ``on_bar`` see a rolling history of
+    at most ``history_limit`` bars. Every bar marks its symbol's position to
+    the close before protective orders and signals run, so equity and the
+    drawdown guard follow current prices; equity is recorded once per timestamp.
+    Stops and targets in signal meta are enforced intrabar, as in run_backtest.
+    With VaR/CVaR limits on, the risk engine sees one row of cross-symbol
+    returns per completed timestamp.
+    """
+    execution = execution or ExecutionConfig()
+    risk = risk or RiskConfig()
+    broker = PaperBroker(ExecutionSimulator(execution), initial_cash=initial_cash)
+    risk_engine = RiskEngine(risk)
+    protection = _ProtectiveOrders(broker)
+
+    books: dict[str, _SymbolBook] = {}
+    equity_curve: list[float] = []
+    trades: list[dict[str, Any]] = []
+    timeframe: str | None = None
+    current_ts: datetime | None = None
+
+    pending_returns: dict[str, float] = {}
+
+    for bar in merge_bar_streams(streams):
+        if current_ts is not None and bar.ts != current_ts:
+            equity_curve.append(float(broker.get_account().get("equity", 0.0)))
+            if pending_returns:
+                risk_engine.observe_returns(pending_returns)
+                pending_returns = {}
+        current_ts = bar.ts
+        timeframe = timeframe or bar.timeframe
+
+        book = books.get(bar.symbol)
+        if book is None:
+            strategy = strategy_factory()
+            strategy.reset()
+            history = None if strategy.supports_incremental else deque(maxlen=max(history_limit, 2))
+            book = books[bar.symbol] = _SymbolBook(strategy=strategy, history=history)
+        strategy = book.strategy
+        book.seen += 1
+        if risk_engine.returns is not None and book.last_close:
+            pending_returns[bar.symbol] = bar.close / book.last_close - 1.0
+        book.last_close = bar.close
+        broker.mark_price(bar.symbol, bar.close)
+        for fill in protection.on_bar(bar):
+            trades.append(fill.to_dict())
+            book.trades += 1
+        if book.history is None:
+            signals = strategy.on_bar(bar)
+        else:
+            book.history.append(bar)
+            signals = []
+        if book.seen <= max(strategy.min_history, 2):
+            continue
+        if book.history is not None:
+            signals = strategy.generate_signals(list(book.history))
+        for signal in signals:
+            if signal.side == "flat":
+                continue
+            fill, _decision = _execute_signal(strategy, signal, bar.close, broker, risk_engine)
+            if fill is not None:
+                trades.append(fill.to_dict())
+                book.trades += 1
+                protection.on_fill(signal)
+
+    if current_ts is None:
+        return PortfolioBacktestResult(metrics={}, equity_curve=[], trades=[])
+    equity_curve.append(float(broker.get_account().get("equity", 0.0)))
+    periods = _PERIODS_PER_YEAR.get(timeframe or "", 252)
+    positions = {pos["symbol"]: pos for pos in broker.get_positions()}
+    symbols = {
+        symbol: {
+            "bars": book.seen,
+            "trades": book.trades,
+            "position": positions.get(symbol, {}).get("quantity", 0.0),
+        }
+        for symbol, book in sorted(books.items())
+    }
+    return PortfolioBacktestResult(
+        metrics=_metrics_from_array(np.asarray(equity_curve, dtype=np.float64), periods),
+        equity_curve=equity_curve,
+        trades=trades,
+        symbols=symbols,
+    )
@@ -1,41 +1,126 @@
 from __future__ import annotations
 
-from statistics import pstdev, mean
+from collections import Counter, deque
+from statistics import pstdev
+from typing import Iterable, Sequence
 
+import numpy as np
+
+from .features import FeatureStore, feature_store
 from .models import Bar
+from .series import BarSeries, as_series
+from .strategy.rolling import RollingStats
+
+# Rolling sums and statistics.pstdev can differ in the last bits; vols this close to the
+# threshold are recomputed exactly so labels never flip against the reference definition.
+_VOL_TIE_TOLERANCE = 1e-9
+
+
+def _window_vol(closes: Sequence[float]) -> float:
+    returns = [closes[i] / closes[i - 1] - 1.0 for i in range(1, len(closes))]
+    return pstdev(returns) if len(returns) > 1 else 0.0
+
+
+def _tie_band(vol_threshold: float) -> float:
+    return _VOL_TIE_TOLERANCE * max(abs(vol_threshold), 1e-12)
+
+
+def _classify(trend: float, vol: float, trend_threshold: float, vol_threshold: float) -> str:
+    if abs(trend) < trend_threshold:
+        return "sideways"
+    if trend >= 0:
+        return "bull_high_vol" if vol > vol_threshold else "bull_low_vol"
+    return "bear_high_vol" if vol > vol_threshold else "bear_low_vol"
 
 
 def compute_regime_labels(
-    bars: list[Bar],
+    bars: list[Bar] | BarSeries,
     lookback: int = 50,
     trend_threshold: float = 0.02,
     vol_threshold: float = 0.02,
+    store: FeatureStore | None = None,
 ) -> list[str]:
-    labels: list[str] = []
-    closes = [bar.close for bar in bars]
-    for idx in range(len(bars)):
-        if idx < lookback:
-            labels.append("unknown")
-            continue
-        window = closes[idx - lookback : idx]
-        if len(window) < 2:
-            labels.append("unknown")
-            continue
-        trend = window[-1] / window[0] - 1.0
-        returns = [window[i] / window[i - 1] - 1.0 for i in range(1, len(window))]
-        vol = pstdev(returns) if len(returns) > 1 else 0.0
-        if abs(trend) < trend_threshold:
-            labels.append("sideways")
-        elif trend >= 0:
-            labels.append("bull_high_vol" if vol > vol_threshold else "bull_low_vol")
-        else:
-            labels.append("bear_high_vol" if vol > vol_threshold else "bear_low_vol")
-    return labels
-
-
-def regime_summary(labels: list[str]) -> dict[str, float]:
-    if not labels:
+    """Label bar ``idx`` from the ``lookback`` closes before it (the bar itself is excluded).
+
+    Trend and return volatility come from the shared feature store, shifted by
+    one bar so each label only sees the preceding window.
+    """
+    count = len(bars)
+    if count == 0:
+        return []
+    labels = np.full(count, "unknown", dtype=object)
+    if lookback < 2 or count <= lookback:
+        return labels.tolist()
+    store = store or feature_store
+    series = as_series(bars)
+    # Window closes[idx - lookback : idx] ends at idx - 1 and spans lookback - 1 returns.
+    trend = np.asarray(store.get(series, "momentum", lookback - 1))[lookback - 1 : count - 1]
+    vol = np.nan_to_num(np.asarray(store.get(series, "return_std", lookback - 1))[lookback - 1 : count - 1])
+    ties = np.flatnonzero(np.abs(vol - vol_threshold) <= _tie_band(vol_threshold))
+    if ties.size:
+        vol = vol.copy()
+        closes = series.close
+        for pos in ties.tolist():
+            vol[pos] = _window_vol(closes[pos : pos + lookback].tolist())
+    high_vol = vol > vol_threshold
+    labels[lookback:] = np.where(
+        np.abs(trend) < trend_threshold,
+        "sideways",
+        np.where(
+            trend >= 0,
+            np.where(high_vol, "bull_high_vol", "bull_low_vol"),
+            np.where(high_vol, "bear_high_vol", "bear_low_vol"),
+        ),
+    )
+    return labels.tolist()
+
+
+class RegimeTracker:
+    """Incremental compute_regime_labels for live bars: ``update`` is O(1) per bar.
+
+    Keeps the last ``lookback`` closes and running sums of their returns, and
+    labels each new bar from the window before it, exactly like the batch
+    version.
+    """
+
+    def __init__(self, lookback: int = 50, trend_threshold: float = 0.02, vol_threshold: float = 0.02) -> None:
+        self.lookback = lookback
+        self.trend_threshold = trend_threshold
+        self.vol_threshold = vol_threshold
+        self._closes: deque[float] = deque(maxlen=max(lookback, 1))
+        self._returns = RollingStats(lookback - 1)
+        self._counts: Counter[str] = Counter()
+        self.label = "unknown"
+
+    def update(self, bar: Bar) -> str:
+        self.label = self._current_label()
+        self._counts[self.label] += 1
+        closes = self._closes
+        if closes:
+            self._returns.push(bar.close / closes[-1] - 1.0)
+        closes.append(bar.close)
+        return self.label
+
+    def _current_label(self) -> str:
+        if self.lookback < 2 or len(self._closes) < self.lookback:
+            return "unknown"
+        closes = self._closes
+        trend = closes[-1] / closes[0] - 1.0
+        vol = self._returns.pstdev()
+        if abs(vol - self.vol_threshold) <= _tie_band(self.vol_threshold):
+            vol = _window_vol(list(closes))
+        return _classify(trend, vol, self.trend_threshold, self.vol_threshold)
+
+    def summary(self) -> dict[str, float]:
+        return _shares(self._counts, sum(self._counts.values()))
+
+
+def _shares(counts: Counter[str], total: int) -> dict[str, float]:
+    if not total:
         return {}
-    unique = {label: labels.count(label) for label in set(labels)}
-    total = len(labels)
-    return {label: count / total for label, count in unique.items()}
+    return {label: count / total for label, count in counts.items()}
+
+
+def regime_summary(labels: Iterable[str]) -> dict[str, float]:
+    counts = Counter(labels)
+    return _shares(counts, sum(counts.values()))
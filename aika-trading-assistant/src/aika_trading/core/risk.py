@@ -1,14 +1,70 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
 
 from .config import RiskConfig
 from .models import OrderRequest, PortfolioState, RiskDecision
+from .var import RollingCovariance, VaRResult, portfolio_var
 
 
 @dataclass
 class RiskEngine:
+    """Pre-trade checks against ``limits``.
+
+    The engine keeps a ``RollingCovariance`` of per-bar returns (fed through
+    ``observe_returns``) while the correlation cap or a VaR/CVaR limit is on.
+    Orders are denied when they would add exposure too correlated with what
+    is already held (unless the caller passes ``correlation`` in the order
+    meta) or leave the book past the VaR/CVaR limit with more risk than it
+    carries now, so an over-limit book can still be reduced in steps.
+    """
+
     limits: RiskConfig
+    returns: RollingCovariance | None = None
+
+    def __post_init__(self) -> None:
+        if self.returns is None and (self.var_enabled or self.limits.correlation_cap < 1.0):
+            self.returns = RollingCovariance(self.limits.var_window)
+
+    @property
+    def var_enabled(self) -> bool:
+        return self.limits.max_var_pct > 0 or self.limits.max_cvar_pct > 0
+
+    def observe_returns(self, returns: Mapping[str, float]) -> None:
+        """Record one bar of returns per symbol.
+
+        Active whenever the correlation cap is below 1 (the default) or a
+        VaR/CVaR limit is set; a no-op only when both are off.
+        """
+        if self.returns is not None:
+            self.returns.update(returns)
+
+    def book_correlation(self, portfolio: PortfolioState, symbol: str, side: str) -> float | None:
+        """Highest correlation of a ``side`` trade in ``symbol`` with the other held positions.
+
+        Correlations are signed by position direction, so buying something that
+        moves with a short (a hedge) counts as negative. None until warmed up.
+        """
+        if self.returns is None or self.returns.count < self.limits.var_min_periods:
+            return None
+        held = [pos for pos in portfolio.positions.values() if pos.symbol != symbol and pos.quantity]
+        if not held:
+            return None
+        correlations = self.returns.correlations_with(symbol, [pos.symbol for pos in held])
+        direction = 1.0 if side == "buy" else -1.0
+        signs = np.array([direction if pos.quantity > 0 else -direction for pos in held])
+        return float((correlations * signs).max())
+
+    def post_trade_var(self, portfolio: PortfolioState, symbol: str, signed_notional: float) -> VaRResult | None:
+        """VaR/CVaR of the book after adding ``signed_notional`` of ``symbol``; None until warmed up."""
+        if self.returns is None or self.returns.count < self.limits.var_min_periods:
+            return None
+        exposures = {pos.symbol: pos.market_value() for pos in portfolio.positions.values()}
+        exposures[symbol] = exposures.get(symbol, 0.0) + signed_notional
+        return portfolio_var(self.returns, exposures, self.limits.var_confidence, self.limits.var_method)
 
     def evaluate_order(self, order: OrderRequest, portfolio: PortfolioState, market_price: float) -> RiskDecision:
         risk_flags: list[str] = []
@@ -23,6 +79,8 @@ class RiskEngine:
             risk_flags.append("position_value_capped")
 
         corr = order.meta.get("correlation") if hasattr(order, "meta") else None
+        if corr is None:
+            corr = self.book_correlation(portfolio, order.symbol, order.side)
         if corr is not None and corr > self.limits.correlation_cap:
             return RiskDecision("deny", "correlation_cap", None, risk_flags + ["correlation_cap"])
 
@@ -44,6 +102,19 @@ class RiskEngine:
             allowed = (self.limits.max_leverage * portfolio.equity) - portfolio.gross_exposure
             adjusted_qty = max(0.0, allowed / max(market_price, 1e-6))
 
+        signed_notional = market_price * adjusted_qty * (1.0 if order.side == "buy" else -1.0)
+        var = self.post_trade_var(portfolio, order.symbol, signed_notional) if self.var_enabled else None
+        if var is not None:
+            # An over-limit book may still scale out: only trades that leave the
+            # figure over the limit *and* higher than it is now are refused.
+            current = self.post_trade_var(portfolio, order.symbol, 0.0)
+            var_cap = self.limits.max_var_pct * portfolio.equity
+            if self.limits.max_var_pct > 0 and var.var > var_cap and var.var > current.var:
+                return RiskDecision("deny", "var_limit", None, risk_flags + ["var_limit"])
+            cvar_cap = self.limits.max_cvar_pct * portfolio.equity
+            if self.limits.max_cvar_pct > 0 and var.cvar > cvar_cap and var.cvar > current.cvar:
+                return RiskDecision("deny", "cvar_limit", None, risk_flags + ["cvar_limit"])
+
         if portfolio.drawdown >= self.limits.max_drawdown:
             return RiskDecision("deny", "max_drawdown", None, risk_flags + ["drawdown_guard"])
 
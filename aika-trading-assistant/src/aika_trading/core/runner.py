@@ -5,18 +5,22 @@ import random
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+import numpy as np
 
 from .config import CoreSettings, ensure_dirs
 from .data import load_bars
 from .execution import ExecutionSimulator
-from .models import OrderRequest, RunSummary, utc_now
-from .backtest import run_backtest as core_run_backtest
+from .models import Bar, OrderRequest, RunSummary, Signal, utc_now
+from .portfolio import run_portfolio_backtest
 from .regime import compute_regime_labels
-from .ensemble import EnsembleEngine
+from .ensemble import EnsembleEngine, OnlineWeights
 from .risk import RiskEngine
-from .storage import RunStore
-from .strategy import registry
+from .series import as_series
+from .sql_storage import SqlRunStore
+from .storage import RunStore, open_run_store
+from .strategy import Strategy, registry
 from .validation import ensure_time_ordered
 from .brokers.paper import PaperBroker
 
@@ -29,6 +33,158 @@ def _save_artifact(base_dir: str, run_id: str, name: str, payload: Any) -> None:
         json.dump(payload, handle, indent=2)
 
 
+def _submit_signal(
+    run_id: str,
+    signal: Signal,
+    latest: Bar,
+    sizing: Callable[[Signal, float], float],
+    broker: PaperBroker,
+    risk_engine: RiskEngine,
+    store: RunStore | SqlRunStore,
+    risk_flags: list[str],
+    fills: list[dict[str, Any]],
+    strategy_name: str,
+) -> None:
+    portfolio = broker.snapshot()
+    notional = sizing(signal, portfolio.equity)
+    qty = notional / max(latest.close, 1e-6)
+    order = OrderRequest(
+        symbol=signal.symbol,
+        side="buy" if signal.side == "long" else "sell",
+        quantity=qty,
+        order_type="market",
+        market_price=latest.close,
+        strategy_name=strategy_name,
+        client_order_id=str(uuid.uuid4()),
+        meta=signal.meta,
+    )
+    decision = risk_engine.evaluate_order(order, portfolio, latest.close)
+    if decision.risk_flags:
+        risk_flags.extend(decision.risk_flags)
+    if decision.decision == "deny":
+        return
+    if decision.decision == "reduce" and decision.adjusted_quantity is not None:
+        order = OrderRequest(
+            symbol=order.symbol,
+            side=order.side,
+            quantity=decision.adjusted_quantity,
+            order_type=order.order_type,
+            market_price=order.market_price,
+            strategy_name=order.strategy_name,
+            client_order_id=order.client_order_id,
+        )
+    store.record_order(run_id, order)
+    fill = broker.place_order(order)
+    store.record_fill(run_id, fill)
+    fills.append(fill.to_dict())
+
+
+def _last_directions(strategy: Strategy, bars: list[Bar]) -> tuple[int, int]:
+    """Signal direction (-1/0/1) on the previous and the latest bar."""
+    if strategy.supports_vectorized:
+        side = strategy.signal_arrays(as_series(bars)).side
+        return int(side[-2]) if len(side) > 1 else 0, int(side[-1])
+    directions = []
+    for history in (bars[:-1], bars):
+        signals = strategy.generate_signals(history)
+        side = signals[-1].side if signals else "flat"
+        directions.append(1 if side == "long" else -1 if side == "short" else 0)
+    return directions[0], directions[1]
+
+
+def _run_single(
+    settings: CoreSettings,
+    run_id: str,
+    loaded: dict[str, list[Bar]],
+    broker: PaperBroker,
+    risk_engine: RiskEngine,
+    store: RunStore | SqlRunStore,
+    risk_flags: list[str],
+    fills: list[dict[str, Any]],
+) -> dict[str, float]:
+    """Trade the latest signal of ``settings.run.strategy`` on every loaded symbol."""
+    weights: dict[str, float] = {}
+    for bars in loaded.values():
+        strategy = registry.create(settings.run.strategy, lookback=settings.run.lookback)
+        signals = strategy.generate_signals(bars)
+        if not signals:
+            continue
+        signal = signals[-1]
+        store.record_signal(run_id, signal)
+        if not weights:
+            weights = EnsembleEngine().weight_by_performance({strategy.name: signal.strength})
+        if signal.side == "flat":
+            continue
+        _submit_signal(
+            run_id, signal, bars[-1], strategy.position_sizing, broker, risk_engine, store, risk_flags, fills, strategy.name
+        )
+    return weights
+
+
+def _run_ensemble(
+    settings: CoreSettings,
+    run_id: str,
+    loaded: dict[str, list[Bar]],
+    broker: PaperBroker,
+    risk_engine: RiskEngine,
+    store: RunStore | SqlRunStore,
+    risk_flags: list[str],
+    fills: list[dict[str, Any]],
+) -> dict[str, float]:
+    """Trade the weighted vote of ``settings.run.ensemble`` across every loaded symbol.
+
+    Each strategy is rewarded with the mean return its previous-bar calls earned
+    on the last bar; weights are updated from that and persisted under the
+    artifacts dir so they carry over to the next session. The reward is keyed by
+    the latest bar's timestamp, so a session over the same bars does not apply
+    it again. Orders are sized at ``settings.run.ensemble_risk_pct`` of equity.
+    """
+    names = list(settings.run.ensemble)
+    strategies = [registry.create(name, lookback=settings.run.lookback) for name in names]
+    symbols = list(loaded)
+    previous = np.zeros((len(names), len(symbols)))
+    directions = np.zeros((len(names), len(symbols)))
+    for col, symbol in enumerate(symbols):
+        for row, strategy in enumerate(strategies):
+            previous[row, col], directions[row, col] = _last_directions(strategy, loaded[symbol])
+    last_returns = np.array(
+        [bars[-1].close / bars[-2].close - 1.0 if len(bars) > 1 and bars[-2].close else 0.0 for bars in loaded.values()]
+    )
+
+    weights_path = str(Path(settings.run.artifacts_dir) / "ensemble_weights.json")
+    weights = OnlineWeights.load(weights_path, names, method=settings.run.ensemble_method)
+    stamp = max(bars[-1].ts for bars in loaded.values()).isoformat()
+    if stamp != weights.last_stamp:
+        weights.update(previous @ last_returns / len(symbols), stamp=stamp)
+        weights.save(weights_path)
+
+    risk_pct = settings.run.ensemble_risk_pct
+
+    def sizing(_signal: Signal, equity: float) -> float:
+        return max(0.0, equity * risk_pct)
+
+    combined = EnsembleEngine().combine_matrix(directions, weights.weights, symbols)
+    for idx in np.flatnonzero(combined.side).tolist():
+        signal = combined.signal_for(idx)
+        store.record_signal(run_id, signal)
+        bars = loaded[signal.symbol]
+        _submit_signal(run_id, signal, bars[-1], sizing, broker, risk_engine, store, risk_flags, fills, "ensemble")
+    return weights.as_dict()
+
+
+def _observe_history(risk_engine: RiskEngine, loaded: dict[str, list[Bar]]) -> None:
+    """Replay the loaded bars' close-to-close returns into the risk engine, one row per timestamp."""
+    if risk_engine.returns is None:
+        return
+    rows: dict[datetime, dict[str, float]] = {}
+    for symbol, bars in loaded.items():
+        for prev, bar in zip(bars, bars[1:]):
+            if prev.close:
+                rows.setdefault(bar.ts, {})[symbol] = bar.close / prev.close - 1.0
+    for ts in sorted(rows)[-risk_engine.returns.window :]:
+        risk_engine.observe_returns(rows[ts])
+
+
 def run_paper_session(settings: CoreSettings, symbols: list[str] | None = None) -> dict[str, Any]:
     ensure_dirs(settings)
     settings.ensure_live_confirmed()
@@ -42,114 +198,100 @@ def run_paper_session(settings: CoreSettings, symbols: list[str] | None = None)
     simulator = ExecutionSimulator(settings.execution)
     broker = PaperBroker(simulator, initial_cash=settings.broker.paper_initial_cash)
     risk_engine = RiskEngine(settings.risk)
-    store = RunStore(str(Path(settings.run.artifacts_dir) / "runs.sqlite"))
-
-    started_at = utc_now()
-    risk_flags: list[str] = []
-    fills: list[dict[str, Any]] = []
-    errors: list[str] = []
-    equity_curve: list[float] = []
-    drawdown_curve: list[float] = []
-    regime_labels: list[str] = []
-    ensemble_weights: dict[str, float] = {}
-    backtest_metrics: dict[str, Any] = {}
-
-    for symbol in symbols:
-        bars: list[Any] = []
-        try:
-            bars = load_bars(
-                settings,
-                symbol,
-                settings.data.timeframe,
-                limit=max(120, settings.run.lookback + 5),
-            )
-        except Exception as exc:
-            errors.append(f"{symbol}: {exc}")
-            continue
-        if not bars:
-            continue
-        ensure_time_ordered(bars)
-        strategy = registry.create(settings.run.strategy, lookback=settings.run.lookback)
-        if not equity_curve:
+    # Closing the store flushes the write-behind queue, even when the session raises.
+    with open_run_store(settings, write_behind=True) as store:
+        started_at = utc_now()
+        risk_flags: list[str] = []
+        fills: list[dict[str, Any]] = []
+        errors: list[str] = []
+        equity_curve: list[float] = []
+        drawdown_curve: list[float] = []
+        regime_labels: list[str] = []
+        ensemble_weights: dict[str, float] = {}
+        backtest_metrics: dict[str, Any] = {}
+        loaded: dict[str, list[Any]] = {}
+        ensemble_names = settings.run.ensemble
+
+        for symbol in symbols:
+            bars: list[Any] = []
             try:
-                backtest = core_run_backtest(strategy, bars, initial_cash=settings.broker.paper_initial_cash)
+                bars = load_bars(
+                    settings,
+                    symbol,
+                    settings.data.timeframe,
+                    limit=max(120, settings.run.lookback + 5),
+                )
+            except Exception as exc:
+                errors.append(f"{symbol}: {exc}")
+                continue
+            if not bars:
+                continue
+            ensure_time_ordered(bars)
+            loaded[symbol] = bars
+            if not regime_labels:
+                try:
+                    regime_labels = compute_regime_labels(bars)
+                except Exception as exc:
+                    errors.append(f"{symbol}: regime_failed:{exc}")
+
+        # Feed the loaded history first so correlation/VaR checks see every symbol of the session.
+        _observe_history(risk_engine, loaded)
+        if not ensemble_names:
+            ensemble_weights = _run_single(settings, run_id, loaded, broker, risk_engine, store, risk_flags, fills)
+        elif loaded:
+            try:
+                ensemble_weights = _run_ensemble(
+                    settings, run_id, loaded, broker, risk_engine, store, risk_flags, fills
+                )
+            except Exception as exc:
+                errors.append(f"ensemble: ensemble_failed:{exc}")
+
+        if loaded:
+            try:
+                backtest = run_portfolio_backtest(
+                    lambda: registry.create(settings.run.strategy, lookback=settings.run.lookback),
+                    loaded,
+                    initial_cash=settings.broker.paper_initial_cash,
+                    execution=settings.execution,
+                    risk=settings.risk,
+                )
                 equity_curve = backtest.equity_curve
-                backtest_metrics = backtest.metrics
+                backtest_metrics = {**backtest.metrics, "symbols": backtest.symbols}
                 peak = 0.0
                 for value in equity_curve:
                     peak = max(peak, value)
                     drawdown_curve.append((peak - value) / peak if peak else 0.0)
             except Exception as exc:
-                errors.append(f"{symbol}: backtest_failed:{exc}")
-        if not regime_labels:
-            try:
-                regime_labels = compute_regime_labels(bars)
-            except Exception as exc:
-                errors.append(f"{symbol}: regime_failed:{exc}")
-        signals = strategy.generate_signals(bars)
-        if not signals:
-            continue
-        signal = signals[-1]
-        store.record_signal(run_id, signal)
-        if not ensemble_weights:
-            ensemble_weights = EnsembleEngine().weight_by_performance({strategy.name: signal.strength})
-        if signal.side == "flat":
-            continue
-        latest = bars[-1]
-        portfolio = broker.snapshot()
-        notional = strategy.position_sizing(signal, portfolio.equity)
-        qty = notional / max(latest.close, 1e-6)
-        order = OrderRequest(
-            symbol=symbol,
-            side="buy" if signal.side == "long" else "sell",
-            quantity=qty,
-            order_type="market",
-            market_price=latest.close,
-            strategy_name=strategy.name,
-            client_order_id=str(uuid.uuid4()),
-            meta=signal.meta,
+                errors.append(f"portfolio: backtest_failed:{exc}")
+
+        correlations: dict[str, Any] = {}
+        if risk_engine.returns is not None and risk_engine.returns.count:
+            held = risk_engine.returns.symbols
+            correlations = {"symbols": held, "matrix": risk_engine.returns.correlation_matrix(held).tolist()}
+
+        account = broker.get_account()
+        summary = RunSummary(
+            run_id=run_id,
+            mode=settings.mode,
+            status="completed",
+            started_at=started_at,
+            completed_at=utc_now(),
+            strategy=settings.run.strategy,
+            symbols=symbols,
+            equity=float(account.get("equity", 0.0)),
+            cash=float(account.get("cash", 0.0)),
+            exposure=float(account.get("equity", 0.0)) - float(account.get("cash", 0.0)),
+            risk_flags=sorted(set(risk_flags)),
+            metrics={"backtest": backtest_metrics, "errors": errors, "correlations": correlations}
+            if errors or backtest_metrics
+            else {},
+            equity_curve=equity_curve,
+            drawdown_curve=drawdown_curve,
+            regime_labels=regime_labels,
+            ensemble_weights=ensemble_weights or {settings.run.strategy: 1.0},
         )
-        decision = risk_engine.evaluate_order(order, portfolio, latest.close)
-        if decision.risk_flags:
-            risk_flags.extend(decision.risk_flags)
-        if decision.decision == "deny":
-            continue
-        if decision.decision == "reduce" and decision.adjusted_quantity is not None:
-            order = OrderRequest(
-                symbol=order.symbol,
-                side=order.side,
-                quantity=decision.adjusted_quantity,
-                order_type=order.order_type,
-                market_price=order.market_price,
-                strategy_name=order.strategy_name,
-                client_order_id=order.client_order_id,
-            )
-        store.record_order(run_id, order)
-        fill = broker.place_order(order)
-        store.record_fill(run_id, fill)
-        fills.append(fill.to_dict())
-
-    account = broker.get_account()
-    summary = RunSummary(
-        run_id=run_id,
-        mode=settings.mode,
-        status="completed",
-        started_at=started_at,
-        completed_at=utc_now(),
-        strategy=settings.run.strategy,
-        symbols=symbols,
-        equity=float(account.get("equity", 0.0)),
-        cash=float(account.get("cash", 0.0)),
-        exposure=float(account.get("equity", 0.0)) - float(account.get("cash", 0.0)),
-        risk_flags=sorted(set(risk_flags)),
-        metrics={"backtest": backtest_metrics, "errors": errors} if errors or backtest_metrics else {},
-        equity_curve=equity_curve,
-        drawdown_curve=drawdown_curve,
-        regime_labels=regime_labels,
-        ensemble_weights=ensemble_weights or {settings.run.strategy: 1.0},
-    )
 
-    store.record_run(summary, settings.model_dump())
+        store.record_run(summary, settings.model_dump())
 
     _save_artifact(settings.run.artifacts_dir, run_id, "config.json", settings.model_dump())
     _save_artifact(settings.run.artifacts_dir, run_id, "summary.json", summary.to_dict())
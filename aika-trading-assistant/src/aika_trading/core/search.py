@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import math
+import random
+from typing import Any, Iterable
+
+
+def _axes(param_grid: dict[str, Iterable[Any]]) -> tuple[list[str], list[list[Any]]]:
+    keys = list(param_grid.keys())
+    return keys, [list(param_grid[k]) for k in keys]
+
+
+def grid_size(param_grid: dict[str, Iterable[Any]]) -> int:
+    _keys, values = _axes(param_grid)
+    return math.prod(len(v) for v in values)
+
+
+def _combo_at(keys: list[str], values: list[list[Any]], index: int) -> dict[str, Any]:
+    combo: dict[str, Any] = {}
+    for key, options in reversed(list(zip(keys, values))):
+        index, pos = divmod(index, len(options))
+        combo[key] = options[pos]
+    return {key: combo[key] for key in keys}
+
+
+def sample_random(param_grid: dict[str, Iterable[Any]], n_trials: int, seed: int | None = None) -> list[dict[str, Any]]:
+    """Draw up to ``n_trials`` distinct combinations without enumerating the full product."""
+    keys, values = _axes(param_grid)
+    total = grid_size(param_grid)
+    if not keys or total == 0:
+        return [{}]
+    rng = random.Random(seed)
+    picks = rng.sample(range(total), min(n_trials, total))
+    return [_combo_at(keys, values, idx) for idx in picks]
+
+
+def sample_latin_hypercube(
+    param_grid: dict[str, Iterable[Any]],
+    n_trials: int,
+    seed: int | None = None,
+) -> list[dict[str, Any]]:
+    """Latin-hypercube sample over the grid axes: each axis is split into ``n_trials`` strata
+    and every stratum is used exactly once. Duplicate combinations are dropped."""
+    keys, values = _axes(param_grid)
+    if not keys or grid_size(param_grid) == 0:
+        return [{}]
+    rng = random.Random(seed)
+    columns: list[list[Any]] = []
+    for options in values:
+        strata = [(slot + rng.random()) / n_trials for slot in range(n_trials)]
+        rng.shuffle(strata)
+        columns.append([options[min(int(u * len(options)), len(options) - 1)] for u in strata])
+    combos: list[dict[str, Any]] = []
+    seen: set[tuple[str, ...]] = set()
+    for row in zip(*columns):
+        marker = tuple(repr(v) for v in row)
+        if marker in seen:
+            continue
+        seen.add(marker)
+        combos.append(dict(zip(keys, row)))
+    return combos
+
+
+def halving_rungs(n_candidates: int, n_bars: int, eta: int = 3, min_bars: int = 100) -> list[int]:
+    """Bar-prefix length for each successive-halving rung, ending at the full series."""
+    eta = max(2, int(eta))
+    rungs = int(math.log(max(n_candidates, 1), eta) + 1e-9)
+    while rungs > 0 and n_bars / eta**rungs < min_bars:
+        rungs -= 1
+    return [max(1, int(round(n_bars / eta ** (rungs - k)))) for k in range(rungs + 1)]
+
+
+def hyperband_brackets(n_bars: int, eta: int = 3, min_bars: int = 100) -> list[tuple[int, list[int]]]:
+    """(configurations, rung prefix lengths) for each Hyperband bracket, most aggressive first."""
+    eta = max(2, int(eta))
+    s_max = int(math.log(max(n_bars / max(min_bars, 1), 1), eta) + 1e-9)
+    brackets: list[tuple[int, list[int]]] = []
+    for s in range(s_max, -1, -1):
+        n_configs = int(math.ceil((s_max + 1) / (s + 1) * eta**s))
+        sizes = [max(1, int(round(n_bars / eta ** (s - k)))) for k in range(s + 1)]
+        brackets.append((n_configs, sizes))
+    return brackets
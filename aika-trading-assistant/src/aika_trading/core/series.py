@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from multiprocessing import shared_memory
+from typing import Any, Iterator, Sequence
+
+import numpy as np
+
+from .models import Bar
+
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+
+def _to_ns(value: datetime) -> int:
+    epoch = _EPOCH_UTC if value.tzinfo is not None else _EPOCH_NAIVE
+    return ((value - epoch) // _ONE_US) * 1000
+
+
+def _from_ns(value: int, tz: tzinfo | None) -> datetime:
+    if tz is None:
+        return _EPOCH_NAIVE + timedelta(microseconds=value // 1000)
+    return (_EPOCH_UTC + timedelta(microseconds=value // 1000)).astimezone(tz)
+
+
+@dataclass(frozen=True, eq=False)
+class BarSeries:
+    """Columnar bars for a single symbol/timeframe.
+
+    OHLCV are contiguous float64 arrays and timestamps are int64 epoch-ns, so
+    slicing returns views instead of copies and closes/highs/lows can be used
+    directly in vectorized code.
+    """
+
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    fetched_at: np.ndarray
+    symbol: str
+    timeframe: str
+    source: str
+    tz: tzinfo | None = timezone.utc
+
+    @staticmethod
+    def from_bars(bars: Sequence[Bar]) -> "BarSeries":
+        if not bars:
+            return BarSeries.empty()
+        first = bars[0]
+        for bar in bars:
+            if bar.symbol != first.symbol or bar.timeframe != first.timeframe:
+                raise ValueError("bar_series_mixed_symbols")
+            if bar.ts.tzinfo != first.ts.tzinfo:
+                raise ValueError("timezone_inconsistent")
+        count = len(bars)
+        prices = np.fromiter(
+            (value for bar in bars for value in (bar.open, bar.high, bar.low, bar.close, bar.volume)),
+            dtype=np.float64,
+            count=count * 5,
+        ).reshape(count, 5)
+        return BarSeries(
+            ts=np.fromiter((_to_ns(bar.ts) for bar in bars), dtype=np.int64, count=count),
+            open=np.ascontiguousarray(prices[:, 0]),
+            high=np.ascontiguousarray(prices[:, 1]),
+            low=np.ascontiguousarray(prices[:, 2]),
+            close=np.ascontiguousarray(prices[:, 3]),
+            volume=np.ascontiguousarray(prices[:, 4]),
+            fetched_at=np.fromiter((_to_ns(bar.fetched_at) for bar in bars), dtype=np.int64, count=count),
+            symbol=first.symbol,
+            timeframe=first.timeframe,
+            source=first.source,
+            tz=first.ts.tzinfo,
+        )
+
+    @staticmethod
+    def from_arrays(
+        ts: Any,
+        open: Any,
+        high: Any,
+        low: Any,
+        close: Any,
+        volume: Any,
+        symbol: str,
+        timeframe: str,
+        source: str = "unknown",
+        fetched_at: Any = None,
+        tz: tzinfo | None = timezone.utc,
+    ) -> "BarSeries":
+        ts_arr = np.ascontiguousarray(ts, dtype=np.int64)
+        columns = [np.ascontiguousarray(col, dtype=np.float64) for col in (open, high, low, close, volume)]
+        if any(col.shape != ts_arr.shape for col in columns):
+            raise ValueError("bar_series_length_mismatch")
+        fetched = ts_arr if fetched_at is None else np.ascontiguousarray(fetched_at, dtype=np.int64)
+        return BarSeries(ts_arr, *columns, fetched, symbol=symbol, timeframe=timeframe, source=source, tz=tz)
+
+    @staticmethod
+    def empty(symbol: str = "", timeframe: str = "", source: str = "unknown") -> "BarSeries":
+        ints = np.empty(0, dtype=np.int64)
+        floats = np.empty(0, dtype=np.float64)
+        return BarSeries(ints, floats, floats, floats, floats, floats, ints, symbol, timeframe, source)
+
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+    def __getitem__(self, key: int | slice) -> Any:
+        if isinstance(key, slice):
+            return BarSeries(
+                self.ts[key],
+                self.open[key],
+                self.high[key],
+                self.low[key],
+                self.close[key],
+                self.volume[key],
+                self.fetched_at[key],
+                symbol=self.symbol,
+                timeframe=self.timeframe,
+                source=self.source,
+                tz=self.tz,
+            )
+        return self._bar(int(key))
+
+    def __iter__(self) -> Iterator[Bar]:
+        rows = zip(
+            self.ts.tolist(),
+            self.open.tolist(),
+            self.high.tolist(),
+            self.low.tolist(),
+            self.close.tolist(),
+            self.volume.tolist(),
+            self.fetched_at.tolist(),
+        )
+        for ts, open_, high, low, close, volume, fetched in rows:
+            yield Bar(
+                ts=_from_ns(ts, self.tz),
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                volume=volume,
+                symbol=self.symbol,
+                timeframe=self.timeframe,
+                source=self.source,
+                fetched_at=_from_ns(fetched, self.tz),
+            )
+
+    def _bar(self, idx: int) -> Bar:
+        return Bar(
+            ts=_from_ns(int(self.ts[idx]), self.tz),
+            open=float(self.open[idx]),
+            high=float(self.high[idx]),
+            low=float(self.low[idx]),
+            close=float(self.close[idx]),
+            volume=float(self.volume[idx]),
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+            source=self.source,
+            fetched_at=_from_ns(int(self.fetched_at[idx]), self.tz),
+        )
+
+    def to_bars(self) -> list[Bar]:
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            arr.nbytes
+            for arr in (self.ts, self.open, self.high, self.low, self.close, self.volume, self.fetched_at)
+        )
+
+
+def as_series(bars: Sequence[Bar] | BarSeries) -> BarSeries:
+    if isinstance(bars, BarSeries):
+        return bars
+    return BarSeries.from_bars(bars)
+
+
+def closes_of(bars: Sequence[Bar] | BarSeries) -> list[float]:
+    if isinstance(bars, BarSeries):
+        return bars.close.tolist()
+    return [bar.close for bar in bars]
+
+
+_SHARED_COLUMNS = ("ts", "open", "high", "low", "close", "volume", "fetched_at")
+
+
+class SharedBarSeries:
+    """Publishes a BarSeries into one shared-memory block for process-pool workers.
+
+    Workers map the block with ``attach_shared_series`` instead of receiving a
+    pickled copy per task. The owner must ``close()`` (or use it as a context
+    manager) to release the block.
+    """
+
+    def __init__(self, series: BarSeries) -> None:
+        length = len(series)
+        width = len(_SHARED_COLUMNS)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, length * width * 8))
+        grid = np.ndarray((width, length), dtype=np.float64, buffer=self._shm.buf)
+        for row, column in enumerate(_SHARED_COLUMNS):
+            values = getattr(series, column)
+            grid[row] = values.view(np.float64) if values.dtype == np.int64 else values
+        self.spec = {
+            "name": self._shm.name,
+            "length": length,
+            "symbol": series.symbol,
+            "timeframe": series.timeframe,
+            "source": series.source,
+            "tz": series.tz,
+        }
+
+    def __enter__(self) -> "SharedBarSeries":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def attach_shared_series(spec: dict[str, Any]) -> tuple[shared_memory.SharedMemory, BarSeries]:
+    """Map a SharedBarSeries block; keep the returned handle alive while the series is used."""
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    length = int(spec["length"])
+    grid = np.ndarray((len(_SHARED_COLUMNS), length), dtype=np.float64, buffer=shm.buf)
+    columns = {name: grid[row] for row, name in enumerate(_SHARED_COLUMNS)}
+    series = BarSeries(
+        ts=columns["ts"].view(np.int64),
+        open=columns["open"],
+        high=columns["high"],
+        low=columns["low"],
+        close=columns["close"],
+        volume=columns["volume"],
+        fetched_at=columns["fetched_at"].view(np.int64),
+        symbol=spec["symbol"],
+        timeframe=spec["timeframe"],
+        source=spec["source"],
+        tz=spec["tz"],
+    )
+    return shm, series
@@ -0,0 +1,529 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+
+from .models import Fill, OrderRequest, RunSummary, Signal
+from .storage import (
+    MAX_PAGE_SIZE,
+    Page,
+    _RUN_COLUMNS,
+    _curve_rows,
+    _decode_cursor,
+    _decode_curves,
+    _encode_cursor,
+    _normalize_ts,
+    _run_from_row,
+    _scalar_values,
+)
+
+# Prefixed so the tables can live in the app database next to its own ``orders``.
+_metadata = MetaData()
+_Id = BigInteger().with_variant(Integer, "sqlite")
+_Timestamp = DateTime(timezone=True)
+
+_runs = Table(
+    "core_runs",
+    _metadata,
+    Column("run_id", String, primary_key=True),
+    Column("mode", String),
+    Column("status", String),
+    Column("started_at", _Timestamp),
+    Column("completed_at", _Timestamp),
+    Column("strategy", String),
+    Column("symbols_json", Text),
+    Column("equity", Float),
+    Column("cash", Float),
+    Column("exposure", Float),
+    Column("risk_flags_json", Text),
+    Column("metrics_json", Text),
+    Column("ensemble_weights_json", Text),
+    Column("config_json", Text),
+    Index("ix_core_runs_started_at", "started_at", "run_id"),
+    Index("ix_core_runs_strategy_started_at", "strategy", "started_at", "run_id"),
+)
+_run_curves = Table(
+    "core_run_curves",
+    _metadata,
+    Column("run_id", String, primary_key=True),
+    Column("name", String, primary_key=True),
+    Column("encoding", String),
+    Column("length", Integer),
+    Column("vocab_json", Text),
+    Column("payload", LargeBinary),
+)
+_signals = Table(
+    "core_signals",
+    _metadata,
+    Column("id", _Id, primary_key=True, autoincrement=True),
+    Column("run_id", String),
+    Column("symbol", String),
+    Column("side", String),
+    Column("strength", Float),
+    Column("generated_at", _Timestamp),
+    Column("meta_json", Text),
+    Index("ix_core_signals_generated_at", "generated_at", "id"),
+    Index("ix_core_signals_run_id_generated_at", "run_id", "generated_at", "id"),
+    Index("ix_core_signals_symbol_generated_at", "symbol", "generated_at", "id"),
+)
+_orders = Table(
+    "core_orders",
+    _metadata,
+    Column("id", String, primary_key=True),
+    Column("run_id", String),
+    Column("symbol", String),
+    Column("side", String),
+    Column("quantity", Float),
+    Column("order_type", String),
+    Column("created_at", _Timestamp),
+    Column("payload_json", Text),
+    Index("ix_core_orders_created_at", "created_at", "id"),
+    Index("ix_core_orders_run_id_created_at", "run_id", "created_at", "id"),
+    Index("ix_core_orders_symbol_created_at", "symbol", "created_at", "id"),
+)
+_fills = Table(
+    "core_fills",
+    _metadata,
+    Column("id", _Id, primary_key=True, autoincrement=True),
+    Column("run_id", String),
+    Column("order_id", String),
+    Column("symbol", String),
+    Column("side", String),
+    Column("quantity", Float),
+    Column("price", Float),
+    Column("fee", Float),
+    Column("slippage_bps", Float),
+    Column("spread_bps", Float),
+    Column("latency_ms", Integer),
+    Column("filled_at", _Timestamp),
+    Column("payload_json", Text),
+    Index("ix_core_fills_filled_at", "filled_at", "id"),
+    Index("ix_core_fills_run_id_filled_at", "run_id", "filled_at", "id"),
+    Index("ix_core_fills_symbol_filled_at", "symbol", "filled_at", "id"),
+)
+# Append-only tables bulk-loaded with COPY; the rest are upserted by key.
+_BULK_TABLES = ("core_signals", "core_fills")
+_UPSERT_KEYS = {
+    "core_runs": ["run_id"],
+    "core_run_curves": ["run_id", "name"],
+    "core_orders": ["id"],
+}
+
+_ENGINES: dict[str, Engine] = {}
+_SCHEMA_READY: set[str] = set()
+_LOCK = threading.Lock()
+
+
+def _engine_for(url: str) -> Engine:
+    with _LOCK:
+        engine = _ENGINES.get(url)
+        if engine is None:
+            if url.startswith("sqlite"):
+                engine = create_engine(url, connect_args={"check_same_thread": False})
+            else:
+                engine = create_engine(url, pool_pre_ping=True)
+            _ENGINES[url] = engine
+        return engine
+
+
+def _run_dict(row: Any) -> dict[str, Any]:
+    return _run_from_row([_iso(value) if isinstance(value, datetime) else value for value in row])
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _iso(value: datetime | None) -> str | None:
+    return _utc(value).isoformat() if value is not None else None
+
+
+class _PendingWrites:
+    """Rows buffered per table and written together in one transaction.
+
+    Signals and fills go in with ``COPY ... FROM STDIN`` on Postgres/psycopg and
+    as multi-row ``INSERT``s elsewhere; runs, curves and orders are upserted.
+    """
+
+    def __init__(self, engine: Engine, flush_interval: float, batch_size: int) -> None:
+        self.engine = engine
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.rows: dict[str, list[dict[str, Any]]] = {name: [] for name in _metadata.tables}
+        self.count = 0
+        self.first_at: float | None = None
+        self.closed = False
+        self.lock = threading.RLock()
+
+    def add(self, table: Table, rows: list[dict[str, Any]]) -> None:
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("run_store_closed")
+            self.rows[table.name].extend(rows)
+            self.count += len(rows)
+            if self.first_at is None:
+                self.first_at = time.monotonic()
+            elapsed = time.monotonic() - self.first_at
+            if self.count >= self.batch_size or elapsed >= self.flush_interval:
+                self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self.count:
+                return
+            pending = self.rows
+            self.rows = {name: [] for name in pending}
+            self.count = 0
+            self.first_at = None
+            with self.engine.begin() as conn:
+                for table in _metadata.sorted_tables:
+                    rows = pending[table.name]
+                    if not rows:
+                        continue
+                    if table.name in _BULK_TABLES:
+                        _bulk_insert(conn, table, rows)
+                    else:
+                        _upsert(conn, table, rows)
+
+    def close(self) -> None:
+        with self.lock:
+            self.flush()
+            self.closed = True
+
+
+def _bulk_insert(conn: Connection, table: Table, rows: list[dict[str, Any]]) -> None:
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg":
+        columns = list(rows[0])
+        cursor = conn.connection.driver_connection.cursor()
+        with cursor.copy(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row([row[column] for column in columns])
+        return
+    conn.execute(table.insert(), rows)
+
+
+def _upsert(conn: Connection, table: Table, rows: list[dict[str, Any]]) -> None:
+    keys = _UPSERT_KEYS[table.name]
+    dialect = postgresql if conn.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            column.name: statement.excluded[column.name]
+            for column in table.columns
+            if column.name not in keys
+        },
+    )
+    conn.execute(statement, rows)
+
+
+class SqlRunStore:
+    """``RunStore`` on a SQLAlchemy engine, for Postgres shared by workers and API replicas.
+
+    Same methods and return shapes as the sqlite ``RunStore``. Writes are
+    buffered and flushed in one transaction once ``batch_size`` rows are queued
+    or ``flush_interval`` seconds have passed, before every read, and on
+    ``close``/exit. Timestamps are stored as ``timestamptz``.
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        engine: Engine | None = None,
+        flush_interval: float = 0.2,
+        batch_size: int = 1000,
+    ) -> None:
+        if engine is None:
+            if not url:
+                raise ValueError("store_url_required")
+            engine = _engine_for(url)
+        if engine.dialect.name not in ("postgresql", "sqlite"):
+            raise ValueError(f"unsupported_run_store_dialect:{engine.dialect.name}")
+        self._engine = engine
+        key = engine.url.render_as_string(hide_password=False)
+        with _LOCK:
+            if key not in _SCHEMA_READY:
+                _metadata.create_all(engine)
+                _SCHEMA_READY.add(key)
+        self._pending = _PendingWrites(engine, flush_interval, batch_size)
+        self._finalizer = weakref.finalize(self, self._pending.close)
+
+    def __enter__(self) -> "SqlRunStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def flush(self) -> None:
+        self._pending.flush()
+
+    def close(self) -> None:
+        """Write anything still buffered; the engine stays pooled for other stores."""
+        self._finalizer()
+
+    def record_run(self, summary: RunSummary, config: dict) -> None:
+        payload = summary.to_dict()
+        scalars = dict(zip(_RUN_COLUMNS[6:], _scalar_values(payload)))
+        row = {
+            "run_id": summary.run_id,
+            "mode": summary.mode,
+            "status": summary.status,
+            "started_at": _utc(summary.started_at),
+            "completed_at": _utc(summary.completed_at) if summary.completed_at else None,
+            "strategy": summary.strategy,
+            **scalars,
+            "config_json": json.dumps(config),
+        }
+        curves = [
+            dict(zip(("run_id", "name", "encoding", "length", "vocab_json", "payload"), values))
+            for values in _curve_rows(summary.run_id, payload)
+        ]
+        self._pending.add(_runs, [row])
+        self._pending.add(_run_curves, curves)
+
+    def record_signal(self, run_id: str, signal: Signal) -> None:
+        row = {
+            "run_id": run_id,
+            "symbol": signal.symbol,
+            "side": signal.side,
+            "strength": signal.strength,
+            "generated_at": _utc(signal.generated_at),
+            "meta_json": json.dumps(signal.meta),
+        }
+        self._pending.add(_signals, [row])
+
+    def record_order(self, run_id: str, order: OrderRequest) -> None:
+        row = {
+            "id": order.client_order_id or "",
+            "run_id": run_id,
+            "symbol": order.symbol,
+            "side": order.side,
+            "quantity": order.quantity,
+            "order_type": order.order_type,
+            "created_at": datetime.now(timezone.utc),
+            "payload_json": json.dumps(order.to_dict()),
+        }
+        self._pending.add(_orders, [row])
+
+    def record_fill(self, run_id: str, fill: Fill) -> None:
+        row = {
+            "run_id": run_id,
+            "order_id": fill.order_id,
+            "symbol": fill.symbol,
+            "side": fill.side,
+            "quantity": fill.quantity,
+            "price": fill.price,
+            "fee": fill.fee,
+            "slippage_bps": fill.slippage_bps,
+            "spread_bps": fill.spread_bps,
+            "latency_ms": fill.latency_ms,
+            "filled_at": _utc(fill.filled_at),
+            "payload_json": json.dumps(fill.to_dict()),
+        }
+        self._pending.add(_fills, [row])
+
+    def _read(self, statement: Any) -> list[Any]:
+        self._pending.flush()
+        with self._engine.connect() as conn:
+            return list(conn.execute(statement))
+
+    def _run_columns(self) -> list[Column]:
+        return [column for column in _runs.columns if column.name != "config_json"]
+
+    def latest_run(self, include_curves: bool = True) -> dict[str, Any] | None:
+        page = self.query_runs(limit=1)
+        if not page.items:
+            return None
+        return self.get_run(page.items[0]["run_id"]) if include_curves else page.items[0]
+
+    def get_run(self, run_id: str, include_curves: bool = True) -> dict[str, Any] | None:
+        rows = self._read(select(*self._run_columns()).where(_runs.c.run_id == run_id))
+        if not rows:
+            return None
+        run = _run_dict(rows[0])
+        if include_curves:
+            run.update(self.load_curves(run_id))
+        return run
+
+    def load_curves(self, run_id: str) -> dict[str, list]:
+        curves = _run_curves.c
+        statement = select(curves.name, curves.encoding, curves.vocab_json, curves.payload)
+        return _decode_curves(self._read(statement.where(curves.run_id == run_id)))
+
+    def list_fills(self, limit: int = 50) -> list[dict]:
+        return self.query_fills(limit=limit).items
+
+    def list_runs(self, limit: int = 20) -> list[dict]:
+        return self.query_runs(limit=limit).items
+
+    def query_runs(
+        self,
+        strategy: str | None = None,
+        mode: str | None = None,
+        status: str | None = None,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> Page:
+        rows, next_cursor = self._page(
+            _runs,
+            _runs.c.started_at,
+            _runs.c.run_id,
+            self._run_columns(),
+            {"strategy": strategy, "mode": mode, "status": status},
+            since,
+            until,
+            limit,
+            cursor,
+        )
+        return Page([_run_dict(row) for row in rows], next_cursor)
+
+    def query_fills(
+        self,
+        run_id: str | None = None,
+        symbol: str | None = None,
+        side: str | None = None,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> Page:
+        rows, next_cursor = self._page(
+            _fills,
+            _fills.c.filled_at,
+            _fills.c.id,
+            [_fills.c.run_id, _fills.c.payload_json],
+            {"run_id": run_id, "symbol": symbol, "side": side},
+            since,
+            until,
+            limit,
+            cursor,
+        )
+        return Page([{**json.loads(payload), "run_id": run} for run, payload in rows], next_cursor)
+
+    def query_orders(
+        self,
+        run_id: str | None = None,
+        symbol: str | None = None,
+        side: str | None = None,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> Page:
+        rows, next_cursor = self._page(
+            _orders,
+            _orders.c.created_at,
+            _orders.c.id,
+            [_orders.c.run_id, _orders.c.created_at, _orders.c.payload_json],
+            {"run_id": run_id, "symbol": symbol, "side": side},
+            since,
+            until,
+            limit,
+            cursor,
+        )
+        items = [
+            {**json.loads(payload), "run_id": run, "created_at": _iso(created_at)}
+            for run, created_at, payload in rows
+        ]
+        return Page(items, next_cursor)
+
+    def query_signals(
+        self,
+        run_id: str | None = None,
+        symbol: str | None = None,
+        side: str | None = None,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> Page:
+        rows, next_cursor = self._page(
+            _signals,
+            _signals.c.generated_at,
+            _signals.c.id,
+            [
+                _signals.c.run_id,
+                _signals.c.symbol,
+                _signals.c.side,
+                _signals.c.strength,
+                _signals.c.generated_at,
+                _signals.c.meta_json,
+            ],
+            {"run_id": run_id, "symbol": symbol, "side": side},
+            since,
+            until,
+            limit,
+            cursor,
+        )
+        items = [
+            {
+                "run_id": row[0],
+                "symbol": row[1],
+                "side": row[2],
+                "strength": row[3],
+                "generated_at": _iso(row[4]),
+                "meta": json.loads(row[5] or "{}"),
+            }
+            for row in rows
+        ]
+        return Page(items, next_cursor)
+
+    def _page(
+        self,
+        table: Table,
+        time_column: Column,
+        key_column: Column,
+        columns: list[Column],
+        filters: dict[str, Any],
+        since: str | datetime | None,
+        until: str | datetime | None,
+        limit: int,
+        cursor: str | None,
+    ) -> tuple[list[tuple], str | None]:
+        """Newest-first keyset page over ``(time_column, key_column)``, as in ``RunStore._page``."""
+        statement = select(time_column, key_column, *columns)
+        for name, value in filters.items():
+            if value is not None:
+                statement = statement.where(table.c[name] == value)
+        if since is not None:
+            statement = statement.where(time_column >= datetime.fromisoformat(_normalize_ts(since)))
+        if until is not None:
+            statement = statement.where(time_column < datetime.fromisoformat(_normalize_ts(until)))
+        if cursor:
+            timestamp, key = _decode_cursor(cursor)
+            bound = (_utc(datetime.fromisoformat(timestamp)), key)
+            statement = statement.where(tuple_(time_column, key_column) < tuple_(*bound))
+        size = max(1, min(int(limit), MAX_PAGE_SIZE))
+        statement = statement.order_by(time_column.desc(), key_column.desc()).limit(size + 1)
+        rows = [tuple(row) for row in self._read(statement)]
+        next_cursor = None
+        if len(rows) > size:
+            next_cursor = _encode_cursor(_iso(rows[size - 1][0]), rows[size - 1][1])
+        return [row[2:] for row in rows[:size]], next_cursor
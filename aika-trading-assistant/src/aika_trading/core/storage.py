@@ -1,24 +1,297 @@
 from __future__ import annotations
 
+import base64
+import itertools
 import json
+import queue
 import sqlite3
+import threading
+import time
+import weakref
+import zlib
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Sequence
 
-from .models import RunSummary, Signal, OrderRequest, Fill
+import numpy as np
+
+from .config import CoreSettings
+from .models import ISO_FMT, RunSummary, Signal, OrderRequest, Fill
+
+if TYPE_CHECKING:
+    from .sql_storage import SqlRunStore
+
+# Scalar run columns, in ``RunSummary.to_dict`` order; the curves live in ``run_curves``.
+_RUN_COLUMNS = (
+    "run_id",
+    "mode",
+    "status",
+    "started_at",
+    "completed_at",
+    "strategy",
+    "symbols_json",
+    "equity",
+    "cash",
+    "exposure",
+    "risk_flags_json",
+    "metrics_json",
+    "ensemble_weights_json",
+)
+# Columns added after the first schema; ALTERed into older databases.
+_ADDED_RUN_COLUMNS = {
+    "equity": "REAL",
+    "cash": "REAL",
+    "exposure": "REAL",
+    "risk_flags_json": "TEXT",
+    "metrics_json": "TEXT",
+    "ensemble_weights_json": "TEXT",
+}
+_CURVE_FIELDS = ("equity_curve", "drawdown_curve")
+_LABEL_FIELDS = ("regime_labels",)
+_SELECT_RUNS = f"SELECT {', '.join(_RUN_COLUMNS)} FROM runs"
+_INSERT_RUN = f"""
+    INSERT OR REPLACE INTO runs
+    ({', '.join(_RUN_COLUMNS)}, summary_json, config_json)
+    VALUES ({', '.join('?' * len(_RUN_COLUMNS))}, NULL, ?)
+"""
+_INSERT_CURVE = """
+    INSERT OR REPLACE INTO run_curves (run_id, name, encoding, length, vocab_json, payload)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_INSERT_SIGNAL = """
+    INSERT INTO signals (run_id, symbol, side, strength, generated_at, meta_json)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_INSERT_ORDER = """
+    INSERT OR REPLACE INTO orders
+    (id, run_id, symbol, side, quantity, order_type, created_at, payload_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_FILL = """
+    INSERT INTO fills
+    (run_id, order_id, symbol, side, quantity, price, fee, slippage_bps, spread_bps, latency_ms,
+     filled_at, payload_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_fills_filled_at ON fills (filled_at)",
+    "CREATE INDEX IF NOT EXISTS idx_fills_run_id ON fills (run_id)",
+    "CREATE INDEX IF NOT EXISTS idx_signals_run_id ON signals (run_id)",
+    # Keyset pagination: filter column, then sort column (the rowid tiebreak is implicit).
+    "CREATE INDEX IF NOT EXISTS idx_runs_strategy_started_at ON runs (strategy, started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_fills_run_id_filled_at ON fills (run_id, filled_at)",
+    "CREATE INDEX IF NOT EXISTS idx_fills_symbol_filled_at ON fills (symbol, filled_at)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_run_id_created_at ON orders (run_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_symbol_created_at ON orders (symbol, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_signals_generated_at ON signals (generated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_signals_run_id_generated_at ON signals (run_id, generated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_signals_symbol_generated_at ON signals (symbol, generated_at)",
+)
+MAX_PAGE_SIZE = 1000
+
+
+@dataclass
+class Page:
+    """Newest-first rows; pass ``next_cursor`` back for the next page (``None`` at the end)."""
+
+    items: list[dict[str, Any]] = field(default_factory=list)
+    next_cursor: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"items": self.items, "next_cursor": self.next_cursor}
+
+
+def encode_floats(values: Sequence[float]) -> bytes:
+    """zlib-compressed little-endian float64 array."""
+    return zlib.compress(np.asarray(values, dtype="<f8").tobytes())
+
+
+def decode_floats(payload: bytes) -> list[float]:
+    return np.frombuffer(zlib.decompress(payload), dtype="<f8").tolist()
+
+
+def encode_labels(labels: Sequence[str]) -> tuple[list[str], str, bytes]:
+    """Dictionary-encode ``labels``: distinct values, the code dtype and the compressed codes."""
+    vocab = list(dict.fromkeys(labels))
+    lookup = {label: code for code, label in enumerate(vocab)}
+    dtype = "<u1" if len(vocab) <= 0xFF else "<u2" if len(vocab) <= 0xFFFF else "<u4"
+    codes = np.fromiter((lookup[label] for label in labels), dtype=dtype, count=len(labels))
+    return vocab, dtype, zlib.compress(codes.tobytes())
+
+
+def decode_labels(vocab: Sequence[str], dtype: str, payload: bytes) -> list[str]:
+    return [vocab[code] for code in np.frombuffer(zlib.decompress(payload), dtype=dtype).tolist()]
+
+
+# Database files whose schema this process has already created; the API builds a store per request.
+_SCHEMA_READY: set[str] = set()
+_SCHEMA_LOCK = threading.Lock()
+_FLUSH = object()
+_STOP = object()
+
+
+class _WriteBehind:
+    """Background thread owning a WAL connection that writes queued inserts in batches.
+
+    Consecutive statements of the same kind go through one ``executemany`` and
+    each batch is a single transaction, so a burst of fills costs one commit
+    instead of one per row. A batch is written once ``batch_size`` rows are
+    queued, ``flush_interval`` seconds after its first row, or on ``flush``.
+    """
+
+    def __init__(self, path: Path, flush_interval: float, batch_size: int) -> None:
+        self.conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.Lock()
+        self.queue: queue.Queue = queue.Queue()
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.error: BaseException | None = None
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="run-store-writer", daemon=True)
+        self.thread.start()
+
+    def put(self, statements: list[tuple[str, tuple]]) -> None:
+        """Queue ``statements``; they always land in the same transaction."""
+        if self.closed:
+            raise RuntimeError("run_store_closed")
+        self.queue.put(statements)
+
+    def flush(self) -> None:
+        """Block until everything queued so far is committed."""
+        if not self.closed:
+            self.queue.put(_FLUSH)
+            self.queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(_STOP)
+        self.thread.join()
+        self.conn.close()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError(f"run_store_write_failed:{error}") from error
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            item = self.queue.get()
+            batch: list[tuple[str, tuple]] = []
+            taken = 1
+            deadline = time.monotonic() + self.flush_interval
+            while item is not _FLUSH and item is not _STOP:
+                batch.extend(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                except queue.Empty:
+                    break
+                taken += 1
+            stop = item is _STOP
+            if batch:
+                self._write(batch)
+            for _ in range(taken):
+                self.queue.task_done()
+
+    def _write(self, batch: list[tuple[str, tuple]]) -> None:
+        try:
+            with self.lock, self.conn:
+                for sql, rows in itertools.groupby(batch, key=lambda entry: entry[0]):
+                    self.conn.executemany(sql, [params for _sql, params in rows])
+        except sqlite3.Error as exc:
+            self.error = self.error or exc
 
 
 class RunStore:
-    def __init__(self, path: str) -> None:
+    """Run summaries, signals, orders and fills in sqlite.
+
+    Run summaries are stored as scalar columns; their equity/drawdown curves
+    and regime labels go to ``run_curves`` as compressed float64 and
+    dictionary-encoded arrays, decoded only by ``get_run``/``latest_run`` and
+    never by ``list_runs``.
+
+    By default every ``record_*`` call commits on its own connection. With
+    ``write_behind=True`` writes are queued to a background thread holding one
+    long-lived WAL connection and committed in batches; reads flush the queue
+    first, and ``close`` (or leaving the ``with`` block, or interpreter exit)
+    flushes whatever is left.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        write_behind: bool = False,
+        flush_interval: float = 0.2,
+        batch_size: int = 1000,
+    ) -> None:
         self._path = Path(path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
+        self._writer: _WriteBehind | None = None
+        if write_behind:
+            self._writer = _WriteBehind(self._path, flush_interval, batch_size)
+            self._finalizer = weakref.finalize(self, self._writer.close)
+
+    def __enter__(self) -> "RunStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Commit queued writes and stop the writer thread; a no-op for synchronous stores."""
+        if self._writer is not None:
+            self._finalizer.detach()
+            self._writer.close()
 
     def _connect(self) -> sqlite3.Connection:
         return sqlite3.connect(str(self._path))
 
+    def _write(self, sql: str, params: tuple) -> None:
+        self._write_all([(sql, params)])
+
+    def _write_all(self, statements: list[tuple[str, tuple]]) -> None:
+        if self._writer is not None:
+            self._writer.put(statements)
+            return
+        with self._connect() as conn:
+            for sql, params in statements:
+                conn.execute(sql, params)
+
+    def _read(self, sql: str, params: tuple = ()) -> list[tuple]:
+        if self._writer is None:
+            with self._connect() as conn:
+                return conn.execute(sql, params).fetchall()
+        self._writer.flush()
+        if self._writer.closed:
+            raise RuntimeError("run_store_closed")
+        with self._writer.lock:
+            return self._writer.conn.execute(sql, params).fetchall()
+
     def _init_db(self) -> None:
+        key = str(self._path.resolve())
+        with _SCHEMA_LOCK:
+            if key in _SCHEMA_READY and self._path.exists():
+                return
+            self._create_schema()
+            _SCHEMA_READY.add(key)
+
+    def _create_schema(self) -> None:
         with self._connect() as conn:
             conn.execute(
                 """
@@ -81,119 +354,386 @@ class RunStore:
                 )
                 """
             )
-
-    def record_run(self, summary: RunSummary, config: dict) -> None:
-        with self._connect() as conn:
             conn.execute(
                 """
-                INSERT OR REPLACE INTO runs
-                (run_id, mode, status, started_at, completed_at, strategy, symbols_json, summary_json, config_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    summary.run_id,
-                    summary.mode,
-                    summary.status,
-                    summary.started_at.isoformat(),
-                    summary.completed_at.isoformat() if summary.completed_at else None,
-                    summary.strategy,
-                    json.dumps(summary.symbols),
-                    json.dumps(summary.to_dict()),
-                    json.dumps(config),
-                ),
+                CREATE TABLE IF NOT EXISTS run_curves (
+                    run_id TEXT,
+                    name TEXT,
+                    encoding TEXT,
+                    length INTEGER,
+                    vocab_json TEXT,
+                    payload BLOB,
+                    PRIMARY KEY (run_id, name)
+                )
+                """
             )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+            for column, kind in _ADDED_RUN_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE runs ADD COLUMN {column} {kind}")
+            for statement in _INDEXES:
+                conn.execute(statement)
+            self._migrate_legacy_runs(conn)
 
-    def record_signal(self, run_id: str, signal: Signal) -> None:
-        with self._connect() as conn:
+    @staticmethod
+    def _migrate_legacy_runs(conn: sqlite3.Connection) -> None:
+        """Split runs written as one ``summary_json`` blob into columns and ``run_curves`` rows."""
+        legacy = conn.execute(
+            "SELECT run_id, summary_json FROM runs WHERE summary_json IS NOT NULL"
+        ).fetchall()
+        assignments = ", ".join(f"{column} = ?" for column in _RUN_COLUMNS[6:])
+        for run_id, summary_json in legacy:
+            summary = json.loads(summary_json)
             conn.execute(
-                """
-                INSERT INTO signals (run_id, symbol, side, strength, generated_at, meta_json)
-                VALUES (?, ?, ?, ?, ?, ?)
+                f"""
+                UPDATE runs SET {assignments}, summary_json = NULL
+                WHERE run_id = ?
                 """,
-                (
-                    run_id,
-                    signal.symbol,
-                    signal.side,
-                    signal.strength,
-                    signal.generated_at.isoformat(),
-                    json.dumps(signal.meta),
-                ),
+                (*_scalar_values(summary), run_id),
             )
+            conn.executemany(_INSERT_CURVE, _curve_rows(run_id, summary))
+
+    def record_run(self, summary: RunSummary, config: dict) -> None:
+        payload = summary.to_dict()
+        row = (
+            summary.run_id,
+            summary.mode,
+            summary.status,
+            summary.started_at.isoformat(),
+            summary.completed_at.isoformat() if summary.completed_at else None,
+            summary.strategy,
+            *_scalar_values(payload),
+            json.dumps(config),
+        )
+        curves = [(_INSERT_CURVE, params) for params in _curve_rows(summary.run_id, payload)]
+        self._write_all([(_INSERT_RUN, row), *curves])
+
+    def record_signal(self, run_id: str, signal: Signal) -> None:
+        self._write(
+            _INSERT_SIGNAL,
+            (
+                run_id,
+                signal.symbol,
+                signal.side,
+                signal.strength,
+                signal.generated_at.isoformat(),
+                json.dumps(signal.meta),
+            ),
+        )
 
     def record_order(self, run_id: str, order: OrderRequest) -> None:
-        order_id = order.client_order_id or ""
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO orders
-                (id, run_id, symbol, side, quantity, order_type, created_at, payload_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    order_id,
-                    run_id,
-                    order.symbol,
-                    order.side,
-                    order.quantity,
-                    order.order_type,
-                    datetime.now(timezone.utc).isoformat(),
-                    json.dumps(order.to_dict()),
-                ),
-            )
+        self._write(
+            _INSERT_ORDER,
+            (
+                order.client_order_id or "",
+                run_id,
+                order.symbol,
+                order.side,
+                order.quantity,
+                order.order_type,
+                datetime.now(timezone.utc).isoformat(),
+                json.dumps(order.to_dict()),
+            ),
+        )
 
     def record_fill(self, run_id: str, fill: Fill) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO fills
-                (run_id, order_id, symbol, side, quantity, price, fee, slippage_bps, spread_bps, latency_ms, filled_at, payload_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    run_id,
-                    fill.order_id,
-                    fill.symbol,
-                    fill.side,
-                    fill.quantity,
-                    fill.price,
-                    fill.fee,
-                    fill.slippage_bps,
-                    fill.spread_bps,
-                    fill.latency_ms,
-                    fill.filled_at.isoformat(),
-                    json.dumps(fill.to_dict()),
-                ),
-            )
+        self._write(
+            _INSERT_FILL,
+            (
+                run_id,
+                fill.order_id,
+                fill.symbol,
+                fill.side,
+                fill.quantity,
+                fill.price,
+                fill.fee,
+                fill.slippage_bps,
+                fill.spread_bps,
+                fill.latency_ms,
+                fill.filled_at.isoformat(),
+                json.dumps(fill.to_dict()),
+            ),
+        )
 
-    def latest_run(self) -> dict[str, Any] | None:
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT summary_json FROM runs ORDER BY started_at DESC LIMIT 1"
-            ).fetchone()
-        if not row:
+    def latest_run(self, include_curves: bool = True) -> dict[str, Any] | None:
+        rows = self._read(f"{_SELECT_RUNS} ORDER BY started_at DESC LIMIT 1")
+        if not rows:
+            return None
+        return self._run_dict(rows[0], include_curves)
+
+    def get_run(self, run_id: str, include_curves: bool = True) -> dict[str, Any] | None:
+        rows = self._read(f"{_SELECT_RUNS} WHERE run_id = ?", (run_id,))
+        if not rows:
             return None
-        return json.loads(row[0])
+        return self._run_dict(rows[0], include_curves)
+
+    def load_curves(self, run_id: str) -> dict[str, list]:
+        """Decode a run's equity/drawdown curves and regime labels (empty lists when absent)."""
+        rows = self._read(
+            "SELECT name, encoding, vocab_json, payload FROM run_curves WHERE run_id = ?", (run_id,)
+        )
+        return _decode_curves(rows)
+
+    def _run_dict(self, row: tuple, include_curves: bool) -> dict[str, Any]:
+        run = _run_from_row(row)
+        if include_curves:
+            run.update(self.load_curves(run["run_id"]))
+        return run
 
     def list_fills(self, limit: int = 50) -> list[dict]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT payload_json FROM fills
-                ORDER BY filled_at DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-        return [json.loads(row[0]) for row in rows]
+        return self.query_fills(limit=limit).items
 
     def list_runs(self, limit: int = 20) -> list[dict]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT summary_json FROM runs
-                ORDER BY started_at DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-        return [json.loads(row[0]) for row in rows]
+        """Most recent runs, scalar fields only; use ``get_run`` for a run's curves."""
+        return self.query_runs(limit=limit).items
+
+    def query_runs(
+        self,
+        strategy: str | None = None,
+        mode: str | None = None,
+        status: str | None = None,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> Page:
+        rows, next_cursor = self._page(
+            "runs",
+            "started_at",
+            ", ".join(_RUN_COLUMNS),
+            {"strategy": strategy, "mode": mode, "status": status},
+            since,
+            until,
+            limit,
+            cursor,
+        )
+        return Page([self._run_dict(row, include_curves=False) for row in rows], next_cursor)
+
+    def query_fills(
+        self,
+        run_id: str | None = None,
+        symbol: str | None = None,
+        side: str | None = None,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> Page:
+        rows, next_cursor = self._page(
+            "fills",
+            "filled_at",
+            "run_id, payload_json",
+            {"run_id": run_id, "symbol": symbol, "side": side},
+            since,
+            until,
+            limit,
+            cursor,
+        )
+        return Page([{**json.loads(payload), "run_id": run} for run, payload in rows], next_cursor)
+
+    def query_orders(
+        self,
+        run_id: str | None = None,
+        symbol: str | None = None,
+        side: str | None = None,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> Page:
+        rows, next_cursor = self._page(
+            "orders",
+            "created_at",
+            "run_id, created_at, payload_json",
+            {"run_id": run_id, "symbol": symbol, "side": side},
+            since,
+            until,
+            limit,
+            cursor,
+        )
+        items = [
+            {**json.loads(payload), "run_id": run, "created_at": created_at}
+            for run, created_at, payload in rows
+        ]
+        return Page(items, next_cursor)
+
+    def query_signals(
+        self,
+        run_id: str | None = None,
+        symbol: str | None = None,
+        side: str | None = None,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> Page:
+        rows, next_cursor = self._page(
+            "signals",
+            "generated_at",
+            "run_id, symbol, side, strength, generated_at, meta_json",
+            {"run_id": run_id, "symbol": symbol, "side": side},
+            since,
+            until,
+            limit,
+            cursor,
+        )
+        items = [
+            {
+                "run_id": row[0],
+                "symbol": row[1],
+                "side": row[2],
+                "strength": row[3],
+                "generated_at": row[4],
+                "meta": json.loads(row[5] or "{}"),
+            }
+            for row in rows
+        ]
+        return Page(items, next_cursor)
+
+    def _page(
+        self,
+        table: str,
+        time_column: str,
+        columns: str,
+        filters: dict[str, Any],
+        since: str | datetime | None,
+        until: str | datetime | None,
+        limit: int,
+        cursor: str | None,
+    ) -> tuple[list[tuple], str | None]:
+        """Newest-first keyset page over ``(time_column, rowid)``.
+
+        The cursor is the last row's sort key, so every page is one index seek
+        plus ``limit`` rows however deep it is. ``since`` is inclusive and
+        ``until`` exclusive.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, value in filters.items():
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append(f"{time_column} >= ?")
+            params.append(_normalize_ts(since))
+        if until is not None:
+            clauses.append(f"{time_column} < ?")
+            params.append(_normalize_ts(until))
+        if cursor:
+            clauses.append(f"({time_column}, rowid) < (?, ?)")
+            params.extend(_decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        size = max(1, min(int(limit), MAX_PAGE_SIZE))
+        rows = self._read(
+            f"""
+            SELECT {time_column}, rowid, {columns} FROM {table} {where}
+            ORDER BY {time_column} DESC, rowid DESC
+            LIMIT ?
+            """,
+            (*params, size + 1),
+        )
+        next_cursor = None
+        if len(rows) > size:
+            next_cursor = _encode_cursor(rows[size - 1][0], rows[size - 1][1])
+        return [row[2:] for row in rows[:size]], next_cursor
+
+def open_run_store(settings: CoreSettings, write_behind: bool = False) -> RunStore | SqlRunStore:
+    """``SqlRunStore`` on ``CORE_RUN_STORE_URL`` when set, else ``runs.sqlite`` in the artifacts dir."""
+    if settings.run_store_url:
+        from .sql_storage import SqlRunStore
+
+        return SqlRunStore(settings.run_store_url)
+    return RunStore(str(Path(settings.run.artifacts_dir) / "runs.sqlite"), write_behind=write_behind)
+
+
+def _normalize_ts(value: str | datetime) -> str:
+    """Time filter in the stored ``isoformat()`` form (naive values are taken as UTC)."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError as exc:
+            raise ValueError(f"invalid_timestamp:{value}") from exc
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _encode_cursor(timestamp: str, key: int | str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([timestamp, key]).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int | str]:
+    """(timestamp, tiebreak key): a rowid here, the primary key in ``SqlRunStore``."""
+    try:
+        timestamp, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("invalid_cursor") from exc
+    if not isinstance(timestamp, str) or not isinstance(key, (int, str)):
+        raise ValueError("invalid_cursor")
+    return timestamp, key
+
+
+def _display_ts(value: str | datetime | None) -> str | None:
+    """Stored timestamps in the ``RunSummary.to_dict`` format."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.strftime(ISO_FMT)
+
+
+def _run_from_row(row: Sequence[Any]) -> dict[str, Any]:
+    """A run summary dict (without curves) from a row of ``_RUN_COLUMNS``."""
+    values = dict(zip(_RUN_COLUMNS, row))
+    return {
+        "run_id": values["run_id"],
+        "mode": values["mode"],
+        "status": values["status"],
+        "started_at": _display_ts(values["started_at"]),
+        "completed_at": _display_ts(values["completed_at"]),
+        "strategy": values["strategy"],
+        "symbols": json.loads(values["symbols_json"] or "[]"),
+        "equity": values["equity"],
+        "cash": values["cash"],
+        "exposure": values["exposure"],
+        "risk_flags": json.loads(values["risk_flags_json"] or "[]"),
+        "metrics": json.loads(values["metrics_json"] or "{}"),
+        "ensemble_weights": json.loads(values["ensemble_weights_json"] or "{}"),
+    }
+
+
+def _decode_curves(rows: Sequence[Sequence[Any]]) -> dict[str, list]:
+    """``run_curves`` rows of (name, encoding, vocab_json, payload) back into lists."""
+    curves: dict[str, list] = {name: [] for name in (*_CURVE_FIELDS, *_LABEL_FIELDS)}
+    for name, encoding, vocab_json, payload in rows:
+        if encoding == "f8":
+            curves[name] = decode_floats(payload)
+        else:
+            dtype = encoding.split(":", 1)[1]
+            curves[name] = decode_labels(json.loads(vocab_json), dtype, payload)
+    return curves
+
+
+def _scalar_values(summary: dict[str, Any]) -> tuple:
+    """Values for ``_RUN_COLUMNS`` from ``symbols_json`` on."""
+    return (
+        json.dumps(summary.get("symbols", [])),
+        summary.get("equity"),
+        summary.get("cash"),
+        summary.get("exposure"),
+        json.dumps(summary.get("risk_flags", [])),
+        json.dumps(summary.get("metrics", {})),
+        json.dumps(summary.get("ensemble_weights", {})),
+    )
+
+
+def _curve_rows(run_id: str, summary: dict[str, Any]) -> list[tuple]:
+    rows = []
+    for name in _CURVE_FIELDS:
+        values = summary.get(name) or []
+        rows.append((run_id, name, "f8", len(values), None, encode_floats(values)))
+    for name in _LABEL_FIELDS:
+        labels = summary.get(name) or []
+        vocab, dtype, payload = encode_labels(labels)
+        rows.append((run_id, name, f"dict:{dtype}", len(labels), json.dumps(vocab), payload))
+    return rows
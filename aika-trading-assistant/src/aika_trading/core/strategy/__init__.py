@@ -1,11 +1,13 @@
-from .base import Strategy
-from .registry import registry, StrategyRegistry
+from .base import Strategy, SignalArrays
+from .registry import registry, StrategyRegistry, StrategyFactory
 from .builtins import VolatilityMomentum, MeanReversionZScore, BreakoutAtrStops
 
 __all__ = [
     "Strategy",
+    "SignalArrays",
     "registry",
     "StrategyRegistry",
+    "StrategyFactory",
     "VolatilityMomentum",
     "MeanReversionZScore",
     "BreakoutAtrStops",
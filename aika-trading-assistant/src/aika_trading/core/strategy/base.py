@@ -1,9 +1,39 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
-from ..models import Bar, Signal
+import numpy as np
+
+from ..models import Bar, Signal, utc_now
+
+if TYPE_CHECKING:
+    from ..series import BarSeries
+
+
+@dataclass
+class SignalArrays:
+    """Per-bar signals for a whole series; side is -1/0/1 and 0 also covers warm-up bars."""
+
+    symbol: str
+    side: np.ndarray
+    strength: np.ndarray
+    meta: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def signal_at(self, idx: int) -> Signal:
+        side = int(self.side[idx])
+        meta: dict[str, Any] = {}
+        for key, values in self.meta.items():
+            value = float(values[idx])
+            meta[key] = None if value != value else value
+        return Signal(
+            symbol=self.symbol,
+            side="long" if side > 0 else "short" if side < 0 else "flat",
+            strength=float(self.strength[idx]),
+            generated_at=utc_now(),
+            meta=meta,
+        )
 
 
 class Strategy(ABC):
@@ -12,6 +42,7 @@ class Strategy(ABC):
 
     def __init__(self, **params: Any) -> None:
         self.params = params
+        self.reset()
 
     @property
     def min_history(self) -> int:
@@ -21,6 +52,26 @@ class Strategy(ABC):
     def generate_signals(self, history: list[Bar]) -> list[Signal]:
         raise NotImplementedError
 
+    def on_bar(self, bar: Bar) -> list[Signal]:
+        """Incremental counterpart of generate_signals, fed one bar at a time."""
+        raise NotImplementedError
+
+    @property
+    def supports_incremental(self) -> bool:
+        return type(self).on_bar is not Strategy.on_bar
+
+    def signal_arrays(self, series: "BarSeries") -> SignalArrays:
+        """Vectorized counterpart of generate_signals over a whole series."""
+        raise NotImplementedError
+
+    @property
+    def supports_vectorized(self) -> bool:
+        return type(self).signal_arrays is not Strategy.signal_arrays
+
+    def reset(self) -> None:
+        """Drop any rolling state accumulated by on_bar."""
+        return None
+
     def position_sizing(self, signal: Signal, portfolio_value: float) -> float:
         risk_pct = float(self.params.get("risk_pct", 0.02))
         return max(0.0, portfolio_value * risk_pct)
@@ -2,9 +2,14 @@ from __future__ import annotations
 
 from statistics import mean, pstdev
 
+import numpy as np
+
+from .. import features
 from ..models import Bar, Signal, utc_now
-from .base import Strategy
+from ..series import BarSeries
+from .base import SignalArrays, Strategy
 from .registry import registry
+from .rolling import RollingExtremum, RollingStats, RollingValues
 
 
 def _closes(history: list[Bar]) -> list[float]:
@@ -29,19 +34,69 @@ def _atr(history: list[Bar], lookback: int) -> float:
     return mean(trs) if trs else 0.0
 
 
+def _prior(values: np.ndarray) -> np.ndarray:
+    """``values`` shifted one bar later, so index i holds the value as of bar i - 1."""
+    out = np.full(len(values), np.nan)
+    out[1:] = values[:-1]
+    return out
+
+
+def _warm_mask(length: int, lookback: int) -> np.ndarray:
+    mask = np.zeros(length, dtype=bool)
+    mask[lookback:] = True
+    return mask
+
+
 @registry.register
 class VolatilityMomentum(Strategy):
     name = "volatility_momentum"
     version = "0.1"
 
+    @property
+    def lookback(self) -> int:
+        return int(self.params.get("lookback", 50))
+
+    def reset(self) -> None:
+        self._closes = RollingValues(self.lookback + 1)
+        self._vol = RollingStats(self.lookback - 1)
+        self._prev_close: float | None = None
+
     def generate_signals(self, history: list[Bar]) -> list[Signal]:
-        lookback = int(self.params.get("lookback", 50))
+        lookback = self.lookback
         if len(history) <= lookback:
             return []
         closes = _closes(history)
         ret = closes[-1] / closes[-1 - lookback] - 1.0
         returns = _returns(closes[-lookback:])
         vol = pstdev(returns) if len(returns) > 1 else 0.0
+        return [self._signal(history[-1].symbol, ret, vol)]
+
+    def on_bar(self, bar: Bar) -> list[Signal]:
+        if self._prev_close is not None:
+            self._vol.push(bar.close / self._prev_close - 1.0)
+        self._prev_close = bar.close
+        self._closes.push(bar.close)
+        if len(self._closes) <= self.lookback:
+            return []
+        ret = self._closes.last() / self._closes.first() - 1.0
+        return [self._signal(bar.symbol, ret, self._vol.pstdev())]
+
+    def signal_arrays(self, series: BarSeries) -> SignalArrays:
+        lookback = self.lookback
+        store = features.feature_store
+        closes = series.close
+        ret = np.nan_to_num(store.get(series, "momentum", lookback))
+        vol = np.nan_to_num(store.get(series, "return_std", lookback - 1))
+        ready = _warm_mask(len(closes), lookback)
+        side = np.where(ready, np.sign(ret), 0.0).astype(np.int8)
+        return SignalArrays(
+            symbol=series.symbol,
+            side=side,
+            strength=ret / (vol + 1e-6),
+            meta={"return": ret, "vol": vol},
+        )
+
+    def _signal(self, symbol: str, ret: float, vol: float) -> Signal:
         strength = ret / (vol + 1e-6)
         if ret > 0:
             side = "long"
@@ -49,15 +104,13 @@ class VolatilityMomentum(Strategy):
             side = "short"
         else:
             side = "flat"
-        return [
-            Signal(
-                symbol=history[-1].symbol,
-                side=side,
-                strength=strength,
-                generated_at=utc_now(),
-                meta={"return": ret, "vol": vol},
-            )
-        ]
+        return Signal(
+            symbol=symbol,
+            side=side,
+            strength=strength,
+            generated_at=utc_now(),
+            meta={"return": ret, "vol": vol},
+        )
 
 
 @registry.register
@@ -65,49 +118,125 @@ class MeanReversionZScore(Strategy):
     name = "mean_reversion"
     version = "0.1"
 
+    @property
+    def lookback(self) -> int:
+        return int(self.params.get("lookback", 20))
+
+    def reset(self) -> None:
+        self._window = RollingStats(self.lookback)
+        self._seen = 0
+
     def generate_signals(self, history: list[Bar]) -> list[Signal]:
-        lookback = int(self.params.get("lookback", 20))
-        threshold = float(self.params.get("z_threshold", 1.5))
+        lookback = self.lookback
         if len(history) <= lookback:
             return []
         closes = _closes(history[-lookback:])
         avg = mean(closes)
         std = pstdev(closes) if len(closes) > 1 else 0.0
-        z = (closes[-1] - avg) / (std + 1e-6)
+        return [self._signal(history[-1].symbol, closes[-1], avg, std)]
+
+    def on_bar(self, bar: Bar) -> list[Signal]:
+        self._window.push(bar.close)
+        self._seen += 1
+        if self._seen <= self.lookback:
+            return []
+        return [self._signal(bar.symbol, bar.close, self._window.mean(), self._window.pstdev())]
+
+    def signal_arrays(self, series: BarSeries) -> SignalArrays:
+        lookback = self.lookback
+        threshold = float(self.params.get("z_threshold", 1.5))
+        closes = series.close
+        avg = features.feature_store.get(series, "close_mean", lookback)
+        std = features.feature_store.get(series, "close_std", lookback)
+        ready = _warm_mask(len(closes), lookback)
+        z = np.where(ready, (closes - avg) / (std + 1e-6), 0.0)
+        side = np.where(z > threshold, -1, np.where(z < -threshold, 1, 0))
+        side = np.where(ready, side, 0).astype(np.int8)
+        return SignalArrays(symbol=series.symbol, side=side, strength=np.abs(z), meta={"z": z})
+
+    def _signal(self, symbol: str, close: float, avg: float, std: float) -> Signal:
+        threshold = float(self.params.get("z_threshold", 1.5))
+        z = (close - avg) / (std + 1e-6)
         if z > threshold:
             side = "short"
         elif z < -threshold:
             side = "long"
         else:
             side = "flat"
-        return [
-            Signal(
-                symbol=history[-1].symbol,
-                side=side,
-                strength=abs(z),
-                generated_at=utc_now(),
-                meta={"z": z},
-            )
-        ]
+        return Signal(
+            symbol=symbol,
+            side=side,
+            strength=abs(z),
+            generated_at=utc_now(),
+            meta={"z": z},
+        )
 
 
 @registry.register
 class BreakoutAtrStops(Strategy):
+    """Trades a close beyond the high/low of the ``lookback`` bars before it, with an ATR stop."""
+
     name = "breakout_atr"
-    version = "0.1"
+    version = "0.2"
+
+    @property
+    def lookback(self) -> int:
+        return int(self.params.get("lookback", 20))
+
+    def reset(self) -> None:
+        self._highs = RollingExtremum(self.lookback, largest=True)
+        self._lows = RollingExtremum(self.lookback, largest=False)
+        self._true_ranges = RollingStats(self.lookback)
+        self._prev_close: float | None = None
+        self._seen = 0
 
     def generate_signals(self, history: list[Bar]) -> list[Signal]:
-        lookback = int(self.params.get("lookback", 20))
-        atr_mult = float(self.params.get("atr_mult", 2.0))
+        lookback = self.lookback
         if len(history) <= lookback:
             return []
-        window = history[-lookback:]
-        highs = [bar.high for bar in window]
-        lows = [bar.low for bar in window]
-        latest = history[-1]
-        high_break = max(highs)
-        low_break = min(lows)
-        atr = _atr(history, lookback)
+        window = history[-lookback - 1 : -1]
+        high_break = max(bar.high for bar in window)
+        low_break = min(bar.low for bar in window)
+        return [self._signal(history[-1], high_break, low_break, _atr(history, lookback))]
+
+    def on_bar(self, bar: Bar) -> list[Signal]:
+        ready = self._seen >= self.lookback
+        # Levels come from the previous ``lookback`` bars, read before this bar enters the window.
+        high_break = self._highs.value() if ready else 0.0
+        low_break = self._lows.value() if ready else 0.0
+        self._highs.push(bar.high)
+        self._lows.push(bar.low)
+        if self._prev_close is not None:
+            prev = self._prev_close
+            self._true_ranges.push(max(bar.high - bar.low, abs(bar.high - prev), abs(bar.low - prev)))
+        self._prev_close = bar.close
+        self._seen += 1
+        if not ready:
+            return []
+        atr = self._true_ranges.mean() if len(self._true_ranges) else 0.0
+        return [self._signal(bar, high_break, low_break, atr)]
+
+    def signal_arrays(self, series: BarSeries) -> SignalArrays:
+        lookback = self.lookback
+        atr_mult = float(self.params.get("atr_mult", 2.0))
+        store = features.feature_store
+        closes = series.close
+        high_break = _prior(store.get(series, "rolling_high", lookback))
+        low_break = _prior(store.get(series, "rolling_low", lookback))
+        atr = np.nan_to_num(store.get(series, "atr", lookback))
+        ready = _warm_mask(len(closes), lookback)
+        side = np.where(closes > high_break, 1, np.where(closes < low_break, -1, 0))
+        side = np.where(ready, side, 0).astype(np.int8)
+        stop = np.where(side > 0, closes - atr * atr_mult, np.where(side < 0, closes + atr * atr_mult, np.nan))
+        return SignalArrays(
+            symbol=series.symbol,
+            side=side,
+            strength=atr,
+            meta={"atr": atr, "stop": stop, "high_break": high_break, "low_break": low_break},
+        )
+
+    def _signal(self, latest: Bar, high_break: float, low_break: float, atr: float) -> Signal:
+        atr_mult = float(self.params.get("atr_mult", 2.0))
         stop = None
         if latest.close > high_break:
             side = "long"
@@ -117,12 +246,10 @@ class BreakoutAtrStops(Strategy):
             stop = latest.close + atr * atr_mult
         else:
             side = "flat"
-        return [
-            Signal(
-                symbol=latest.symbol,
-                side=side,
-                strength=atr,
-                generated_at=utc_now(),
-                meta={"atr": atr, "stop": stop, "high_break": high_break, "low_break": low_break},
-            )
-        ]
+        return Signal(
+            symbol=latest.symbol,
+            side=side,
+            strength=atr,
+            generated_at=utc_now(),
+            meta={"atr": atr, "stop": stop, "high_break": high_break, "low_break": low_break},
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Callable, Type
+from dataclasses import dataclass, field
+from typing import Any, Type
 
 from .base import Strategy
 
@@ -23,3 +24,14 @@ class StrategyRegistry:
 
 
 registry = StrategyRegistry()
+
+
+@dataclass
+class StrategyFactory:
+    """Picklable ``**params -> Strategy`` callable, usable from process-pool workers."""
+
+    name: str
+    defaults: dict[str, Any] = field(default_factory=dict)
+
+    def __call__(self, **params: Any) -> Strategy:
+        return registry.create(self.name, **{**self.defaults, **params})
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+
+import numpy as np
+
+
+class RollingStats:
+    """Fixed-size window with running mean / population std in O(1) per push.
+
+    Sums are kept relative to a shift value to avoid cancellation on price
+    levels, and are recomputed from the window once per full turnover so float
+    drift stays bounded on long series.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size = max(0, int(size))
+        self._values: deque[float] = deque()
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def full(self) -> bool:
+        return len(self._values) >= self._size
+
+    def push(self, value: float) -> None:
+        if self._size == 0:
+            return
+        if not self._values:
+            self._shift = value
+        self._values.append(value)
+        delta = value - self._shift
+        self._sum += delta
+        self._sumsq += delta * delta
+        if len(self._values) > self._size:
+            old = self._values.popleft() - self._shift
+            self._sum -= old
+            self._sumsq -= old * old
+            self._evictions += 1
+            if self._evictions >= self._size:
+                self._resync()
+
+    def _resync(self) -> None:
+        self._evictions = 0
+        self._shift = self._values[-1]
+        self._sum = 0.0
+        self._sumsq = 0.0
+        for value in self._values:
+            delta = value - self._shift
+            self._sum += delta
+            self._sumsq += delta * delta
+
+    def mean(self) -> float:
+        if not self._values:
+            return 0.0
+        return self._shift + self._sum / len(self._values)
+
+    def pstdev(self) -> float:
+        count = len(self._values)
+        if count < 2:
+            return 0.0
+        avg = self._sum / count
+        var = self._sumsq / count - avg * avg
+        return math.sqrt(var) if var > 0 else 0.0
+
+
+class RollingExtremum:
+    """Rolling max (or min) over the last ``size`` values via a monotonic deque."""
+
+    def __init__(self, size: int, largest: bool = True) -> None:
+        self._size = max(1, int(size))
+        self._largest = largest
+        self._items: deque[tuple[int, float]] = deque()
+        self._index = 0
+
+    def push(self, value: float) -> None:
+        items = self._items
+        if self._largest:
+            while items and items[-1][1] <= value:
+                items.pop()
+        else:
+            while items and items[-1][1] >= value:
+                items.pop()
+        items.append((self._index, value))
+        self._index += 1
+        if items[0][0] <= self._index - 1 - self._size:
+            items.popleft()
+
+    def value(self) -> float:
+        if not self._items:
+            return 0.0
+        return self._items[0][1]
+
+
+class RollingValues:
+    """Bounded history of the last ``size`` raw values."""
+
+    def __init__(self, size: int) -> None:
+        self._values: deque[float] = deque(maxlen=max(1, int(size)))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def push(self, value: float) -> None:
+        self._values.append(value)
+
+    def first(self) -> float:
+        return self._values[0]
+
+    def last(self) -> float:
+        return self._values[-1]
+
+
+_CHUNK_ROWS = 1 << 16
+
+
+def _rolling_moments(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """Trailing-window mean and population std in O(n) via chunked prefix sums.
+
+    Each chunk is re-anchored on its first value before summing, which keeps
+    cancellation error bounded on long price series. Leading NaNs (e.g. the
+    first return) are skipped; interior NaNs are not supported.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    mean = np.full(values.shape[0], np.nan)
+    std = np.full(values.shape[0], np.nan)
+    if window <= 0:
+        return mean, std
+    first = int(np.argmax(~np.isnan(values))) if values.size else 0
+    for start in range(first, values.shape[0] - window + 1, _CHUNK_ROWS):
+        seg = values[start : start + _CHUNK_ROWS + window - 1]
+        delta = seg - seg[0]
+        sums = np.concatenate(([0.0], np.cumsum(delta)))
+        squares = np.concatenate(([0.0], np.cumsum(delta * delta)))
+        avg = (sums[window:] - sums[:-window]) / window
+        var = (squares[window:] - squares[:-window]) / window - avg * avg
+        lo = start + window - 1
+        mean[lo : lo + avg.shape[0]] = seg[0] + avg
+        std[lo : lo + avg.shape[0]] = np.sqrt(np.maximum(var, 0.0))
+    return mean, std
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_moments(values, window)[0]
+
+
+def rolling_pstdev(values: np.ndarray, window: int) -> np.ndarray:
+    if window < 2:
+        return np.zeros(np.asarray(values).shape[0])
+    return _rolling_moments(values, window)[1]
+
+
+def _rolling_extreme(values: np.ndarray, window: int, ufunc: np.ufunc, fill: float) -> np.ndarray:
+    """Van Herk/Gil-Werman rolling max/min: block prefix and suffix scans, O(n) total."""
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if window <= 0 or n < window:
+        return out
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, fill)
+    padded[:n] = values
+    grid = padded.reshape(blocks, window)
+    prefix = ufunc.accumulate(grid, axis=1).ravel()
+    suffix = ufunc.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+    out[window - 1 :] = ufunc(suffix[: n - window + 1], prefix[window - 1 : n])
+    return out
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_extreme(values, window, np.maximum, -np.inf)
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_extreme(values, window, np.minimum, np.inf)
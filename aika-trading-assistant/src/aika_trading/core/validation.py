@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Sequence
+
+import numpy as np
 
 from .models import Bar
+from .series import BarSeries
 
 
-def ensure_time_ordered(bars: list[Bar]) -> None:
-    if not bars:
+def ensure_time_ordered(bars: Sequence[Bar] | BarSeries) -> None:
+    if not len(bars):
+        return
+    if isinstance(bars, BarSeries):
+        if bool(np.any(np.diff(bars.ts) < 0)):
+            raise ValueError("bars_not_time_ordered")
         return
     last_ts: datetime | None = None
     for bar in bars:
@@ -15,8 +23,9 @@ def ensure_time_ordered(bars: list[Bar]) -> None:
         last_ts = bar.ts
 
 
-def ensure_timezone_consistent(bars: list[Bar]) -> None:
-    if not bars:
+def ensure_timezone_consistent(bars: Sequence[Bar] | BarSeries) -> None:
+    # A BarSeries carries a single tz for every row, so there is nothing to check.
+    if not len(bars) or isinstance(bars, BarSeries):
         return
     tzinfo = bars[0].ts.tzinfo
     for bar in bars:
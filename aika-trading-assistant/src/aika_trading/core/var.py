@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Mapping, Sequence
+
+import numpy as np
+
+VAR_METHODS = ("historical", "parametric")
+
+
+class RollingCovariance:
+    """Rolling window of per-bar returns for a growing set of symbols.
+
+    Backs both the VaR/CVaR check and the correlation cap in ``RiskEngine``.
+
+    Returns sit in a ring buffer (``window`` rows, one column per symbol), next
+    to running column sums and the cross-product matrix, so each ``update`` is
+    O(n_symbols^2) and the covariance never has to be recomputed from the
+    window. The running sums are rebuilt from the buffer once per ``window``
+    updates so rounding cannot drift. Symbols missing from an update get a 0
+    return for that bar.
+    """
+
+    def __init__(self, window: int = 250) -> None:
+        if window < 2:
+            raise ValueError("window_too_small")
+        self.window = window
+        self._index: dict[str, int] = {}
+        self._buffer = np.zeros((window, 0))
+        self._sums = np.zeros(0)
+        self._cross = np.zeros((0, 0))
+        self._scratch = np.zeros((0, 0))
+        self._row = 0
+        self.count = 0
+        self._since_rebuild = 0
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._index)
+
+    def _columns(self, symbols: Sequence[str]) -> np.ndarray:
+        missing = [symbol for symbol in symbols if symbol not in self._index]
+        if missing:
+            self._grow(missing)
+        return np.fromiter((self._index[symbol] for symbol in symbols), dtype=np.intp, count=len(symbols))
+
+    def _grow(self, symbols: Sequence[str]) -> None:
+        size = len(self._index)
+        for symbol in symbols:
+            self._index[symbol] = len(self._index)
+        extra = len(self._index) - size
+        self._buffer = np.hstack((self._buffer, np.zeros((self.window, extra))))
+        self._sums = np.concatenate((self._sums, np.zeros(extra)))
+        cross = np.zeros((len(self._index), len(self._index)))
+        cross[:size, :size] = self._cross
+        self._cross = cross
+        self._scratch = np.empty_like(cross)
+
+    def weights(self, exposures: Mapping[str, float]) -> np.ndarray:
+        """``exposures`` as a vector over the model's columns (symbols it has not seen are dropped)."""
+        index = self._index
+        out = np.zeros(len(index))
+        for symbol, value in exposures.items():
+            column = index.get(symbol)
+            if column is not None:
+                out[column] += value
+        return out
+
+    def portfolio_moments(self, weights: np.ndarray) -> tuple[float, float]:
+        """Mean and variance of ``weights @ returns`` straight from the running sums: O(n^2), no copies."""
+        if not self.count:
+            return 0.0, 0.0
+        mean = float(weights @ self._sums) / self.count
+        second = float(weights @ (self._cross @ weights)) / self.count
+        return mean, max(second - mean * mean, 0.0)
+
+    def portfolio_returns(self, weights: np.ndarray) -> np.ndarray:
+        """Window returns of a book holding ``weights`` (one value per bar in the window)."""
+        return self._buffer[: self.count] @ weights
+
+    def update(self, returns: Mapping[str, float]) -> None:
+        columns = self._columns(list(returns))
+        row = np.zeros(len(self._index))
+        row[columns] = np.nan_to_num(np.fromiter(returns.values(), dtype=np.float64, count=len(returns)))
+        self._push(row)
+
+    def update_many(self, symbols: Sequence[str], returns: np.ndarray) -> None:
+        """Push several bars at once; ``returns`` is (bars x len(symbols))."""
+        columns = self._columns(symbols)
+        rows = np.zeros((len(returns), len(self._index)))
+        rows[:, columns] = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+        for row in rows:
+            self._push(row)
+
+    def _push(self, row: np.ndarray) -> None:
+        old = self._buffer[self._row].copy()
+        self._buffer[self._row] = row
+        self._row = (self._row + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.window:
+            filled = self._buffer[: self.count]
+            self._sums = filled.sum(axis=0)
+            self._cross = filled.T @ filled
+            self._since_rebuild = 0
+            return
+        self._sums += row - old
+        scratch = self._scratch
+        np.multiply(row[:, None], row[None, :], out=scratch)
+        self._cross += scratch
+        np.multiply(old[:, None], old[None, :], out=scratch)
+        self._cross -= scratch
+
+    def _variances(self, columns: np.ndarray) -> np.ndarray:
+        mean = self._sums[columns] / self.count
+        return np.maximum(self._cross[columns, columns] / self.count - mean * mean, 0.0)
+
+    def correlations_with(self, symbol: str, others: Sequence[str]) -> np.ndarray:
+        """Correlation of ``symbol`` with each of ``others``: one O(k) slice of the running sums.
+
+        Unknown symbols, flat series and an empty window give 0.
+        """
+        out = np.zeros(len(others))
+        column = self._index.get(symbol)
+        if column is None or not self.count:
+            return out
+        known = [(pos, self._index[other]) for pos, other in enumerate(others) if other in self._index]
+        if not known:
+            return out
+        positions, columns = (np.array(values, dtype=np.intp) for values in zip(*known))
+        n = self.count
+        mean = self._sums[column] / n
+        cov = self._cross[column, columns] / n - mean * self._sums[columns] / n
+        scale = np.sqrt(self._variances(np.array([column]))[0] * self._variances(columns))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[positions] = np.where(scale > 0, cov / scale, 0.0)
+        return np.clip(out, -1.0, 1.0)
+
+    def correlation_matrix(self, symbols: Sequence[str] | None = None) -> np.ndarray:
+        """Correlation matrix of ``symbols`` (default: every symbol seen), for sizing and dashboards."""
+        symbols = self.symbols if symbols is None else list(symbols)
+        mean, cov = self.moments(symbols)
+        scale = np.sqrt(np.outer(np.diag(cov), np.diag(cov)))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.where(scale > 0, cov / scale, 0.0)
+        np.fill_diagonal(corr, 1.0)
+        return np.clip(corr, -1.0, 1.0)
+
+    def returns_matrix(self, symbols: Sequence[str]) -> np.ndarray:
+        """Window returns for ``symbols`` (unknown ones are 0), rows in buffer order."""
+        out = np.zeros((self.count, len(symbols)))
+        known = [(pos, self._index[symbol]) for pos, symbol in enumerate(symbols) if symbol in self._index]
+        if known:
+            positions, columns = zip(*known)
+            out[:, list(positions)] = self._buffer[: self.count][:, list(columns)]
+        return out
+
+    def moments(self, symbols: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Mean vector and (population) covariance matrix of ``symbols`` over the window."""
+        size = len(symbols)
+        mean = np.zeros(size)
+        cov = np.zeros((size, size))
+        if not self.count:
+            return mean, cov
+        known = [(pos, self._index[symbol]) for pos, symbol in enumerate(symbols) if symbol in self._index]
+        if known:
+            positions, columns = (list(values) for values in zip(*known))
+            sub_mean = self._sums[columns] / self.count
+            mean[positions] = sub_mean
+            cov[np.ix_(positions, positions)] = (
+                self._cross[np.ix_(columns, columns)] / self.count - np.outer(sub_mean, sub_mean)
+            )
+        return mean, cov
+
+
+@dataclass(frozen=True)
+class VaRResult:
+    """Loss estimates in currency units (positive = loss) at ``confidence``."""
+
+    method: str
+    confidence: float
+    var: float
+    cvar: float
+    observations: int
+
+
+def portfolio_var(
+    model: RollingCovariance,
+    exposures: Mapping[str, float],
+    confidence: float = 0.99,
+    method: str = "historical",
+) -> VaRResult:
+    """One-bar VaR/CVaR of signed dollar ``exposures`` from the model's return window.
+
+    ``historical`` replays the window's returns on today's exposures;
+    ``parametric`` uses the Gaussian approximation from the running mean and
+    covariance. Symbols the model has no returns for carry no risk.
+    """
+    if method not in VAR_METHODS:
+        raise ValueError(f"unknown_var_method:{method}")
+    weights = model.weights(exposures)
+    if not model.count or not weights.any():
+        return VaRResult(method, confidence, 0.0, 0.0, model.count)
+    if method == "historical":
+        pnl = model.portfolio_returns(weights)
+        cutoff = np.quantile(pnl, 1.0 - confidence)
+        tail = pnl[pnl <= cutoff]
+        var = max(0.0, -float(cutoff))
+        cvar = max(var, -float(tail.mean())) if tail.size else var
+        return VaRResult(method, confidence, var, cvar, model.count)
+    mu, variance = model.portfolio_moments(weights)
+    sigma = math.sqrt(variance)
+    z = NormalDist().inv_cdf(confidence)
+    var = max(0.0, z * sigma - mu)
+    cvar = max(var, sigma * NormalDist().pdf(z) / (1.0 - confidence) - mu)
+    return VaRResult(method, confidence, var, cvar, model.count)
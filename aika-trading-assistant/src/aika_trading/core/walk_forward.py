@@ -1,45 +1,188 @@
 from __future__ import annotations
 
-from typing import Any, Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable
 from pathlib import Path
 import json
 
-from .backtest import run_backtest
+import numpy as np
+
+from .artifacts import read_artifact, write_artifact
+from .backtest import _GRID_WORKER, _init_grid_worker, run_backtest, run_grid_search
+from .cache import BacktestCache
 from .models import Bar
+from .series import BarSeries, SharedBarSeries, as_series
 from .strategy.base import Strategy
 
 
+def _window_starts(n_bars: int, train_window: int, test_window: int, step: int) -> list[int]:
+    return list(range(0, n_bars - train_window - test_window + 1, step))
+
+
+def _run_window(
+    bars: list[Bar] | BarSeries,
+    strategy_factory: Callable[..., Strategy],
+    start: int,
+    train_window: int,
+    test_window: int,
+    param_grid: dict[str, Iterable[Any]] | None,
+    objective: str,
+    cache: BacktestCache | None,
+) -> dict[str, Any]:
+    train_slice = bars[start : start + train_window]
+    test_end = start + train_window + test_window
+    best_params: dict[str, Any] = {}
+    train_metrics: dict[str, Any] | None = None
+    if param_grid:
+        search = run_grid_search(strategy_factory, train_slice, param_grid, objective=objective, cache=cache)
+        if search["best"]:
+            best_params = search["best"]["params"]
+            train_metrics = search["best"]["metrics"]
+    # The train bars are replayed as warm-up so the test window trades from its first bar
+    # with indicator state carried over, instead of re-warming inside the test slice.
+    result = run_backtest(strategy_factory(**best_params), bars[start:test_end], cache=cache, warmup=train_window)
+    return {
+        "train_start": train_slice[0].ts.isoformat(),
+        "train_end": train_slice[-1].ts.isoformat(),
+        "test_start": bars[start + train_window].ts.isoformat(),
+        "test_end": bars[test_end - 1].ts.isoformat(),
+        "best_params": best_params,
+        "train_metrics": train_metrics,
+        "metrics": result.metrics,
+        "equity_curve": result.equity_curve,
+    }
+
+
+def _walk_forward_task(
+    start: int,
+    train_window: int,
+    test_window: int,
+    param_grid: dict[str, Iterable[Any]] | None,
+    objective: str,
+) -> dict[str, Any]:
+    return _run_window(
+        _GRID_WORKER["series"],
+        _GRID_WORKER["factory"],
+        start,
+        train_window,
+        test_window,
+        param_grid,
+        objective,
+        _GRID_WORKER["cache"],
+    )
+
+
 def walk_forward(
-    bars: list[Bar],
-    strategy_factory: Callable[[], Strategy],
+    bars: list[Bar] | BarSeries,
+    strategy_factory: Callable[..., Strategy],
     train_window: int,
     test_window: int,
     step: int | None = None,
+    param_grid: dict[str, Iterable[Any]] | None = None,
+    objective: str = "sharpe",
+    executor: str = "serial",
+    max_workers: int | None = None,
+    cache: BacktestCache | None = None,
 ) -> list[dict[str, Any]]:
+    """Rolling train/test evaluation.
+
+    With ``param_grid`` each train window is grid-searched on ``objective`` and
+    the winner is tested out of sample on the following ``test_window`` bars;
+    without it ``strategy_factory()`` is tested as-is. ``executor="process"``
+    runs windows on a process pool over shared-memory bars, which needs a
+    picklable factory (e.g. ``StrategyFactory``).
+    """
     results: list[dict[str, Any]] = []
-    if not bars:
+    if not len(bars):
         return results
+    if executor not in ("serial", "process"):
+        raise ValueError(f"unknown_executor:{executor}")
     step = step or test_window
-    for start in range(0, len(bars) - train_window - test_window + 1, step):
-        train_slice = bars[start : start + train_window]
-        test_slice = bars[start + train_window : start + train_window + test_window]
-        strategy = strategy_factory()
-        result = run_backtest(strategy, test_slice)
+    starts = _window_starts(len(bars), train_window, test_window, step)
+    if executor == "process" and len(starts) > 1:
+        cache_spec = (cache.path, cache.max_bytes) if cache else None
+        with SharedBarSeries(as_series(bars)) as shared:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_grid_worker,
+                initargs=(shared.spec, strategy_factory, cache_spec),
+            ) as pool:
+                futures = [
+                    pool.submit(_walk_forward_task, start, train_window, test_window, param_grid, objective)
+                    for start in starts
+                ]
+                return [future.result() for future in futures]
+    for start in starts:
         results.append(
-            {
-                "train_start": train_slice[0].ts.isoformat(),
-                "train_end": train_slice[-1].ts.isoformat(),
-                "test_start": test_slice[0].ts.isoformat(),
-                "test_end": test_slice[-1].ts.isoformat(),
-                "metrics": result.metrics,
-                "equity_curve": result.equity_curve,
-            }
+            _run_window(bars, strategy_factory, start, train_window, test_window, param_grid, objective, cache)
         )
     return results
 
 
+def stitch_equity_curves(
+    results: list[dict[str, Any]],
+    step: int | None = None,
+    initial_cash: float = 100_000.0,
+) -> list[float]:
+    """Chain the out-of-sample equity curves into one compounded curve.
+
+    Each window starts from ``initial_cash``, so it is rescaled to where the
+    previous one ended. When windows overlap (``step`` shorter than the test
+    window) only the first ``step`` bars of each window are used.
+    """
+    stitched: list[float] = []
+    for idx, item in enumerate(results):
+        curve = item.get("equity_curve") or []
+        if step and idx < len(results) - 1:
+            curve = curve[:step]
+        scale = stitched[-1] / initial_cash if stitched else 1.0
+        stitched.extend(value * scale for value in curve)
+    return stitched
+
+
+WALK_FORWARD_ARTIFACT = "walk_forward.cols"
+
+
 def save_walk_forward_artifacts(base_dir: str, run_id: str, results: list[dict[str, Any]], config: dict) -> None:
+    """Write the windows, their test equity curves and the stitched curve to ``walk_forward.cols``."""
     run_dir = Path(base_dir) / run_id
     run_dir.mkdir(parents=True, exist_ok=True)
     (run_dir / "config.json").write_text(json.dumps(config, indent=2), encoding="utf-8")
-    (run_dir / "walk_forward.json").write_text(json.dumps(results, indent=2), encoding="utf-8")
+    curves = [np.asarray(item.get("equity_curve") or [], dtype=np.float64) for item in results]
+    stitched = stitch_equity_curves(results, config.get("step"), config.get("initial_cash", 100_000.0))
+    write_artifact(
+        run_dir / WALK_FORWARD_ARTIFACT,
+        {
+            "windows": [{key: value for key, value in item.items() if key != "equity_curve"} for item in results],
+            "curves": {
+                "window": np.repeat(np.arange(len(curves)), [len(curve) for curve in curves]),
+                "equity": np.concatenate(curves) if curves else np.zeros(0),
+            },
+            "oos": {"equity_curve": np.asarray(stitched, dtype=np.float64)},
+        },
+    )
+
+
+def load_walk_forward_artifacts(base_dir: str, run_id: str) -> dict[str, Any] | None:
+    """``{"windows", "best_params", "oos_equity_curve"}`` as saved (older runs: ``walk_forward.json``)."""
+    run_dir = Path(base_dir) / run_id
+    path = run_dir / WALK_FORWARD_ARTIFACT
+    if not path.exists():
+        try:
+            payload = json.loads((run_dir / "walk_forward.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return {"windows": payload} if isinstance(payload, list) else payload
+    with read_artifact(path) as artifact:
+        windows = artifact.records("windows")
+        owner = artifact.column("curves", "window")
+        equity = artifact.column("curves", "equity")
+        oos = artifact.column_list("oos", "equity_curve")
+    bounds = np.cumsum(np.bincount(owner, minlength=len(windows)))[:-1] if windows else []
+    for window, curve in zip(windows, np.split(equity, bounds)):
+        window["equity_curve"] = curve.tolist()
+    return {
+        "windows": windows,
+        "best_params": [window.get("best_params", {}) for window in windows],
+        "oos_equity_curve": oos,
+    }
@@ -0,0 +1,60 @@
+import json
+
+import numpy as np
+import pytest
+
+from aika_trading.core.artifacts import read_artifact, write_artifact
+from aika_trading.core.backtest import (
+    load_backtest_artifacts,
+    load_grid_artifacts,
+    run_backtest,
+    run_grid_search,
+    save_backtest_artifacts,
+)
+from aika_trading.core.data import SyntheticDataProvider
+from aika_trading.core.strategy import StrategyFactory, registry
+
+
+def test_columnar_artifact_round_trips_typed_columns(tmp_path):
+    records = [
+        {
+            "id": idx,
+            "price": idx * 0.5 if idx % 3 else None,
+            "side": "buy" if idx % 2 else "sell",
+            "order_id": f"order-{idx}",
+            "maker": bool(idx % 2),
+            "assumptions": {"fee_bps": 1.0},
+            **({"bracket": idx} if idx % 5 == 0 else {}),
+        }
+        for idx in range(40)
+    ]
+    curve = np.cumsum(np.random.default_rng(4).normal(size=1_000)) + 1_000.0
+    path = tmp_path / "run.cols"
+    write_artifact(path, {"trades": records, "equity": {"curve": curve}}, meta={"objective": "sharpe"})
+
+    with read_artifact(path) as artifact:
+        assert artifact.meta == {"objective": "sharpe"}
+        assert artifact.records("trades") == records
+        assert artifact.column("trades", "price").dtype == np.float64
+        assert artifact.column("equity", "curve").tolist() == curve.tolist()
+        view = artifact.to_dict()
+        with pytest.raises(KeyError):
+            artifact.column("trades", "missing")
+    assert view["equity"] == {"curve": curve.tolist()} and view["trades"] == records
+    with pytest.raises(ValueError):
+        write_artifact(tmp_path / "bad.cols", {"t": {"a": [1, 2], "b": [1]}})
+
+
+def test_backtest_and_grid_artifacts_are_compact_and_typed(tmp_path):
+    bars = SyntheticDataProvider(seed=2, points=5_000).get_bars("TEST", "1h")
+    result = run_backtest(registry.create("mean_reversion", lookback=20), bars)
+    save_backtest_artifacts(str(tmp_path), "bt", result, {"strategy": "mean_reversion"})
+    loaded = load_backtest_artifacts(str(tmp_path), "bt")
+    assert loaded["equity_curve"] == result.equity_curve
+    assert loaded["trades"] == result.trades and result.trades
+    legacy_size = len(json.dumps(result.equity_curve, indent=2)) + len(json.dumps(result.trades))
+    assert (tmp_path / "bt" / "backtest.cols").stat().st_size * 10 < legacy_size
+
+    grid = run_grid_search(StrategyFactory("mean_reversion"), bars[:400], {"lookback": [10, 20]}, base_dir=str(tmp_path))
+    assert load_grid_artifacts(str(tmp_path), grid["run_id"]) == json.loads(json.dumps(grid))
+    assert load_grid_artifacts(str(tmp_path), "missing") is None
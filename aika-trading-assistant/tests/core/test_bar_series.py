@@ -0,0 +1,28 @@
+import numpy as np
+
+from aika_trading.core.data import SyntheticDataProvider
+from aika_trading.core.series import BarSeries
+from aika_trading.core.strategy import registry
+from aika_trading.core.backtest import run_backtest
+from aika_trading.core.regime import compute_regime_labels
+
+
+def test_bar_series_roundtrip_and_views():
+    bars = SyntheticDataProvider(seed=5, points=150).get_bars("TEST", "1h")
+    series = BarSeries.from_bars(bars)
+    assert len(series) == len(bars)
+    assert series.to_bars() == bars
+    assert series[-1] == bars[-1]
+    window = series[10:50]
+    assert len(window) == 40
+    assert np.shares_memory(window.close, series.close)
+    assert window[0] == bars[10]
+
+
+def test_backtest_accepts_bar_series():
+    bars = SyntheticDataProvider(seed=9, points=160).get_bars("TEST", "1h")
+    series = BarSeries.from_bars(bars)
+    from_list = run_backtest(registry.create("breakout_atr", lookback=15), bars)
+    from_series = run_backtest(registry.create("breakout_atr", lookback=15), series)
+    assert from_series.equity_curve == from_list.equity_curve
+    assert compute_regime_labels(series) == compute_regime_labels(bars)
@@ -0,0 +1,25 @@
+import copy
+
+from aika_trading.core.bench import compare_benchmarks, run_benchmarks, synthetic_series
+
+
+def test_synthetic_series_is_valid():
+    series = synthetic_series(500, seed=1)
+    assert len(series) == 500
+    assert (series.high >= series.close).all() and (series.low <= series.close).all()
+
+
+def test_benchmarks_report_and_compare():
+    payload = run_benchmarks([300], ["run_backtest", "compute_regime_labels", "metrics"])
+    assert [item["phase"] for item in payload["results"]] == ["run_backtest", "compute_regime_labels", "metrics"]
+    for item in payload["results"]:
+        assert item["bars"] == 300
+        assert item["bars_per_sec"] > 0
+        assert item["peak_bytes"] > 0
+    assert compare_benchmarks(payload, payload, max_regression_pct=0.0, max_memory_regression_pct=0.0) == []
+
+    slower = copy.deepcopy(payload)
+    slower["results"][0]["seconds"] = payload["results"][0]["seconds"] * 2
+    regressions = compare_benchmarks(slower, payload, max_regression_pct=50.0)
+    assert [(r["phase"], r["field"]) for r in regressions] == [("run_backtest", "seconds")]
+    assert regressions[0]["change_pct"] > 50.0
@@ -13,3 +13,33 @@ def test_paper_broker_updates_positions():
     assert len(positions) == 1
     assert positions[0]["symbol"] == "TEST"
     assert fill.price == 10.0
+
+
+def test_paper_broker_aggregates_track_marks_and_losses():
+    simulator = ExecutionSimulator(ExecutionConfig(fee_bps=0.0, slippage_bps=0.0, spread_bps=0.0, latency_ms=0))
+    broker = PaperBroker(simulator, initial_cash=1000.0)
+    broker.place_order(OrderRequest(symbol="A", side="buy", quantity=10.0, order_type="market", market_price=20.0))
+    broker.place_order(OrderRequest(symbol="B", side="sell", quantity=5.0, order_type="market", market_price=10.0))
+
+    broker.mark_prices({"A": 25.0, "B": 12.0, "C": 1.0})
+    state = broker.snapshot()
+    positions = broker.get_positions()
+    assert state.net_exposure == sum(pos["market_value"] for pos in positions) == 190.0
+    assert state.gross_exposure == sum(abs(pos["market_value"]) for pos in positions) == 310.0
+    assert state.equity == broker.get_account()["equity"] == 1040.0
+    assert state.peak_equity == 1040.0
+
+    broker.mark_price("A", 15.0)
+    state = broker.snapshot()
+    assert state.equity == 940.0
+    assert abs(state.drawdown - 100.0 / 1040.0) < 1e-12
+
+    broker.place_order(OrderRequest(symbol="A", side="sell", quantity=4.0, order_type="market", market_price=15.0))
+    broker.place_order(OrderRequest(symbol="B", side="buy", quantity=5.0, order_type="market", market_price=12.0))
+    assert broker.snapshot().loss_streak == 2
+    broker.place_order(OrderRequest(symbol="A", side="sell", quantity=6.0, order_type="market", market_price=30.0))
+    state = broker.snapshot()
+    assert state.loss_streak == 0
+    assert state.positions == {}
+    assert state.net_exposure == state.gross_exposure == 0.0
+    assert state.equity == state.cash
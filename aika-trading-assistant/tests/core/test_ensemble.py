@@ -0,0 +1,70 @@
+import numpy as np
+
+from aika_trading.core.ensemble import EnsembleEngine, OnlineWeights
+from aika_trading.core.models import Signal, utc_now
+
+
+def _signal(symbol: str, direction: int) -> Signal:
+    side = "long" if direction > 0 else "short" if direction < 0 else "flat"
+    return Signal(symbol=symbol, side=side, strength=1.0, generated_at=utc_now())
+
+
+def test_combine_matrix_matches_per_symbol_combine():
+    rng = np.random.default_rng(3)
+    names = [f"s{i}" for i in range(6)]
+    symbols = [f"SYM{i}" for i in range(40)]
+    directions = rng.integers(-1, 2, size=(len(names), len(symbols)))
+    weights = rng.uniform(-0.2, 1.2, size=len(names))
+    engine = EnsembleEngine()
+
+    combined = engine.combine_matrix(directions, weights, symbols, threshold=0.3)
+
+    for col, symbol in enumerate(symbols):
+        expected = engine.combine(
+            {name: _signal(symbol, int(directions[row, col])) for row, name in enumerate(names)},
+            dict(zip(names, weights.tolist())),
+            symbol,
+            threshold=0.3,
+        )
+        got = combined.signal_for(col)
+        assert got.side == expected.side
+        assert np.isclose(got.meta["score"], expected.meta["score"])
+
+
+def test_online_weights_update_and_persist(tmp_path):
+    path = str(tmp_path / "weights.json")
+    weights = OnlineWeights(["a", "b"], decay=0.5)
+    weights.update(np.array([0.02, -0.01]))
+    assert weights.as_dict() == {"a": 1.0, "b": 0.0}
+    weights.save(path)
+
+    restored = OnlineWeights.load(path, ["a", "b", "c"], decay=0.5)
+    assert restored.updates == 1
+    assert np.isclose(restored.performance[0], 0.01)
+    assert np.isclose(restored.weights.sum(), 1.0)
+    assert restored.weights[2] > 0
+
+    hedge = OnlineWeights(["a", "b"], method="multiplicative", learning_rate=10.0)
+    for _ in range(5):
+        hedge.update(np.array([0.05, -0.05]))
+    assert hedge.weights[0] > 0.9
+    assert OnlineWeights.load(path, ["a", "b"], method="multiplicative").updates == 0
+    for method in ("exp_decay", "multiplicative"):
+        assert OnlineWeights([], method=method).update(np.zeros(0)).size == 0
+
+
+def test_online_weights_skip_repeated_stamp(tmp_path):
+    path = str(tmp_path / "weights.json")
+    hedge = OnlineWeights(["a", "b"], method="multiplicative", learning_rate=10.0)
+    hedge.update(np.array([0.05, -0.05]), stamp="2024-01-01T00:00:00")
+    once = hedge.weights.copy()
+    hedge.save(path)
+
+    restored = OnlineWeights.load(path, ["a", "b"], method="multiplicative", learning_rate=10.0)
+    assert restored.last_stamp == "2024-01-01T00:00:00"
+    restored.update(np.array([0.05, -0.05]), stamp="2024-01-01T00:00:00")
+    assert restored.updates == 1
+    assert np.allclose(restored.weights, once)
+    restored.update(np.array([0.05, -0.05]), stamp="2024-01-01T01:00:00")
+    assert restored.updates == 2
+    assert restored.weights[0] > once[0]
@@ -12,3 +12,26 @@ def test_execution_models_apply_costs():
     fill, _log = simulator.simulate_fill(order, market_price=100.0)
     assert fill.price > 100.0
     assert math.isclose(fill.fee, fill.price * 0.001, rel_tol=1e-6)
+
+
+def test_simulate_fills_matches_single_order_path():
+    config = ExecutionConfig(fee_bps=7.0, slippage_bps=3.0, spread_bps=12.0, latency_ms=5, min_volume=100.0, max_adv_pct=0.1)
+    simulator = ExecutionSimulator(config)
+    orders = [
+        OrderRequest(symbol=f"S{i}", side="buy" if i % 2 else "sell", quantity=1.0 + i, order_type="market", client_order_id=f"o{i}")
+        for i in range(6)
+    ]
+    prices = [100.0 + 3 * i for i in range(6)]
+    volumes = [1_000.0, 50.0, 1_000.0, 20.0, float("nan"), 1_000.0]
+
+    batch = simulator.simulate_fills(orders, prices, volumes)
+
+    assert batch.filled.tolist() == [True, False, True, False, True, True]
+    assert batch._fills == {}
+    fills = batch.to_fills()
+    assert [fill.order_id for fill in fills] == ["o0", "o2", "o4", "o5"]
+    for fill in fills:
+        idx = int(fill.order_id[1:])
+        volume = None if math.isnan(volumes[idx]) else volumes[idx]
+        expected, _log = simulator.simulate_fill(orders[idx], prices[idx], volume, timestamp=batch.filled_at)
+        assert fill.to_dict() == expected.to_dict()
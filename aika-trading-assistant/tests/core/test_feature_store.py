@@ -0,0 +1,53 @@
+import gc
+import weakref
+
+import pytest
+
+from aika_trading.core.data import SyntheticDataProvider
+from aika_trading.core.strategy import StrategyFactory
+from aika_trading.core.backtest import run_grid_search
+from aika_trading.core.features import FeatureStore, feature_store
+from aika_trading.core.series import BarSeries
+
+
+def test_feature_store_shares_and_evicts():
+    series = BarSeries.from_bars(SyntheticDataProvider(seed=2, points=300).get_bars("TEST", "1h"))
+    store = FeatureStore(max_bytes=3 * 300 * 8)
+    first = store.get(series, "atr", 14)
+    assert store.get(series, "atr", 14) is first
+    assert (store.hits, store.misses) == (1, 1)
+    assert not first.flags.writeable
+    for window in (5, 10, 20):
+        store.get(series, "close_std", window)
+    assert store.stats()["entries"] == 3
+    store.get(series, "atr", 14)
+    assert store.misses == 5
+    with pytest.raises(KeyError):
+        store.get(series, "nope", 3)
+
+
+def test_vectorized_grid_reuses_features():
+    bars = SyntheticDataProvider(seed=7, points=300).get_bars("TEST", "1h")
+    grid = {"lookback": [10, 20], "z_threshold": [1.0, 1.5, 2.0]}
+    event = run_grid_search(StrategyFactory("mean_reversion"), bars, grid)
+    feature_store.clear()
+    misses = feature_store.misses
+    vectorized = run_grid_search(StrategyFactory("mean_reversion"), bars, grid, engine="vectorized")
+    # Two lookbacks x (mean, std) are computed once and shared by all six combos.
+    assert feature_store.misses - misses == 4
+    for fast, slow in zip(vectorized["results"], event["results"]):
+        assert fast["params"] == slow["params"]
+        assert fast["metrics"]["sharpe"] == pytest.approx(slow["metrics"]["sharpe"], rel=1e-6, abs=1e-9)
+
+
+
+def test_feature_store_does_not_pin_series():
+    store = FeatureStore()
+    bars = SyntheticDataProvider(seed=3, points=200).get_bars("TEST", "1h")
+    series = BarSeries.from_bars(bars)
+    first = store.get(series, "close_mean", 10)
+    ref = weakref.ref(series)
+    del series
+    gc.collect()
+    assert ref() is None
+    assert store.get(BarSeries.from_bars(bars), "close_mean", 10) is first
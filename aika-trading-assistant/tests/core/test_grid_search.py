@@ -1,5 +1,7 @@
+import pytest
+
 from aika_trading.core.data import SyntheticDataProvider
-from aika_trading.core.strategy import registry
+from aika_trading.core.strategy import registry, StrategyFactory
 from aika_trading.core.backtest import run_grid_search
 
 
@@ -13,3 +15,55 @@ def test_grid_search_runs():
     )
     assert result["results"]
     assert result["best"] is not None
+
+
+def test_grid_search_process_pool_matches_serial():
+    provider = SyntheticDataProvider(seed=7, points=150)
+    bars = provider.get_bars("TEST", "1h")
+    grid = {"lookback": [10, 20, 30], "z_threshold": [1.0, 1.5]}
+    factory = StrategyFactory("mean_reversion")
+    serial = run_grid_search(factory, bars, grid)
+    seen: list[tuple[int, int]] = []
+    parallel = run_grid_search(
+        factory,
+        bars,
+        grid,
+        executor="process",
+        max_workers=2,
+        progress=lambda done, total: seen.append((done, total)),
+    )
+    assert [r["params"] for r in parallel["results"]] == [r["params"] for r in serial["results"]]
+    assert [r["metrics"] for r in parallel["results"]] == [r["metrics"] for r in serial["results"]]
+    assert seen[-1] == (6, 6)
+
+
+def test_grid_search_successive_halving_prunes():
+    provider = SyntheticDataProvider(seed=7, points=360)
+    bars = provider.get_bars("TEST", "1h")
+    grid = {"lookback": [10, 15, 20, 25, 30, 35, 40, 45, 50]}
+    result = run_grid_search(StrategyFactory("mean_reversion"), bars, grid, search="halving", min_bars=40)
+    rungs = result["pruning"]
+    assert [r["bars"] for r in rungs] == [40, 120, 360]
+    assert [r["evaluated"] for r in rungs] == [9, 3, 1]
+    assert result["best"]["bars"] == len(bars)
+    assert result["best"]["params"] in [r["params"] for r in rungs[1]["scores"]]
+
+
+def test_grid_search_pruning_rejects_eta_below_two():
+    bars = SyntheticDataProvider(seed=7, points=120).get_bars("TEST", "1h")
+    grid = {"lookback": [10, 15, 20, 25]}
+    for search in ("halving", "hyperband"):
+        for eta in (0, 1):
+            with pytest.raises(ValueError, match="eta_too_small"):
+                run_grid_search(StrategyFactory("mean_reversion"), bars, grid, search=search, eta=eta, min_bars=20)
+    assert run_grid_search(StrategyFactory("mean_reversion"), bars, grid, eta=1)["best"] is not None
+
+
+def test_grid_search_sampling_respects_budget():
+    provider = SyntheticDataProvider(seed=7, points=120)
+    bars = provider.get_bars("TEST", "1h")
+    grid = {"lookback": list(range(5, 40)), "z_threshold": [0.5, 1.0, 1.5, 2.0]}
+    for search in ("random", "lhs"):
+        result = run_grid_search(StrategyFactory("mean_reversion"), bars, grid, search=search, n_trials=6, seed=1)
+        assert 0 < len(result["results"]) <= 6
+        assert result["best"] is not None
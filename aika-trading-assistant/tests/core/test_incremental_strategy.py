@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from aika_trading.core.data import SyntheticDataProvider
+from aika_trading.core.strategy import registry, MeanReversionZScore, Strategy
+from aika_trading.core.backtest import run_backtest
+
+
+@pytest.mark.parametrize(
+    "name,params",
+    [
+        ("volatility_momentum", {"lookback": 20}),
+        ("mean_reversion", {"lookback": 15, "z_threshold": 1.0}),
+        ("breakout_atr", {"lookback": 10}),
+    ],
+)
+def test_on_bar_matches_generate_signals(name, params):
+    provider = SyntheticDataProvider(seed=11, points=300)
+    bars = provider.get_bars("TEST", "1h")
+    batch = registry.create(name, **params)
+    incremental = registry.create(name, **params)
+    assert incremental.supports_incremental
+    for idx, bar in enumerate(bars):
+        expected = batch.generate_signals(bars[: idx + 1])
+        actual = incremental.on_bar(bar)
+        assert len(actual) == len(expected)
+        for got, want in zip(actual, expected):
+            assert got.side == want.side
+            assert math.isclose(got.strength, want.strength, rel_tol=1e-6, abs_tol=1e-9)
+            for key, value in want.meta.items():
+                if value is None:
+                    assert got.meta[key] is None
+                else:
+                    assert math.isclose(got.meta[key], value, rel_tol=1e-6, abs_tol=1e-9)
+
+
+def test_backtest_uses_incremental_path_with_same_trades():
+    provider = SyntheticDataProvider(seed=3, points=200)
+    bars = provider.get_bars("TEST", "1h")
+
+    class BatchOnly(MeanReversionZScore):
+        on_bar = Strategy.on_bar
+
+    assert not BatchOnly().supports_incremental
+    incremental = run_backtest(MeanReversionZScore(lookback=20, z_threshold=1.0), bars)
+    batch = run_backtest(BatchOnly(lookback=20, z_threshold=1.0), bars)
+    assert [t["side"] for t in incremental.trades] == [t["side"] for t in batch.trades]
+    assert incremental.equity_curve == pytest.approx(batch.equity_curve)
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from aika_trading.core import metrics
+from aika_trading.core.backtest import run_backtest
+from aika_trading.core.data import SyntheticDataProvider
+from aika_trading.core.metrics import MetricsAccumulator, read_equity_curve
+from aika_trading.core.strategy import registry
+
+
+def _batch_metrics(curve, periods):
+    returns = [curve[i] / curve[i - 1] - 1.0 for i in range(1, len(curve)) if curve[i - 1] != 0]
+    return {
+        "cagr": metrics.cagr(curve, periods),
+        "sharpe": metrics.sharpe(returns, periods),
+        "sortino": metrics.sortino(returns, periods),
+        "calmar": metrics.calmar(curve, periods),
+        "max_drawdown": metrics.max_drawdown(curve),
+        "time_under_water": metrics.time_under_water(curve),
+        "win_rate": metrics.win_rate(returns),
+        "profit_factor": metrics.profit_factor(returns),
+        "expectancy": metrics.expectancy(returns),
+    }
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 500])
+def test_accumulator_matches_batch_metrics(length):
+    rng = random.Random(length)
+    curve = [100.0]
+    for _ in range(length - 1):
+        curve.append(curve[-1] * (1 + rng.gauss(0.0, 0.02)))
+    curve = curve[:length]
+    acc = MetricsAccumulator(252)
+    for value in curve:
+        acc.update(value)
+    expected = _batch_metrics(curve, 252)
+    result = acc.result()
+    for key, value in expected.items():
+        assert result[key] == pytest.approx(value, rel=1e-9, abs=1e-12), key
+
+
+def test_backtest_streams_equity_curve_to_disk(tmp_path):
+    bars = SyntheticDataProvider(seed=11, points=300).get_bars("TEST", "1h")
+    in_memory = run_backtest(registry.create("mean_reversion", lookback=20), bars)
+    path = tmp_path / "equity.f64"
+    streamed = run_backtest(registry.create("mean_reversion", lookback=20), bars, equity_path=str(path))
+    assert streamed.equity_curve == []
+    assert streamed.equity_path == str(path)
+    assert read_equity_curve(str(path)) == in_memory.equity_curve
+    assert streamed.metrics == in_memory.metrics
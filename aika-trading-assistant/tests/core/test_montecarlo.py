@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from aika_trading.core.metrics import monte_carlo_resample
+from aika_trading.core.montecarlo import _sample_indices, monte_carlo
+
+
+def _returns(n=500, seed=3):
+    return np.random.default_rng(seed).normal(0.0005, 0.01, n)
+
+
+def test_monte_carlo_is_seeded_and_chunk_invariant_across_executors():
+    returns = _returns()
+    serial = monte_carlo(returns, trials=300, seed=42, max_memory_mb=1)
+    again = monte_carlo(returns, trials=300, seed=42, max_memory_mb=1)
+    parallel = monte_carlo(returns, trials=300, seed=42, max_memory_mb=1, executor="process", max_workers=2)
+    assert serial.terminal_return.shape == (300,)
+    np.testing.assert_array_equal(serial.terminal_return, again.terminal_return)
+    np.testing.assert_array_equal(serial.max_drawdown, parallel.max_drawdown)
+    np.testing.assert_array_equal(serial.sharpe, parallel.sharpe)
+    assert np.unique(serial.terminal_return).size > 250
+    assert (serial.max_drawdown >= 0).all() and (serial.max_drawdown < 1).all()
+
+
+def test_monte_carlo_paths_do_not_depend_on_memory_budget():
+    returns = _returns()
+    for method in ("iid", "block"):
+        roomy = monte_carlo(returns, trials=2_000, method=method, seed=5, max_memory_mb=256)
+        tight = monte_carlo(returns, trials=2_000, method=method, seed=5, max_memory_mb=1)
+        np.testing.assert_allclose(roomy.terminal_return, tight.terminal_return, rtol=1e-12, atol=0)
+        np.testing.assert_allclose(roomy.max_drawdown, tight.max_drawdown, rtol=1e-12, atol=0)
+        np.testing.assert_allclose(roomy.sharpe, tight.sharpe, rtol=1e-12, atol=0)
+
+
+def test_monte_carlo_summary_percentiles():
+    result = monte_carlo(_returns(), trials=2_000, method="block", block_size=10, seed=1)
+    summary = result.summary((5, 50, 95))
+    for name in ("terminal_return", "max_drawdown", "sharpe"):
+        levels = summary[name]["percentiles"]
+        assert list(levels) == ["p5", "p50", "p95"]
+        assert levels["p5"] <= levels["p50"] <= levels["p95"]
+    with pytest.raises(ValueError):
+        monte_carlo(_returns(), method="nope")
+
+
+def test_stationary_block_bootstrap_keeps_runs():
+    rng = np.random.default_rng(0)
+    idx = _sample_indices(rng, 1_000, 200, 400, "block", 25.0)
+    consecutive = (np.diff(idx, axis=1) % 1_000 == 1).mean()
+    assert 0.93 < consecutive < 0.99
+
+
+def test_monte_carlo_resample_wrapper():
+    assert monte_carlo_resample([], trials=5) == []
+    values = monte_carlo_resample([0.01, -0.02, 0.03], trials=50, seed=7)
+    assert len(values) == 50 and len(set(values)) > 1
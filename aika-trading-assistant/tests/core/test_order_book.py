@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from aika_trading.core.brokers.paper import PaperBroker
+from aika_trading.core.config import ExecutionConfig
+from aika_trading.core.execution import ExecutionSimulator
+from aika_trading.core.models import Bar, OrderRequest
+from aika_trading.core.orderbook import OrderBook
+
+
+def _bar(open_: float, high: float, low: float, close: float, symbol: str = "TEST") -> Bar:
+    ts = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    return Bar(
+        ts=ts,
+        open=open_,
+        high=high,
+        low=low,
+        close=close,
+        volume=1_000.0,
+        symbol=symbol,
+        timeframe="1h",
+        source="test",
+        fetched_at=ts,
+    )
+
+
+def _order(order_id: str, side: str, order_type: str, limit=None, stop=None, symbol="TEST") -> OrderRequest:
+    return OrderRequest(
+        symbol=symbol,
+        side=side,
+        quantity=1.0,
+        order_type=order_type,
+        limit_price=limit,
+        stop_price=stop,
+        client_order_id=order_id,
+    )
+
+
+def test_order_book_matches_limits_stops_and_gaps():
+    book = OrderBook()
+    book.add(_order("buy_limit_far", "buy", "limit", limit=90.0))
+    book.add(_order("buy_limit", "buy", "limit", limit=98.0))
+    book.add(_order("sell_limit", "sell", "limit", limit=103.0))
+    book.add(_order("buy_stop", "buy", "stop", stop=101.0))
+    book.add(_order("sell_stop", "sell", "stop", stop=95.0))
+    book.add(_order("stop_limit", "buy", "stop_limit", stop=102.0, limit=102.5))
+    book.add(_order("other", "buy", "limit", limit=1_000.0, symbol="OTHER"))
+
+    matches = book.match(_bar(100.0, 104.0, 97.0, 99.0))
+    fills = {match.resting.order_id: (match.price, match.maker) for match in matches}
+    assert fills == {
+        "buy_stop": (101.0, False),
+        "stop_limit": (102.0, True),
+        "buy_limit": (98.0, True),
+        "sell_limit": (103.0, True),
+    }
+    assert sorted(order["id"] for order in book.open_orders()) == ["buy_limit_far", "other", "sell_stop"]
+
+    gap = book.match(_bar(80.0, 85.0, 79.0, 84.0))
+    assert {match.resting.order_id: match.price for match in gap} == {"sell_stop": 80.0, "buy_limit_far": 80.0}
+
+
+def test_order_book_cancel_replace_and_time_priority():
+    book = OrderBook()
+    for idx in range(3_000):
+        book.add(_order(f"o{idx}", "buy", "limit", limit=50.0 + (idx % 10)))
+    for idx in range(0, 3_000, 2):
+        assert book.cancel(f"o{idx}") is not None
+    assert len(book) == 1_500
+    book.replace("o1", limit_price=60.0)
+    with pytest.raises(KeyError):
+        book.replace("o0", limit_price=60.0)
+
+    matched = [match.resting.order_id for match in book.match(_bar(65.0, 66.0, 59.0, 60.0))]
+    assert matched[:3] == ["o1", "o9", "o19"]
+    assert len(book) == 1_500 - len(matched)
+    assert all(int(order["id"][1:]) % 2 for order in book.open_orders())
+
+
+def test_oco_sibling_popped_in_same_batch_is_not_counted_stale():
+    book = OrderBook()
+    book.add(_order("s1", "sell", "stop", stop=96.0), oco_group="exit")
+    book.add(_order("s2", "sell", "stop", stop=95.0), oco_group="exit")
+    book.add(_order("t1", "sell", "limit", limit=120.0), oco_group="exit")
+    matches = book.match(_bar(99.0, 100.0, 94.0, 95.0))
+    assert [m.resting.order_id for m in matches] == ["s1"]
+    assert len(book) == 0
+    # t1 is still in its heap (stale); s2 was popped with s1 and must not count.
+    assert book._books["TEST"].stale == 1
+
+
+def test_paper_broker_fills_resting_orders_on_bars():
+    simulator = ExecutionSimulator(ExecutionConfig(fee_bps=10.0, slippage_bps=5.0, spread_bps=10.0, latency_ms=0))
+    broker = PaperBroker(simulator, initial_cash=10_000.0)
+    with pytest.raises(RuntimeError):
+        broker.place_order(_order("limit", "buy", "limit", limit=99.0))
+    broker.submit_order(_order("limit", "buy", "limit", limit=99.0))
+    broker.submit_order(_order("cancel_me", "sell", "stop", stop=90.0))
+    assert broker.cancel_order("cancel_me")["status"] == "cancelled"
+    assert broker.cancel_order("cancel_me")["status"] == "not_found"
+
+    assert broker.process_bar(_bar(100.0, 101.0, 99.5, 100.5)) == []
+    fills = broker.process_bar(_bar(100.0, 100.5, 98.0, 99.0))
+    assert [(fill.order_id, fill.price, fill.spread_bps) for fill in fills] == [("limit", 99.0, 0.0)]
+    assert broker.get_positions()[0]["quantity"] == 1.0
+    assert broker.get_open_orders() == []
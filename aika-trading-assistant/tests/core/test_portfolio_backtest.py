@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+from aika_trading.core.data import SyntheticDataProvider
+from aika_trading.core.models import Bar, Signal, utc_now
+from aika_trading.core.strategy import Strategy, registry
+from aika_trading.core.backtest import run_backtest
+from aika_trading.core.config import RiskConfig
+from aika_trading.core.portfolio import merge_bar_streams, run_portfolio_backtest
+
+
+def test_merge_bar_streams_is_time_ordered_and_lazy():
+    provider = SyntheticDataProvider(seed=3, points=50)
+    streams = {symbol: iter(provider.get_bars(symbol, "1h")) for symbol in ("AAA", "BBB", "CCC")}
+    merged = list(merge_bar_streams(streams))
+    assert len(merged) == 150
+    assert all(a.ts <= b.ts for a, b in zip(merged, merged[1:]))
+    assert [bar.symbol for bar in merged[:3]] == ["AAA", "BBB", "CCC"]
+
+
+def test_single_symbol_portfolio_matches_run_backtest():
+    bars = SyntheticDataProvider(seed=5, points=200).get_bars("TEST", "1h")
+    # Loose limits, so differently sized orders cannot flip a risk decision between the engines.
+    risk = RiskConfig(max_position_value=1e9, max_leverage=10.0)
+    single = run_backtest(registry.create("mean_reversion", lookback=20), bars, risk=risk)
+    book = run_portfolio_backtest(
+        lambda: registry.create("mean_reversion", lookback=20), {"TEST": iter(bars)}, risk=risk
+    )
+    # Same signals, but the book marks its position to every close instead of only on fills.
+    assert [t["side"] for t in book.trades] == [t["side"] for t in single.trades]
+    assert len(book.equity_curve) == len(single.equity_curve) + 30
+    assert len(set(book.equity_curve)) > len(set(single.equity_curve))
+
+
+def test_portfolio_limits_apply_across_book():
+    provider = SyntheticDataProvider(seed=5, points=150)
+    symbols = [f"S{idx:03d}" for idx in range(20)]
+
+    def run(max_leverage: float):
+        streams = {symbol: (bar for bar in provider.get_bars(symbol, "1h")) for symbol in symbols}
+        return run_portfolio_backtest(
+            lambda: registry.create("mean_reversion", lookback=20),
+            streams,
+            risk=RiskConfig(max_leverage=max_leverage),
+        )
+
+    loose, tight = run(10.0), run(0.05)
+    assert len(tight.equity_curve) == 150
+    assert set(tight.symbols) == set(symbols)
+    assert 0 < len(tight.trades) < len(loose.trades)
+
+
+class _BuyTwiceA(Strategy):
+    """Goes long "A" on its 4th and 12th bar; never trades anything else."""
+
+    name = "buy_twice_a"
+
+    def generate_signals(self, history):
+        latest = history[-1]
+        side = "long" if latest.symbol == "A" and len(history) in (4, 12) else "flat"
+        return [Signal(symbol=latest.symbol, side=side, strength=1.0, generated_at=utc_now())]
+
+
+def test_portfolio_marks_prices_so_drawdown_guard_fires():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    closes = {"A": [100.0] * 4 + [95.0, 90.0, 85.0, 80.0, 75.0, 70.0, 70.0, 70.0], "B": [50.0] * 12}
+
+    def stream(symbol):
+        for idx, close in enumerate(closes[symbol]):
+            yield Bar(start + timedelta(hours=idx), close, close, close, close, 1_000.0, symbol, "1h", "test", start)
+
+    result = run_portfolio_backtest(
+        lambda: _BuyTwiceA(min_history=2, risk_pct=1.0),
+        {"A": stream("A"), "B": stream("B")},
+        risk=RiskConfig(max_position_value=1e9, max_leverage=10.0, max_drawdown=0.2),
+    )
+    assert len(result.trades) == 1
+    assert result.equity_curve[-1] < 0.75 * result.equity_curve[0]
@@ -0,0 +1,55 @@
+from statistics import pstdev
+
+import pytest
+
+from aika_trading.core.data import SyntheticDataProvider
+from aika_trading.core.regime import RegimeTracker, compute_regime_labels, regime_summary
+
+
+def _reference_labels(bars, lookback=50, trend_threshold=0.02, vol_threshold=0.02):
+    closes = [bar.close for bar in bars]
+    labels = []
+    for idx in range(len(closes)):
+        window = closes[idx - lookback : idx] if idx >= lookback else []
+        if len(window) < 2:
+            labels.append("unknown")
+            continue
+        trend = window[-1] / window[0] - 1.0
+        returns = [window[i] / window[i - 1] - 1.0 for i in range(1, len(window))]
+        vol = pstdev(returns) if len(returns) > 1 else 0.0
+        if abs(trend) < trend_threshold:
+            labels.append("sideways")
+        elif trend >= 0:
+            labels.append("bull_high_vol" if vol > vol_threshold else "bull_low_vol")
+        else:
+            labels.append("bear_high_vol" if vol > vol_threshold else "bear_low_vol")
+    return labels
+
+
+@pytest.mark.parametrize("lookback", [2, 10, 50])
+def test_regime_labels_match_reference(lookback):
+    bars = SyntheticDataProvider(seed=9, points=400).get_bars("TEST", "1h")
+    assert compute_regime_labels(bars, lookback, vol_threshold=0.01) == _reference_labels(
+        bars, lookback, vol_threshold=0.01
+    )
+
+
+@pytest.mark.parametrize("lookback", [2, 3, 20])
+def test_regime_tracker_matches_batch_labels(lookback):
+    bars = SyntheticDataProvider(seed=13, points=300).get_bars("TEST", "1h")
+    tracker = RegimeTracker(lookback, vol_threshold=0.01)
+    streamed = [tracker.update(bar) for bar in bars]
+    batch = compute_regime_labels(bars, lookback, vol_threshold=0.01)
+    assert streamed == batch == _reference_labels(bars, lookback, vol_threshold=0.01)
+    assert tracker.summary() == regime_summary(batch)
+    assert sum(regime_summary(batch).values()) == pytest.approx(1.0)
+
+
+def test_regime_labels_exact_at_vol_threshold():
+    bars = SyntheticDataProvider(seed=9, points=120).get_bars("TEST", "1h")
+    closes = [bar.close for bar in bars[10:30]]
+    returns = [closes[i] / closes[i - 1] - 1.0 for i in range(1, len(closes))]
+    threshold = pstdev(returns)
+    assert compute_regime_labels(bars, 20, trend_threshold=0.0, vol_threshold=threshold) == _reference_labels(
+        bars, 20, trend_threshold=0.0, vol_threshold=threshold
+    )
@@ -0,0 +1,45 @@
+from dataclasses import replace
+
+from aika_trading.core.data import SyntheticDataProvider
+from aika_trading.core.strategy import registry
+from aika_trading.core.backtest import run_backtest
+from aika_trading.core.cache import BacktestCache
+from aika_trading.core.config import ExecutionConfig
+
+
+def test_backtest_cache_hits_and_invalidates(tmp_path):
+    bars = SyntheticDataProvider(seed=4, points=150).get_bars("TEST", "1h")
+    cache = BacktestCache(str(tmp_path / "results.sqlite"))
+    first = run_backtest(registry.create("mean_reversion", lookback=20), bars, cache=cache)
+    second = run_backtest(registry.create("mean_reversion", lookback=20), bars, cache=cache)
+    assert second.metrics == first.metrics
+    assert second.equity_curve == first.equity_curve
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    run_backtest(registry.create("mean_reversion", lookback=20), bars, execution=ExecutionConfig(fee_bps=5.0), cache=cache)
+    assert cache.misses == 2
+
+    assert cache.invalidate("mean_reversion", keep_version="0.2") == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_backtest_cache_evicts_least_recently_used(tmp_path):
+    bars = SyntheticDataProvider(seed=4, points=150).get_bars("TEST", "1h")
+    cache = BacktestCache(str(tmp_path / "results.sqlite"), max_bytes=1)
+    run_backtest(registry.create("mean_reversion", lookback=20), bars, cache=cache)
+    run_backtest(registry.create("mean_reversion", lookback=25), bars, cache=cache)
+    assert cache.stats()["entries"] <= 1
+
+
+def test_backtest_cache_sees_in_place_list_edits(tmp_path):
+    bars = SyntheticDataProvider(seed=4, points=150).get_bars("TEST", "1h")
+    cache = BacktestCache(str(tmp_path / "results.sqlite"))
+    run_backtest(registry.create("mean_reversion", lookback=20), bars, cache=cache)
+    for idx in range(100, len(bars)):
+        bar = bars[idx]
+        bars[idx] = replace(bar, open=bar.open * 1.1, high=bar.high * 1.1, low=bar.low * 1.1, close=bar.close * 1.1)
+    run_backtest(registry.create("mean_reversion", lookback=20), bars, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    bars.pop()
+    run_backtest(registry.create("mean_reversion", lookback=20), bars, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 3)
@@ -1,7 +1,9 @@
 from datetime import datetime
 
+import numpy as np
+
 from aika_trading.core.config import RiskConfig
-from aika_trading.core.models import OrderRequest, PortfolioState
+from aika_trading.core.models import OrderRequest, PortfolioState, Position
 from aika_trading.core.risk import RiskEngine
 
 
@@ -20,3 +22,25 @@ def test_risk_engine_denies_drawdown():
     order = OrderRequest(symbol="TEST", side="buy", quantity=1.0, order_type="market", market_price=10.0)
     decision = engine.evaluate_order(order, portfolio, market_price=10.0)
     assert decision.decision == "deny"
+
+
+def test_risk_engine_correlation_cap_uses_rolling_correlations():
+    engine = RiskEngine(RiskConfig(max_position_value=1e9, max_leverage=10.0, correlation_cap=0.8, var_min_periods=50))
+    rng = np.random.default_rng(2)
+    for _ in range(80):
+        shared = rng.normal(0, 0.01)
+        engine.observe_returns({"A": shared, "B": shared + rng.normal(0, 0.001), "C": rng.normal(0, 0.01)})
+    portfolio = PortfolioState(
+        cash=90_000.0,
+        equity=100_000.0,
+        positions={"A": Position(symbol="A", quantity=100.0, avg_price=100.0, market_price=100.0)},
+    )
+
+    def decide(symbol, side):
+        order = OrderRequest(symbol=symbol, side=side, quantity=1.0, order_type="market", market_price=100.0)
+        return engine.evaluate_order(order, portfolio, market_price=100.0)
+
+    denied = decide("B", "buy")
+    assert (denied.decision, denied.reason) == ("deny", "correlation_cap")
+    assert decide("B", "sell").decision == "allow"
+    assert decide("C", "buy").decision == "allow"
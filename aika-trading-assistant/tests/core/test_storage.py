@@ -0,0 +1,196 @@
+import json
+import sqlite3
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from aika_trading.core.models import Fill, OrderRequest, RunSummary, Signal
+from aika_trading.core.sql_storage import SqlRunStore
+from aika_trading.core.storage import RunStore
+
+
+def _fill(idx: int) -> Fill:
+    return Fill(
+        order_id=f"o{idx}",
+        symbol="TEST",
+        side="buy",
+        quantity=1.0,
+        price=100.0 + idx,
+        fee=0.1,
+        slippage_bps=1.0,
+        spread_bps=2.0,
+        latency_ms=0,
+        filled_at=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=idx),
+    )
+
+
+def test_write_behind_store_batches_and_flushes_on_close(tmp_path):
+    path = tmp_path / "runs.sqlite"
+    with RunStore(str(path), write_behind=True, flush_interval=5.0) as store:
+        for idx in range(2_500):
+            store.record_fill("run-1", _fill(idx))
+        store.record_signal("run-1", Signal("TEST", "long", 1.0, datetime.now(timezone.utc)))
+        # Reads see queued writes without waiting for the flush interval.
+        assert [fill["order_id"] for fill in store.list_fills(limit=2)] == ["o2499", "o2498"]
+        for idx in range(2_500, 3_000):
+            store.record_fill("run-1", _fill(idx))
+        started = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        summary = RunSummary("run-1", "paper", "completed", started, started, "s", ["TEST"], 1.0, 1.0, 0.0)
+        store.record_run(summary, {})
+    with pytest.raises(RuntimeError):
+        store.record_fill("run-1", _fill(0))
+
+    reopened = RunStore(str(path))
+    assert reopened.latest_run()["run_id"] == "run-1"
+    assert reopened.list_fills(limit=1)[0]["order_id"] == "o2999"
+    with sqlite3.connect(str(path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM fills").fetchone()[0] == 3_000
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    expected = {"idx_runs_started_at", "idx_fills_filled_at", "idx_fills_run_id", "idx_signals_run_id"}
+    assert expected <= indexes
+
+
+def test_run_curves_are_stored_compressed_and_loaded_on_demand(tmp_path):
+    path = tmp_path / "runs.sqlite"
+    started = datetime(2024, 3, 1, 12, tzinfo=timezone.utc)
+    summary = RunSummary(
+        "run-2",
+        "paper",
+        "completed",
+        started,
+        started + timedelta(minutes=5),
+        "s",
+        ["A", "B"],
+        101.0,
+        50.0,
+        51.0,
+        risk_flags=["max_leverage"],
+        metrics={"sharpe": 1.5},
+        equity_curve=[100.0 + 0.25 * idx for idx in range(5_000)],
+        drawdown_curve=[0.0] * 5_000,
+        regime_labels=["trend", "range", "trend"] * 1_000,
+        ensemble_weights={"s": 1.0},
+    )
+    store = RunStore(str(path))
+    store.record_run(summary, {})
+    assert store.get_run("run-2") == summary.to_dict()
+    assert store.latest_run() == summary.to_dict()
+    listed = store.list_runs()
+    assert listed[0]["metrics"] == {"sharpe": 1.5}
+    assert "equity_curve" not in listed[0] and store.get_run("missing") is None
+    with sqlite3.connect(str(path)) as conn:
+        stored = dict(conn.execute("SELECT name, length(payload) FROM run_curves WHERE run_id = 'run-2'"))
+    assert stored["regime_labels"] < 100 and stored["drawdown_curve"] < 1_000
+
+
+def test_legacy_summary_json_rows_are_migrated(tmp_path):
+    path = tmp_path / "legacy.sqlite"
+    started = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    summary = RunSummary(
+        "old", "paper", "completed", started, None, "s", ["A"], 1.0, 1.0, 0.0, equity_curve=[1.0, 2.0]
+    )
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute(
+            "CREATE TABLE runs (run_id TEXT PRIMARY KEY, mode TEXT, status TEXT, started_at TEXT,"
+            " completed_at TEXT, strategy TEXT, symbols_json TEXT, summary_json TEXT, config_json TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ("old", "paper", "completed", started.isoformat(), None, "s", '["A"]', json.dumps(summary.to_dict()),
+             "{}"),
+        )
+    assert RunStore(str(path)).get_run("old") == summary.to_dict()
+
+
+def test_keyset_pages_cover_filtered_fills_and_signals(tmp_path):
+    path = tmp_path / "runs.sqlite"
+    store = RunStore(str(path))
+    for idx in range(300):
+        # Pairs share a timestamp, so the rowid tiebreak matters.
+        fill = replace(_fill(idx // 2), symbol="A" if idx % 3 else "B", side="buy" if idx % 4 else "sell")
+        store.record_fill(f"run-{idx % 2}", fill)
+        signal = Signal(fill.symbol, "long", 1.0, fill.filled_at, {"idx": idx})
+        store.record_signal(f"run-{idx % 2}", signal)
+
+    def collect(query, **filters):
+        items, cursor = [], None
+        while True:
+            page = query(limit=7, cursor=cursor, **filters)
+            items.extend(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                return items
+
+    everything = store.query_fills(limit=1_000).items
+    assert len(collect(store.query_fills)) == 300
+    assert collect(store.query_fills) == everything
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=40)
+    filtered = collect(store.query_fills, run_id="run-1", symbol="A", side="buy", since=since.isoformat())
+    expected = [
+        fill
+        for fill in everything
+        if fill["run_id"] == "run-1" and fill["symbol"] == "A" and fill["side"] == "buy"
+        and fill["filled_at"] >= since.isoformat()
+    ]
+    assert filtered == expected and filtered
+    signals = collect(store.query_signals, symbol="B", until="2024-01-01T00:01:00Z")
+    assert signals and all(item["symbol"] == "B" for item in signals)
+    assert len({item["meta"]["idx"] for item in signals}) == len(signals)
+    with pytest.raises(ValueError):
+        store.query_fills(cursor="not-a-cursor")
+
+    with sqlite3.connect(str(path)) as conn:
+        plan = " ".join(
+            row[-1]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT rowid FROM fills WHERE run_id = ? AND (filled_at, rowid) < (?, ?)"
+                " ORDER BY filled_at DESC, rowid DESC LIMIT 8",
+                ("run-1", "2024-01-01", 10),
+            )
+        )
+    assert "idx_fills_run_id_filled_at" in plan and "TEMP B-TREE" not in plan
+
+
+def test_sql_run_store_matches_sqlite_store(tmp_path):
+    # The SQLAlchemy backend on a sqlite URL exercises the multi-row insert/upsert path used off Postgres.
+    sql = SqlRunStore(f"sqlite:///{tmp_path / 'sql.sqlite'}", batch_size=64, flush_interval=60.0)
+    local = RunStore(str(tmp_path / "local.sqlite"))
+    started = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    summary = RunSummary(
+        "run-3", "paper", "completed", started, started, "s", ["A"], 2.0, 1.0, 1.0,
+        equity_curve=[1.0, 2.0, 1.5],
+        regime_labels=["trend", "range", "trend"],
+    )
+    for store in (sql, local):
+        for idx in range(150):
+            fill = replace(_fill(idx // 3), symbol="A" if idx % 2 else "B")
+            store.record_fill(f"run-{idx % 3}", fill)
+            store.record_signal("run-3", Signal(fill.symbol, "short", 0.5, fill.filled_at))
+        store.record_order("run-3", OrderRequest("A", "buy", 1.0, "market", client_order_id="o-1"))
+        store.record_run(summary, {})
+        store.record_run(summary, {"rerun": True})
+
+    assert sql.get_run("run-3") == local.get_run("run-3") == summary.to_dict()
+    assert sql.list_runs() == local.list_runs()
+    for query, filters in (
+        ("query_fills", {"run_id": "run-1", "symbol": "A"}),
+        ("query_fills", {"since": "2024-01-01T00:00:10Z", "until": "2024-01-01T00:00:40Z"}),
+        ("query_signals", {"symbol": "B"}),
+    ):
+        pages = []
+        for store in (sql, local):
+            items, cursor = [], None
+            while True:
+                page = getattr(store, query)(limit=9, cursor=cursor, **filters)
+                items.extend(page.items)
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+            pages.append(items)
+        assert pages[0] == pages[1] and pages[0]
+    assert sql.query_orders().items[0]["client_order_id"] == "o-1"
+    sql.close()
+    with pytest.raises(RuntimeError):
+        sql.record_fill("run-1", _fill(0))
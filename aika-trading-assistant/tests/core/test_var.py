@@ -0,0 +1,118 @@
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from aika_trading.core.backtest import run_backtest, run_backtest_vectorized
+from aika_trading.core.config import RiskConfig
+from aika_trading.core.data import SyntheticDataProvider
+from aika_trading.core.models import OrderRequest, PortfolioState, Position
+from aika_trading.core.risk import RiskEngine
+from aika_trading.core.strategy import registry
+from aika_trading.core.var import RollingCovariance, portfolio_var
+
+
+def test_rolling_covariance_matches_window_recompute():
+    rng = np.random.default_rng(11)
+    model = RollingCovariance(window=40)
+    history = []
+    for step in range(130):
+        # "C" only starts trading part-way through; earlier bars count as 0 returns.
+        row = {"A": rng.normal(0, 0.01), "B": rng.normal(0, 0.02)}
+        if step >= 50:
+            row["C"] = rng.normal(0.001, 0.015)
+        model.update(row)
+        history.append([row.get(symbol, 0.0) for symbol in ("A", "B", "C")])
+        if step in (20, 45, 99, 129):
+            window = np.array(history[-40:])
+            mean, cov = model.moments(["C", "A", "B", "MISSING"])
+            order = [2, 0, 1]
+            assert mean[:3] == pytest.approx(window.mean(axis=0)[order], abs=1e-15)
+            assert cov[:3, :3] == pytest.approx(np.cov(window[:, order], rowvar=False, ddof=0), abs=1e-15)
+            assert not cov[3].any()
+
+
+def test_portfolio_var_methods():
+    rng = np.random.default_rng(3)
+    model = RollingCovariance(window=500)
+    model.update_many(["A", "B"], rng.normal(0, 0.01, size=(500, 2)))
+    exposures = {"A": 10_000.0, "B": -4_000.0}
+
+    pnl = model.returns_matrix(["A", "B"]) @ np.array([10_000.0, -4_000.0])
+    historical = portfolio_var(model, exposures, confidence=0.95)
+    assert historical.var == pytest.approx(-np.quantile(pnl, 0.05))
+    assert historical.cvar == pytest.approx(-pnl[pnl <= np.quantile(pnl, 0.05)].mean())
+
+    parametric = portfolio_var(model, exposures, confidence=0.95, method="parametric")
+    sigma, mu = pnl.std(), pnl.mean()
+    assert parametric.var == pytest.approx(NormalDist().inv_cdf(0.95) * sigma - mu)
+    assert parametric.cvar > parametric.var
+    with pytest.raises(ValueError):
+        portfolio_var(model, exposures, method="monte_carlo")
+
+
+def test_risk_engine_denies_orders_over_var_limit():
+    limits = RiskConfig(max_position_value=1e9, max_leverage=10.0, max_var_pct=0.02, var_min_periods=50)
+    engine = RiskEngine(limits)
+    rng = np.random.default_rng(5)
+    for _ in range(60):
+        engine.observe_returns({"A": rng.normal(0, 0.02), "B": rng.normal(0, 0.02)})
+    portfolio = PortfolioState(
+        cash=50_000.0,
+        equity=100_000.0,
+        positions={"A": Position(symbol="A", quantity=500.0, avg_price=100.0, market_price=100.0)},
+    )
+    small = OrderRequest(symbol="B", side="buy", quantity=10.0, order_type="market", market_price=100.0)
+    large = OrderRequest(symbol="A", side="buy", quantity=1_000.0, order_type="market", market_price=100.0)
+    hedge = OrderRequest(symbol="A", side="sell", quantity=400.0, order_type="market", market_price=100.0)
+    assert engine.evaluate_order(small, portfolio, 100.0).decision == "allow"
+    denied = engine.evaluate_order(large, portfolio, 100.0)
+    assert (denied.decision, denied.reason) == ("deny", "var_limit")
+    assert engine.evaluate_order(hedge, portfolio, 100.0).decision == "allow"
+
+
+def test_var_limit_allows_partial_reduction_of_over_limit_book():
+    limits = RiskConfig(max_position_value=1e9, max_leverage=10.0, max_var_pct=0.02, var_min_periods=50)
+    engine = RiskEngine(limits)
+    rng = np.random.default_rng(5)
+    for _ in range(60):
+        engine.observe_returns({"A": rng.normal(0, 0.02)})
+    portfolio = PortfolioState(
+        cash=-50_000.0,
+        equity=100_000.0,
+        positions={"A": Position(symbol="A", quantity=1_500.0, avg_price=100.0, market_price=100.0)},
+    )
+    assert engine.post_trade_var(portfolio, "A", 0.0).var > limits.max_var_pct * portfolio.equity
+    for quantity in (100.0, 500.0):
+        trim = OrderRequest(symbol="A", side="sell", quantity=quantity, order_type="market", market_price=100.0)
+        after = engine.post_trade_var(portfolio, "A", -100.0 * quantity)
+        assert after.var > limits.max_var_pct * portfolio.equity
+        assert engine.evaluate_order(trim, portfolio, 100.0).decision == "allow"
+    add = OrderRequest(symbol="A", side="buy", quantity=100.0, order_type="market", market_price=100.0)
+    denied = engine.evaluate_order(add, portfolio, 100.0)
+    assert (denied.decision, denied.reason) == ("deny", "var_limit")
+
+
+def test_var_limit_keeps_engines_in_step():
+    bars = SyntheticDataProvider(seed=9, points=400).get_bars("TEST", "1h")
+    risk = RiskConfig(max_var_pct=0.004, var_window=60, var_min_periods=20)
+    params = {"lookback": 15, "z_threshold": 1.0, "risk_pct": 0.3}
+    event = run_backtest(registry.create("mean_reversion", **params), bars, risk=risk)
+    vectorized = run_backtest_vectorized(registry.create("mean_reversion", **params), bars, risk=risk)
+    unlimited = run_backtest(registry.create("mean_reversion", **params), bars)
+    assert len(event.trades) != len(unlimited.trades)
+    assert len(vectorized.trades) == len(event.trades)
+    assert vectorized.equity_curve == pytest.approx(event.equity_curve, rel=1e-9)
+
+
+def test_rolling_correlations_match_numpy():
+    rng = np.random.default_rng(8)
+    base = rng.normal(0, 0.01, size=(200, 1))
+    returns = np.hstack((base, base * 0.5 + rng.normal(0, 0.01, size=(200, 1)), rng.normal(0, 0.01, size=(200, 1))))
+    model = RollingCovariance(window=120)
+    model.update_many(["A", "B", "C"], returns)
+    expected = np.corrcoef(returns[-120:], rowvar=False)
+    assert model.correlation_matrix() == pytest.approx(expected, abs=1e-12)
+    assert model.correlations_with("A", ["C", "B", "NEW"]) == pytest.approx(
+        [expected[0, 2], expected[0, 1], 0.0], abs=1e-12
+    )
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from aika_trading.core.data import SyntheticDataProvider
+from aika_trading.core.models import Signal, utc_now
+from aika_trading.core.strategy import SignalArrays, Strategy, registry
+from aika_trading.core.backtest import run_backtest, run_backtest_vectorized
+from aika_trading.core.bench import run_benchmarks
+
+
+@pytest.mark.parametrize(
+    "name,params",
+    [
+        ("volatility_momentum", {"lookback": 20}),
+        ("mean_reversion", {"lookback": 15, "z_threshold": 1.0}),
+        ("breakout_atr", {"lookback": 10}),
+    ],
+)
+def test_vectorized_backtest_matches_event_loop(name, params):
+    bars = SyntheticDataProvider(seed=21, points=400).get_bars("TEST", "1h")
+    event = run_backtest(registry.create(name, **params), bars)
+    vectorized = run_backtest_vectorized(registry.create(name, **params), bars)
+    assert event.trades
+    assert len(vectorized.trades) == len(event.trades)
+    assert vectorized.equity_curve == pytest.approx(event.equity_curve, rel=1e-9)
+    for key, value in event.metrics.items():
+        assert vectorized.metrics[key] == pytest.approx(value, rel=1e-6, abs=1e-9), key
+
+
+def test_vectorized_backtest_is_faster_than_event_loop():
+    payload = run_benchmarks([20_000], ["run_backtest", "run_backtest_vectorized"], repeat=2, track_memory=False)
+    seconds = {item["phase"]: item["seconds"] for item in payload["results"]}
+    # 80-110x on 1M bars; the floor is loose so shared CI runners stay green.
+    assert seconds["run_backtest"] > 10 * seconds["run_backtest_vectorized"]
+
+
+class _PeriodicWithStops(Strategy):
+    """Goes long every 25 bars and short every 40, with a 1.5% stop and 3% target."""
+
+    name = "periodic_stops"
+
+    def _side(self, idx: int) -> int:
+        return 1 if idx % 25 == 0 else -1 if idx % 40 == 0 else 0
+
+    def _signal(self, symbol: str, side: int, close: float) -> Signal:
+        return Signal(
+            symbol=symbol,
+            side="long" if side > 0 else "short" if side < 0 else "flat",
+            strength=1.0,
+            generated_at=utc_now(),
+            meta={"stop": close * (1 - 0.015 * side), "target": close * (1 + 0.03 * side)} if side else {},
+        )
+
+    def generate_signals(self, history):
+        return [self._signal(history[-1].symbol, self._side(len(history) - 1), history[-1].close)]
+
+    def signal_arrays(self, series):
+        side = np.array([self._side(idx) for idx in range(len(series))], dtype=np.int8)
+        closes = series.close
+        return SignalArrays(
+            symbol=series.symbol,
+            side=side,
+            strength=np.ones(len(series)),
+            meta={
+                "stop": np.where(side != 0, closes * (1 - 0.015 * side), np.nan),
+                "target": np.where(side != 0, closes * (1 + 0.03 * side), np.nan),
+            },
+        )
+
+
+def test_protective_stops_fill_intrabar_in_both_engines():
+    bars = SyntheticDataProvider(seed=5, points=600).get_bars("TEST", "1h")
+    event = run_backtest(_PeriodicWithStops(risk_pct=0.2), bars)
+    vectorized = run_backtest_vectorized(_PeriodicWithStops(risk_pct=0.2), bars)
+
+    protective = [trade for trade in event.trades if trade["order_id"].startswith("protect:")]
+    assert protective
+    assert {trade["order_id"].rsplit(":", 1)[1] for trade in protective} <= {"stop", "target"}
+    assert [(t["order_id"], t["price"]) for t in vectorized.trades if t["order_id"].startswith("protect:")] == [
+        (t["order_id"], t["price"]) for t in protective
+    ]
+    assert len(vectorized.trades) == len(event.trades)
+    assert vectorized.equity_curve == pytest.approx(event.equity_curve, rel=1e-9)
@@ -1,6 +1,11 @@
 from aika_trading.core.data import SyntheticDataProvider
-from aika_trading.core.strategy import registry
-from aika_trading.core.walk_forward import walk_forward
+from aika_trading.core.strategy import registry, StrategyFactory
+from aika_trading.core.walk_forward import (
+    load_walk_forward_artifacts,
+    save_walk_forward_artifacts,
+    stitch_equity_curves,
+    walk_forward,
+)
 
 
 def test_walk_forward_runs():
@@ -9,3 +14,28 @@ def test_walk_forward_runs():
     results = walk_forward(bars, lambda: registry.create("mean_reversion", lookback=20), train_window=120, test_window=40)
     assert results
     assert "metrics" in results[0]
+
+
+def test_walk_forward_optimizes_train_window_and_stitches(tmp_path):
+    provider = SyntheticDataProvider(seed=7, points=260)
+    bars = provider.get_bars("TEST", "1h")
+    grid = {"lookback": [10, 20, 30], "z_threshold": [1.0, 1.5]}
+    factory = StrategyFactory("mean_reversion")
+    serial = walk_forward(bars, factory, train_window=120, test_window=40, param_grid=grid)
+    assert len(serial) == 3
+    for window in serial:
+        assert window["best_params"]["lookback"] in grid["lookback"]
+        assert len(window["equity_curve"]) == 40
+
+    parallel = walk_forward(
+        bars, factory, train_window=120, test_window=40, param_grid=grid, executor="process", max_workers=2
+    )
+    assert [w["best_params"] for w in parallel] == [w["best_params"] for w in serial]
+    assert [w["metrics"] for w in parallel] == [w["metrics"] for w in serial]
+
+    save_walk_forward_artifacts(str(tmp_path), "wf", serial, {"step": 40})
+    payload = load_walk_forward_artifacts(str(tmp_path), "wf")
+    assert [w["equity_curve"] for w in payload["windows"]] == [w["equity_curve"] for w in serial]
+    assert payload["best_params"] == [w["best_params"] for w in serial]
+    assert len(payload["oos_equity_curve"]) == 120
+    assert payload["oos_equity_curve"] == stitch_equity_curves(serial, 40)
@@ -4794,7 +4794,7 @@ export default function TradingPanel({ serverUrl = "", fullPage = false }) {
                 <div style={{ marginTop: 8, fontSize: 12, color: "var(--text-muted)" }}>{backtestArtifactsStatus}</div>
               )}
               <div style={{ marginTop: 8, fontSize: 11, color: "var(--text-muted)" }}>
-                Includes config.json, metrics.json, equity_curve.json, trades.csv, grid_results.json, walk_forward.json.
+                Includes config.json, metrics.json, backtest.cols, grid_results.cols, walk_forward.cols.
               </div>
             </div>
 